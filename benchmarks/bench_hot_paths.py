@@ -0,0 +1,307 @@
+"""
+Offline microbenchmarks for SDK hot paths
+
+Nothing here touches the network: HTTP responses come from an in-process
+requests transport adapter and vision calls stop before the HTTP request.
+
+Usage:
+    python benchmarks/bench_hot_paths.py                  # run and print
+    python benchmarks/bench_hot_paths.py --save           # store the results as the baseline
+    python benchmarks/bench_hot_paths.py --compare        # exit 1 if any benchmark regressed
+    python benchmarks/bench_hot_paths.py -k sse --rounds 9 --threshold 0.1
+
+Baselines are machine-specific; save one on the machine (or CI runner class)
+that later compares against it. Each benchmark is timed in several rounds of
+an auto-sized number of calls, and the best round is compared, which is the
+least noisy statistic for CPU-bound code.
+"""
+
+import argparse
+import atexit
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import svector  # noqa: E402
+from svector import SVECTOR, ConversationsAPI, ConversationStreamEvent  # noqa: E402
+from svector.vision import (_IMAGE_PLACEHOLDER, ImageRequestBody,  # noqa: E402
+                            create_data_url, encode_image)
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+CHAT_COMPLETION = {
+    "id": "chatcmpl-bench",
+    "object": "chat.completion",
+    "model": "spec-3-turbo",
+    "choices": [{
+        "index": 0,
+        "message": {"role": "assistant", "content": "Machine learning is " + "a field of study. " * 20},
+        "finish_reason": "stop",
+    }],
+    "usage": {"prompt_tokens": 42, "completion_tokens": 120, "total_tokens": 162},
+}
+
+
+class CannedAdapter(requests.adapters.BaseAdapter):
+    """requests transport that answers every request with the same body"""
+
+    def __init__(self, body: bytes, content_type: str = "application/json"):
+        super().__init__()
+        self.body = body
+        self.content_type = content_type
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = self.content_type
+        response._content = self.body
+        response.request = request
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+
+class CannedStream:
+    """Stand-in for a streaming requests.Response holding SSE lines"""
+
+    def __init__(self, lines: List[bytes]):
+        self.lines = lines
+
+    def iter_lines(self):
+        return iter(self.lines)
+
+
+def offline_client() -> SVECTOR:
+    session = requests.Session()
+    session.mount("http://", CannedAdapter(json.dumps(CHAT_COMPLETION).encode()))
+    return SVECTOR(api_key="bench", base_url="http://svector.invalid", http_client=session)
+
+
+def sse_lines(events: int) -> List[bytes]:
+    lines = []
+    for i in range(events):
+        chunk = {
+            "id": "chatcmpl-bench",
+            "object": "chat.completion.chunk",
+            "choices": [{"index": 0, "delta": {"content": f"token{i} "}, "finish_reason": None}],
+        }
+        lines.append(b"data: " + json.dumps(chunk).encode())
+        lines.append(b"")
+    lines.append(b"data: [DONE]")
+    return lines
+
+
+# Benchmarks: each factory does its setup once and returns the callable to time
+
+BENCHMARKS: Dict[str, Callable[[], Callable[[], object]]] = {}
+
+
+def benchmark(name: str):
+    def register(factory):
+        BENCHMARKS[name] = factory
+        return factory
+    return register
+
+
+@benchmark("build_messages")
+def bench_build_messages():
+    conversations = ConversationsAPI(offline_client())
+    context = [f"turn {i}: " + "context text " * 10 for i in range(10)]
+    return lambda: conversations._build_messages("You are a helpful assistant.", "What is ML?", context)
+
+
+@benchmark("sse_parse_500_events")
+def bench_sse_parse():
+    chat = offline_client().chat
+    lines = sse_lines(500)
+
+    def run():
+        for _ in chat._stream_response(CannedStream(lines)):
+            pass
+    return run
+
+
+@benchmark("stream_event_construction")
+def bench_stream_event():
+    data = {"content": "token ", "done": False}
+    return lambda: ConversationStreamEvent(data)
+
+
+@benchmark("request_path")
+def bench_request_path():
+    client = offline_client()
+    data = {
+        "model": "spec-3-turbo",
+        "messages": [{"role": "user", "content": "What is machine learning?"}],
+        "temperature": 0.7,
+    }
+    return lambda: client.request("POST", "/api/chat/completions", data=data)
+
+
+@benchmark("conversation_create")
+def bench_conversation_create():
+    client = offline_client()
+    return lambda: client.conversations.create(
+        model="spec-3-turbo", instructions="You are a helpful assistant.", input="What is ML?"
+    )
+
+
+def _large_image(size: int) -> str:
+    handle, path = tempfile.mkstemp(suffix=".jpg", prefix="svector-bench-")
+    with os.fdopen(handle, "wb") as f:
+        f.write(os.urandom(size))
+    atexit.register(os.remove, path)
+    return path
+
+
+@benchmark("encode_image_8mb")
+def bench_encode_image():
+    path = _large_image(8 * 1024 * 1024)
+    return lambda: encode_image(path)
+
+
+@benchmark("create_data_url_8mb")
+def bench_create_data_url():
+    encoded = encode_image(_large_image(8 * 1024 * 1024))
+    return lambda: create_data_url(encoded, "image/jpeg")
+
+
+@benchmark("vision_payload_2mb")
+def bench_vision_payload():
+    client = offline_client()
+    encoded = encode_image(_large_image(2 * 1024 * 1024))
+    # Stop at the HTTP call; instance attribute shadows the method
+    client.vision._make_vision_request = lambda chat_request, *args, **kwargs: CHAT_COMPLETION
+    return lambda: client.vision.analyze(image_base64=encoded, prompt="Describe this image.", detail="high")
+
+
+@benchmark("image_request_body_8mb")
+def bench_image_request_body():
+    request = {
+        "model": "spec-3-turbo",
+        "messages": [{"role": "user", "content": [
+            {"type": "text", "text": "Describe this image."},
+            {"type": "image_url", "image_url": {"url": _IMAGE_PLACEHOLDER, "detail": "high"}},
+        ]}],
+    }
+    body = ImageRequestBody(request, _large_image(8 * 1024 * 1024))
+    return lambda: sum(len(chunk) for chunk in body)
+
+
+# Runner
+
+def measure(fn: Callable[[], object], rounds: int, min_time: float) -> Dict[str, float]:
+    fn()  # warm up caches and lazy imports
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+    per_call = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        per_call.append((time.perf_counter() - started) / number)
+    return {
+        "best": min(per_call),
+        "median": statistics.median(per_call),
+        "calls_per_round": number,
+        "rounds": rounds,
+    }
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "svector": getattr(svector, "__version__", "unknown"),
+    }
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.3f}ms"
+    return f"{seconds * 1e6:.2f}us"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Offline microbenchmarks for SDK hot paths")
+    parser.add_argument("-k", dest="pattern", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed rounds per benchmark (default: 5)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per round (default: 0.2)")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="Store the results as the baseline")
+    parser.add_argument("--compare", action="store_true", help="Compare against the baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2,
+        help="Allowed slowdown before a benchmark counts as regressed (default: 0.2 = 20%%)"
+    )
+    parser.add_argument("--json", type=Path, help="Also write the results to this file")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        if not args.baseline.exists():
+            print(f"No baseline at {args.baseline}; run with --save first", file=sys.stderr)
+            return 2
+        baseline = json.loads(args.baseline.read_text())
+
+    results = {}
+    regressions = []
+    print(f"{'benchmark':<28}{'best':>12}{'median':>12}{'baseline':>12}{'change':>10}")
+    for name, factory in BENCHMARKS.items():
+        if args.pattern and args.pattern not in name:
+            continue
+        result = results[name] = measure(factory(), args.rounds, args.min_time)
+        line = f"{name:<28}{format_seconds(result['best']):>12}{format_seconds(result['median']):>12}"
+        previous = (baseline or {}).get("benchmarks", {}).get(name)
+        if previous:
+            change = result["best"] / previous["best"] - 1
+            regressed = change > args.threshold
+            if regressed:
+                regressions.append(name)
+            line += f"{format_seconds(previous['best']):>12}{change:>+9.1%}{' !' if regressed else ''}"
+        print(line)
+
+    document = {"environment": environment(), "benchmarks": results}
+    if args.save:
+        args.baseline.write_text(json.dumps(document, indent=2))
+        print(f"Baseline saved to {args.baseline}")
+    if args.json:
+        args.json.write_text(json.dumps(document, indent=2))
+
+    if baseline is not None:
+        if baseline.get("environment") != document["environment"]:
+            print("Note: the baseline was recorded in a different environment", file=sys.stderr)
+        if regressions:
+            print(
+                f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}: "
+                + ", ".join(regressions),
+                file=sys.stderr
+            )
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
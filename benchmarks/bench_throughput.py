@@ -0,0 +1,193 @@
+"""
+End-to-end SDK throughput against a local emulator
+
+Starts ``svector.emulator.Emulator`` in a separate process (so its CPU is not
+counted against the SDK) and drives it with the sync client, the sync client
+on the background aiohttp engine, sync streaming and the async client at
+increasing concurrency.
+
+Usage:
+    python benchmarks/bench_throughput.py
+    python benchmarks/bench_throughput.py --modes sync,async --concurrency 1,8,64 --requests 500
+    python benchmarks/bench_throughput.py --latency 0.05 --token-interval 0.005 --tokens 64 --json out.json
+
+Reported per mode and concurrency: requests/sec, completion tokens/sec,
+p50/p99 request latency, client CPU per request (process CPU time of this
+harness) and peak RSS.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from svector import SVECTOR, AsyncSVECTOR  # noqa: E402
+from svector.emulator import Emulator  # noqa: E402
+from svector.metrics import LatencyHistogram  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+MODES = ("sync", "engine", "stream", "async")
+
+MESSAGES = [
+    {"role": "system", "content": "You are a helpful assistant."},
+    {"role": "user", "content": "Explain connection pooling in two sentences."},
+]
+
+
+def serve(options: Dict[str, Any], ready):
+    Emulator(**options).serve_forever(ready=ready.put)
+
+
+def peak_rss_mb() -> float:
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# Drivers: each returns (tokens, latency) per request
+
+def run_threads(call: Callable[[], int], count: int, concurrency: int) -> List[Tuple[int, float]]:
+    def timed(_):
+        started = time.perf_counter()
+        tokens = call()
+        return tokens, time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(timed, range(count)))
+
+
+def sync_call(client: SVECTOR, max_tokens: int) -> Callable[[], int]:
+    def call():
+        response = client.chat.create(model="spec-3-turbo", messages=MESSAGES, max_tokens=max_tokens)
+        return response["usage"]["completion_tokens"]
+    return call
+
+
+def stream_call(client: SVECTOR, max_tokens: int) -> Callable[[], int]:
+    def call():
+        tokens = 0
+        for event in client.chat.create_stream(model="spec-3-turbo", messages=MESSAGES, max_tokens=max_tokens):
+            if event["choices"] and event["choices"][0]["delta"].get("content"):
+                tokens += 1
+        return tokens
+    return call
+
+
+async def run_async(base_url: str, count: int, concurrency: int, max_tokens: int) -> List[Tuple[int, float]]:
+    semaphore = asyncio.Semaphore(concurrency)
+    async with AsyncSVECTOR(api_key="bench", base_url=base_url) as client:
+        async def timed():
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.chat.create(model="spec-3-turbo", messages=MESSAGES, max_tokens=max_tokens)
+                return response["usage"]["completion_tokens"], time.perf_counter() - started
+
+        return await asyncio.gather(*(timed() for _ in range(count)))
+
+
+def run_mode(mode: str, base_url: str, count: int, concurrency: int, max_tokens: int) -> Dict[str, Any]:
+    client = None
+    if mode != "async":
+        # Size the connection pool for the thread count
+        session = requests.Session()
+        session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=concurrency))
+        client = SVECTOR(api_key="bench", base_url=base_url, http_client=session, async_engine=mode == "engine")
+        call = stream_call(client, max_tokens) if mode == "stream" else sync_call(client, max_tokens)
+
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    if client is None:
+        outcomes = asyncio.run(run_async(base_url, count, concurrency, max_tokens))
+    else:
+        outcomes = run_threads(call, count, concurrency)
+    elapsed = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+    if client is not None:
+        client.close()
+
+    latencies = LatencyHistogram()
+    for _, latency in outcomes:
+        latencies.record(latency)
+    tokens = sum(generated for generated, _ in outcomes)
+    return {
+        "mode": mode,
+        "concurrency": concurrency,
+        "requests": count,
+        "seconds": elapsed,
+        "requests_per_second": count / elapsed,
+        "tokens_per_second": tokens / elapsed,
+        "p50": latencies.percentile(50),
+        "p99": latencies.percentile(99),
+        "cpu_per_request": cpu / count,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="End-to-end SDK throughput against a local emulator")
+    parser.add_argument("--modes", default=",".join(MODES), help=f"Comma-separated subset of {', '.join(MODES)}")
+    parser.add_argument("--concurrency", default="1,4,16,64", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per mode and level (default: 200)")
+    parser.add_argument("--latency", type=float, default=0.02, help="Emulated seconds to first token")
+    parser.add_argument("--token-interval", type=float, default=0.0, help="Emulated seconds between tokens")
+    parser.add_argument("--tokens", type=int, default=32, help="Tokens per completion")
+    parser.add_argument("--json", type=Path, help="Write the results to this file")
+    args = parser.parse_args(argv)
+
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        parser.error(f"unknown mode(s): {', '.join(sorted(unknown))}")
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    options = {"latency": args.latency, "token_interval": args.token_interval, "tokens": args.tokens}
+    context = multiprocessing.get_context("spawn")
+    ready = context.Queue()
+    server = context.Process(target=serve, args=(options, ready), daemon=True)
+    server.start()
+    try:
+        base_url = ready.get(timeout=30)
+        print(
+            f"emulator at {base_url}: latency={args.latency}s token_interval={args.token_interval}s "
+            f"tokens={args.tokens}"
+        )
+        print(
+            f"{'mode':<8}{'conc':>6}{'req/s':>10}{'tok/s':>11}{'p50':>10}{'p99':>10}"
+            f"{'cpu/req':>11}{'rss MB':>9}"
+        )
+        results = []
+        for mode in modes:
+            for level in levels:
+                result = run_mode(mode, base_url, max(args.requests, level), level, args.tokens)
+                results.append(result)
+                print(
+                    f"{mode:<8}{level:>6}{result['requests_per_second']:>10.1f}{result['tokens_per_second']:>11.0f}"
+                    f"{result['p50'] * 1e3:>8.1f}ms{result['p99'] * 1e3:>8.1f}ms"
+                    f"{result['cpu_per_request'] * 1e3:>9.3f}ms{result['peak_rss_mb']:>9.1f}"
+                )
+    finally:
+        server.terminate()
+        server.join()
+
+    if args.json:
+        args.json.write_text(json.dumps({"emulator": options, "results": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -38,6 +38,16 @@ setup(
         "typing-extensions>=4.0.0; python_version<'3.10'",
     ],
     extras_require={
+        "otel": [
+            "opentelemetry-api>=1.15",
+        ],
+        "images": [
+            "Pillow>=9.1",
+        ],
+        "compression": [
+            "backports.zstd>=1.0; python_version>='3.9' and python_version<'3.14'",
+            "brotli>=1.0",
+        ],
         "dev": [
             "pytest>=6.0",
             "pytest-asyncio",
@@ -12,14 +12,31 @@ __author__ = "SVECTOR Team"
 __email__ = "support@svector.co.in"
 
 from .client import SVECTOR, AsyncSVECTOR
+from .batch import (AsyncBatchRun, BatchItemResult, BatchResults, BatchRun,
+                    BatchStats)
+from .cache import ImageCache
+from .cassette import Cassette
+from .compression import RequestCompression
 from .conversations import (AsyncConversationsAPI, ConversationRequest,
                             ConversationResponse, ConversationsAPI,
                             ConversationStreamEvent)
+from .engine import BackgroundEngine
 from .errors import (APIConnectionError, APIConnectionTimeoutError, APIError,
-                     AuthenticationError, ConnectionError, InternalServerError,
-                     NotFoundError, PermissionDeniedError, RateLimitError,
-                     ServerError, SVECTORError, TimeoutError,
-                     UnprocessableEntityError, ValidationError)
+                     AuthenticationError, CassetteMissError, ConnectionError,
+                     InternalServerError, NotFoundError, PermissionDeniedError,
+                     QueueTimeoutError, RateLimitError, ServerError,
+                     SVECTORError, TimeoutError, UnprocessableEntityError,
+                     ValidationError)
+from .hooks import RequestHooks, RequestTiming
+from .images import ImagePreprocessor
+from .limits import (AdaptiveConcurrencyLimiter, RequestScheduler,
+                     SharedRateLimiter)
+from .log import enable_logging
+from .metrics import LatencyHistogram, MetricsRegistry
+from .profiling import OverheadProfiler
+from .timeline import TimelineRecorder
+from .tracing import OpenTelemetryTracing
+from .uploads import UploadIndex
 from .vision import (ResponsesAPI, VisionAPI, VisionResponse, create_data_url,
                      encode_image)
 
@@ -27,6 +44,8 @@ __all__ = [
     # Main clients
     "SVECTOR",
     "AsyncSVECTOR",
+    "BackgroundEngine",
+    "RequestCompression",
     
     # Conversations API
     "ConversationRequest",
@@ -35,10 +54,34 @@ __all__ = [
     "ConversationsAPI",
     "AsyncConversationsAPI",
     
+    # Batch execution
+    "AsyncBatchRun",
+    "BatchItemResult",
+    "BatchResults",
+    "BatchRun",
+    "BatchStats",
+    "AdaptiveConcurrencyLimiter",
+    "RequestScheduler",
+    "SharedRateLimiter",
+    
+    # Observability
+    "RequestHooks",
+    "RequestTiming",
+    "MetricsRegistry",
+    "LatencyHistogram",
+    "OpenTelemetryTracing",
+    "TimelineRecorder",
+    "OverheadProfiler",
+    "Cassette",
+    "enable_logging",
+    
     # Vision API
     "VisionAPI",
     "VisionResponse",
     "ResponsesAPI",
+    "ImagePreprocessor",
+    "UploadIndex",
+    "ImageCache",
     "encode_image",
     "create_data_url",
     
@@ -56,5 +99,7 @@ __all__ = [
     "ValidationError",
     "ServerError",
     "ConnectionError",
-    "TimeoutError"
+    "TimeoutError",
+    "CassetteMissError",
+    "QueueTimeoutError"
 ]
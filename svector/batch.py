@@ -0,0 +1,405 @@
+"""
+SVECTOR Batch Execution
+
+Runs many API calls concurrently with bounded in-flight work, per-item error
+capture, progress callbacks and aggregate throughput/latency statistics.
+"""
+
+import asyncio
+import concurrent.futures
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from typing import (Any, AsyncIterator, Awaitable, Callable, Dict, Iterable,
+                    Iterator, List, Optional, Tuple, Type, Union)
+
+from .errors import AuthenticationError, PermissionDeniedError, TimeoutError
+from .limits import AdaptiveConcurrencyLimiter
+from .metrics import LatencyHistogram
+
+# Errors that make every remaining request in a batch pointless
+FATAL_ERRORS: Tuple[Type[BaseException], ...] = (AuthenticationError, PermissionDeniedError)
+
+
+def _check_concurrency(concurrency: Union[int, AdaptiveConcurrencyLimiter]):
+    if not isinstance(concurrency, AdaptiveConcurrencyLimiter) and concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+
+def _window(concurrency: Union[int, AdaptiveConcurrencyLimiter]) -> int:
+    """Current number of requests allowed in flight"""
+    if isinstance(concurrency, AdaptiveConcurrencyLimiter):
+        return concurrency.limit
+    return concurrency
+
+
+class BatchItemResult:
+    """Outcome of a single request in a batch"""
+
+    def __init__(
+        self,
+        index: int,
+        request: Dict[str, Any],
+        result: Any = None,
+        error: Optional[BaseException] = None,
+        latency: float = 0.0
+    ):
+        self.index = index
+        self.request = request
+        self.result = result
+        self.error = error
+        self.latency = latency
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self):
+        status = "ok" if self.ok else f"error={self.error!r}"
+        return f"BatchItemResult(index={self.index}, {status}, latency={self.latency:.3f}s)"
+
+
+class BatchStats:
+    """Aggregate statistics for a batch run"""
+
+    def __init__(self, total: Optional[int] = None):
+        self.total = total
+        self.completed = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.started_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+        # A histogram, so memory stays fixed however many items are recorded
+        self._latencies = LatencyHistogram()
+        self._lock = threading.Lock()
+
+    def record(self, item: BatchItemResult):
+        with self._lock:
+            self.completed += 1
+            if item.ok:
+                self.succeeded += 1
+            else:
+                self.failed += 1
+            self._latencies.record(item.latency)
+
+    def finish(self):
+        self.finished_at = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """Completed requests per second"""
+        elapsed = self.elapsed
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+    def latency_percentile(self, percentile: float) -> float:
+        """Latency in seconds at the given percentile (0-100), within the histogram's relative error"""
+        with self._lock:
+            return self._latencies.percentile(percentile)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            latency_mean = self._latencies.mean
+            latency_max = self._latencies.max or 0.0
+        return {
+            "total": self.total,
+            "completed": self.completed,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "elapsed": self.elapsed,
+            "throughput": self.throughput,
+            "latency_mean": latency_mean,
+            "latency_p50": self.latency_percentile(50),
+            "latency_p95": self.latency_percentile(95),
+            "latency_max": latency_max,
+        }
+
+    def __repr__(self):
+        return (
+            f"BatchStats(completed={self.completed}, failed={self.failed}, "
+            f"throughput={self.throughput:.2f}/s, p50={self.latency_percentile(50):.3f}s)"
+        )
+
+
+class BatchResults(list):
+    """List of BatchItemResult in input order, with aggregate ``stats``"""
+
+    def __init__(self, items: Iterable[BatchItemResult], stats: BatchStats):
+        super().__init__(items)
+        self.stats = stats
+
+    @property
+    def errors(self) -> List[BatchItemResult]:
+        return [item for item in self if not item.ok]
+
+
+class BatchRun:
+    """
+    Iterator over batch results in completion order
+
+    Work is submitted lazily so at most ``concurrency`` requests are in flight,
+    which keeps memory bounded for very large or generated request streams.
+    ``concurrency`` may be an AdaptiveConcurrencyLimiter, in which case the
+    window follows its current limit and every outcome is fed back into it
+    (unless ``feedback`` is False because the client already reports to it).
+    """
+
+    def __init__(
+        self,
+        fn: Callable[..., Any],
+        requests: Iterable[Dict[str, Any]],
+        concurrency: Union[int, AdaptiveConcurrencyLimiter] = 4,
+        on_progress: Optional[Callable[[BatchItemResult, BatchStats], None]] = None,
+        submit: Optional[Callable[..., concurrent.futures.Future]] = None,
+        feedback: bool = True
+    ):
+        _check_concurrency(concurrency)
+        self.fn = fn
+        self.requests = requests
+        self.concurrency = concurrency
+        self.on_progress = on_progress
+        self._submit = submit
+        self._feedback = feedback
+        total = len(requests) if hasattr(requests, "__len__") else None
+        self.stats = BatchStats(total)
+
+    def __iter__(self) -> Iterator[BatchItemResult]:
+        executor = None
+        submit = self._submit
+        if submit is None:
+            max_workers = self.concurrency
+            if isinstance(max_workers, AdaptiveConcurrencyLimiter):
+                max_workers = max_workers.max_limit
+            executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="svector-batch"
+            )
+            submit = functools.partial(_submit_in_context, executor)
+
+        pending: Dict[concurrent.futures.Future, tuple] = {}
+        requests = enumerate(self.requests)
+        try:
+            exhausted = False
+            while True:
+                while not exhausted and len(pending) < _window(self.concurrency):
+                    try:
+                        index, request = next(requests)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    started = time.monotonic()
+                    future = self._start(submit, request)
+                    pending[future] = (index, request, started)
+
+                if not pending:
+                    break
+
+                done, _ = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    index, request, started = pending.pop(future)
+                    item = self._collect(future, index, request, started)
+                    self._feed_back(item)
+                    self.stats.record(item)
+                    if self.on_progress:
+                        self.on_progress(item, self.stats)
+                    yield item
+        finally:
+            for future in pending:
+                future.cancel()
+            if executor is not None:
+                executor.shutdown(wait=False)
+            self.stats.finish()
+
+    def _feed_back(self, item: BatchItemResult):
+        if self._feedback and isinstance(self.concurrency, AdaptiveConcurrencyLimiter):
+            self.concurrency.record(item.latency, item.error)
+
+    def _start(self, submit, request: Dict[str, Any]) -> concurrent.futures.Future:
+        try:
+            future = submit(self.fn, **request)
+        except Exception as e:
+            future = concurrent.futures.Future()
+            future.set_exception(e)
+        future.add_done_callback(_mark_finished)
+        return future
+
+    def _collect(
+        self,
+        future: concurrent.futures.Future,
+        index: int,
+        request: Dict[str, Any],
+        started: float
+    ) -> BatchItemResult:
+        latency = getattr(future, "_svector_finished", time.monotonic()) - started
+        try:
+            return BatchItemResult(index, request, result=future.result(), latency=latency)
+        except Exception as e:
+            return BatchItemResult(index, request, error=e, latency=latency)
+
+
+def run_many(
+    client,
+    fn: Callable[..., Any],
+    requests: Iterable[Dict[str, Any]],
+    concurrency: Union[int, AdaptiveConcurrencyLimiter] = 4,
+    as_completed: bool = False,
+    on_progress: Optional[Callable[[BatchItemResult, BatchStats], None]] = None
+):
+    """
+    Run ``fn(**request)`` for every request and collect the outcomes
+
+    Uses the client's background engine when it has one, otherwise a thread pool.
+    Each call goes through the client's normal request path, so its retry policy
+    applies per item.
+    """
+    submit = client.submit if getattr(client, "_engine", None) is not None else None
+    feedback = concurrency is not getattr(client, "concurrency_limiter", None)
+    run = BatchRun(
+        fn, requests,
+        concurrency=concurrency, on_progress=on_progress, submit=submit, feedback=feedback
+    )
+    if as_completed:
+        return run
+
+    items = sorted(run, key=lambda item: item.index)
+    return BatchResults(items, run.stats)
+
+
+def _submit_in_context(executor: concurrent.futures.Executor, fn: Callable[..., Any], **kwargs):
+    # Carry the caller's context (e.g. request priority) into the worker thread
+    return executor.submit(contextvars.copy_context().run, fn, **kwargs)
+
+
+def _mark_finished(future: concurrent.futures.Future):
+    # Completion time, so latency excludes time spent waiting to be collected
+    future._svector_finished = time.monotonic()
+
+
+class AsyncBatchRun:
+    """
+    Async iterator over results of many awaitables, in completion order
+
+    ``calls`` may contain coroutines or zero-argument callables returning
+    awaitables. Calls are started lazily so at most ``concurrency`` are in flight;
+    passing a generator means coroutine objects are only created as the window
+    opens. When a call raises one of ``fatal_errors`` the remaining work is
+    cancelled and the error is raised after its item is yielded.
+    """
+
+    def __init__(
+        self,
+        calls: Iterable[Union[Awaitable, Callable[[], Awaitable]]],
+        concurrency: Union[int, AdaptiveConcurrencyLimiter] = 16,
+        timeout: Optional[float] = None,
+        fatal_errors: Tuple[Type[BaseException], ...] = FATAL_ERRORS,
+        on_progress: Optional[Callable[[BatchItemResult, BatchStats], None]] = None,
+        feedback: bool = True
+    ):
+        _check_concurrency(concurrency)
+        self.calls = calls
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.fatal_errors = fatal_errors
+        self.on_progress = on_progress
+        self._feedback = feedback
+        total = len(calls) if hasattr(calls, "__len__") else None
+        self.stats = BatchStats(total)
+
+    def __aiter__(self) -> AsyncIterator[BatchItemResult]:
+        return self._run()
+
+    async def _run(self) -> AsyncIterator[BatchItemResult]:
+        pending: Dict[asyncio.Future, Tuple[int, Any, float]] = {}
+        calls = enumerate(self.calls)
+        fatal: Optional[BaseException] = None
+        try:
+            exhausted = False
+            while True:
+                while not exhausted and len(pending) < _window(self.concurrency):
+                    try:
+                        index, call = next(calls)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    task = asyncio.ensure_future(self._invoke(call))
+                    pending[task] = (index, getattr(call, "request", None), time.monotonic())
+
+                if not pending:
+                    break
+
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    index, request, started = pending.pop(task)
+                    item = self._collect(task, index, request, started)
+                    if self._feedback and isinstance(self.concurrency, AdaptiveConcurrencyLimiter):
+                        self.concurrency.record(item.latency, item.error)
+                    self.stats.record(item)
+                    if self.on_progress:
+                        self.on_progress(item, self.stats)
+                    yield item
+                    if item.error is not None and isinstance(item.error, self.fatal_errors):
+                        fatal = item.error
+                        break
+                if fatal is not None:
+                    break
+        finally:
+            await self._cancel(pending, calls)
+            self.stats.finish()
+
+        if fatal is not None:
+            raise fatal
+
+    async def _invoke(self, call: Union[Awaitable, Callable[[], Awaitable]]) -> Any:
+        awaitable = call if inspect.isawaitable(call) else call()
+        if self.timeout is None:
+            return await awaitable
+        try:
+            return await asyncio.wait_for(awaitable, self.timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Request timed out after {self.timeout}s")
+
+    def _collect(self, task: asyncio.Future, index: int, request: Any, started: float) -> BatchItemResult:
+        latency = time.monotonic() - started
+        # A call that cancelled itself has no exception() to report (it would raise)
+        error = asyncio.CancelledError() if task.cancelled() else task.exception()
+        if error is not None:
+            return BatchItemResult(index, request, error=error, latency=latency)
+        return BatchItemResult(index, request, result=task.result(), latency=latency)
+
+    async def _cancel(self, pending: Dict[asyncio.Future, Any], calls: Iterator):
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        if hasattr(self.calls, "__len__"):
+            # Close never-started coroutines so they do not warn about not being awaited
+            for _, call in calls:
+                if inspect.iscoroutine(call):
+                    call.close()
+        elif hasattr(self.calls, "close"):
+            # A lazy source is closed instead of being drained, however long it is
+            self.calls.close()
+
+
+class _BoundCall:
+    """Zero-argument callable for ``fn(**request)`` that remembers its request"""
+
+    def __init__(self, fn: Callable[..., Awaitable], request: Dict[str, Any]):
+        self.fn = fn
+        self.request = request
+
+    def __call__(self) -> Awaitable:
+        return self.fn(**self.request)
+
+
+def bind_requests(fn: Callable[..., Awaitable], requests: Iterable[Dict[str, Any]]):
+    """Lazily turn request dicts into calls for AsyncBatchRun"""
+    if hasattr(requests, "__len__"):
+        return [_BoundCall(fn, request) for request in requests]
+    return (_BoundCall(fn, request) for request in requests)
@@ -0,0 +1,182 @@
+"""
+SVECTOR Image Cache
+
+Memoized base64 encoding of image files for services that send the same
+files again and again: a least-recently-used cache bounded by encoded bytes,
+keyed by path and invalidated when a file's size or modification time changes.
+"""
+
+import base64
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+PathLike = Union[str, Path]
+
+
+class CachedImage:
+    """Base64 encoding of a file as it was at ``size``/``mtime_ns`` (after preprocessing, when it ran)"""
+
+    def __init__(
+        self,
+        data: str,
+        size: int,
+        mtime_ns: int,
+        mime_type: Optional[str] = None,
+        detail: Optional[str] = None,
+        preprocessing: Optional[Dict[str, Any]] = None
+    ):
+        self.data = data
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.mime_type = mime_type
+        self.detail = detail
+        self.preprocessing = preprocessing
+
+    @property
+    def bytes(self) -> int:
+        return len(self.data)
+
+    def __repr__(self):
+        return f"CachedImage({self.bytes} bytes, mime_type={self.mime_type!r}, detail={self.detail!r})"
+
+
+class ImageCache:
+    """
+    LRU cache of base64-encoded image files, bounded by total encoded bytes
+
+    Entries are keyed by absolute path (plus a variant, such as the
+    preprocessing settings) and are re-read when the file's size or
+    modification time no longer match. Files whose encoding exceeds
+    ``max_bytes`` are encoded but not cached. Thread-safe.
+
+    Pass ``image_cache=True`` (64 MiB), a size in bytes or an instance to
+    ``SVECTOR`` to use it for ``vision.analyze*`` calls with an ``image_file``
+    path, or pass it to ``encode_image``.
+
+    Args:
+        max_bytes: Total size of the cached base64 strings
+
+    Example:
+        cache = ImageCache(max_bytes=256 * 1024 * 1024)
+        data = encode_image("assets/logo.png", cache=cache)  # read and encoded once
+        print(cache.stats())
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Tuple[str, str], CachedImage]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: PathLike, variant: str = "") -> Optional[CachedImage]:
+        """The cached encoding of ``path`` if the file has not changed since, else None"""
+        key = _key(path, variant)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            stat = None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and stat is not None and (entry.size, entry.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+
+    def put(
+        self,
+        path: PathLike,
+        data: str,
+        stat: os.stat_result,
+        variant: str = "",
+        **info: Any
+    ) -> CachedImage:
+        """
+        Cache ``data`` as the encoding of ``path``
+
+        ``stat`` must describe the file the data was read from (``os.fstat``
+        of the open file), so a file changed while it was read is not cached
+        under its new size and modification time.
+        """
+        entry = CachedImage(data, stat.st_size, stat.st_mtime_ns, **info)
+        if entry.bytes > self.max_bytes:
+            return entry
+        key = _key(path, variant)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self.bytes += entry.bytes
+            while self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+        return entry
+
+    def encode(self, path: PathLike) -> str:
+        """Base64 of the file at ``path``, read and encoded only if not cached or changed"""
+        entry = self.get(path)
+        if entry is None:
+            with open(path, "rb") as f:
+                stat = os.fstat(f.fileno())
+                data = f.read()
+            entry = self.put(path, base64.b64encode(data).decode("ascii"), stat)
+        return entry.data
+
+    def invalidate(self, path: PathLike):
+        """Drop every cached variant of ``path``"""
+        name = os.path.abspath(path)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == name]:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def _remove(self, key: Tuple[str, str]):
+        self.bytes -= self._entries.pop(key).bytes
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else None,
+                "evictions": self.evictions,
+            }
+
+    def __repr__(self):
+        return f"ImageCache(max_bytes={self.max_bytes}, entries={len(self)}, bytes={self.bytes})"
+
+
+def resolve_image_cache(cache: Any) -> Optional[ImageCache]:
+    """Normalize a client's ``image_cache`` argument"""
+    if cache is None or cache is False:
+        return None
+    if isinstance(cache, ImageCache):
+        return cache
+    if cache is True:
+        return ImageCache()
+    return ImageCache(cache)
+
+
+def _key(path: PathLike, variant: str) -> Tuple[str, str]:
+    return os.path.abspath(path), variant
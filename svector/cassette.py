@@ -0,0 +1,484 @@
+"""
+SVECTOR Cassettes
+
+Record HTTP exchanges, including when each response chunk arrived, to a
+compact file and replay them later without network access, either with the
+recorded timing or scaled. Replaying the same traffic against two SDK
+versions isolates the SDK's own overhead.
+"""
+
+import asyncio
+import base64
+import collections
+import datetime
+import gzip
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .compression import zstd
+from .errors import CassetteMissError, ValidationError
+
+FORMAT_VERSION = 1
+
+# Response headers that describe the original transfer rather than the content
+_SKIPPED_HEADERS = {
+    "connection", "content-encoding", "content-length", "date", "keep-alive",
+    "set-cookie", "transfer-encoding",
+}
+
+
+def _request_key(method: str, url: str) -> Tuple[str, str]:
+    parts = urlsplit(url)
+    return method.upper(), parts.path + (f"?{parts.query}" if parts.query else "")
+
+
+def _body_digest(body: Any) -> Optional[str]:
+    if body is None:
+        return None
+    canonical = json.dumps(body, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()[:32]
+
+
+def _json_body(body: Any) -> Any:
+    """Request body as JSON data, or None for uploads and other non-JSON bodies"""
+    if isinstance(body, bytes):
+        body = _decompress(body)
+    if isinstance(body, (bytes, str)):
+        try:
+            return json.loads(body)
+        except ValueError:
+            return None
+    return body if isinstance(body, (dict, list)) else None
+
+
+def _decompress(body: bytes) -> bytes:
+    """Undo request compression (see ``compression.RequestCompression``)"""
+    if body[:2] == b"\x1f\x8b":
+        return gzip.decompress(body)
+    if body[:4] == b"\x28\xb5\x2f\xfd" and zstd is not None:
+        return zstd.decompress(body)
+    return body
+
+
+class Cassette:
+    """
+    A file of recorded request/response exchanges
+
+    Files are gzip-compressed JSON lines; request headers (including the API
+    key) are never stored, request bodies are. Exchanges are matched on replay
+    by method, path and request body, falling back to the next unused exchange
+    for the same method and path when no body matches.
+
+    Args:
+        path: Cassette file
+        mode: "record" to perform real requests and save them, "replay" to
+            serve saved responses without touching the network
+        time_scale: Replay delay multiplier; 1.0 reproduces the recorded time to
+            first byte and chunk arrival times, 0.5 halves them, 0 replays instantly
+        match: "body" (default) or "sequence" to ignore request bodies
+
+    Example:
+        with client.use_cassette("traffic.cassette", mode="record"):
+            run_workload(client)
+
+        with client.use_cassette("traffic.cassette", time_scale=1.0):
+            run_workload(client)       # same responses and timing, no network
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        mode: str = "replay",
+        time_scale: float = 1.0,
+        match: str = "body"
+    ):
+        if mode not in ("record", "replay"):
+            raise ValidationError(f"Cassette mode must be 'record' or 'replay', not {mode!r}")
+        if match not in ("body", "sequence"):
+            raise ValidationError(f"Cassette match must be 'body' or 'sequence', not {match!r}")
+        self.path = Path(path)
+        self.mode = mode
+        self.time_scale = time_scale
+        self.match = match
+        self.entries: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._file = None
+        self._by_body: Dict[Tuple[str, str, Optional[str]], Deque[Dict[str, Any]]] = {}
+        self._by_path: Dict[Tuple[str, str], Deque[Dict[str, Any]]] = {}
+        self._used: set = set()
+        # Exchanges whose body was not read to the end yet (e.g. streams stopped at [DONE])
+        self._pending: set = set()
+
+        if mode == "record":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = gzip.open(self.path, "wt", encoding="utf-8")
+            self._file.write(json.dumps({"svector_cassette": FORMAT_VERSION, "created": time.time()}) + "\n")
+        else:
+            self._load()
+
+    # Recording
+
+    def add(self, entry: Dict[str, Any], recorder: Optional["_ChunkRecorder"] = None):
+        """Save one completed exchange"""
+        with self._lock:
+            self._pending.discard(recorder)
+            if self._file is None:
+                return
+            self.entries.append(entry)
+            self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def new_entry(self, method: str, url: str, body: Any) -> Dict[str, Any]:
+        method, path = _request_key(method, url)
+        body = _json_body(body)
+        return {
+            "offset": round(time.perf_counter() - self._started, 6),
+            "method": method,
+            "path": path,
+            "digest": _body_digest(body),
+            "request": body,
+        }
+
+    def close(self):
+        """Finish writing a recording, saving partially read exchanges as they are"""
+        with self._lock:
+            pending = list(self._pending)
+        for recorder in pending:
+            recorder.save()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    # Replay
+
+    def _load(self):
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline() or "{}")
+            if header.get("svector_cassette") != FORMAT_VERSION:
+                raise ValidationError(f"{self.path} is not a version {FORMAT_VERSION} SVECTOR cassette")
+            for line in f:
+                if line.strip():
+                    self.entries.append(json.loads(line))
+        for entry in self.entries:
+            key = (entry["method"], entry["path"])
+            self._by_path.setdefault(key, collections.deque()).append(entry)
+            self._by_body.setdefault(key + (entry.get("digest"),), collections.deque()).append(entry)
+
+    def find(self, method: str, url: str, body: Any) -> Dict[str, Any]:
+        """Claim the recorded exchange for a request; raises CassetteMissError if there is none"""
+        key = _request_key(method, url)
+        with self._lock:
+            if self.match == "body":
+                candidates = self._by_body.get(key + (_body_digest(_json_body(body)),))
+                entry = self._claim(candidates)
+                if entry is not None:
+                    return entry
+            entry = self._claim(self._by_path.get(key))
+        if entry is None:
+            raise CassetteMissError(f"No recorded response left for {key[0]} {key[1]} in {self.path}")
+        return entry
+
+    def _claim(self, candidates: Optional[Deque[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        while candidates:
+            entry = candidates.popleft()
+            if id(entry) not in self._used:
+                self._used.add(id(entry))
+                return entry
+        return None
+
+    def delay(self, seconds: float):
+        if self.time_scale > 0 and seconds > 0:
+            time.sleep(seconds * self.time_scale)
+
+    # Transports
+
+    def requests_adapter(self, inner: Optional[BaseAdapter] = None) -> BaseAdapter:
+        """requests transport adapter that records through ``inner`` or replays"""
+        if self.mode == "record":
+            return _RecordingAdapter(self, inner or requests.adapters.HTTPAdapter())
+        return _ReplayAdapter(self)
+
+    def aiohttp_session(self, session: Any) -> "_CassetteSession":
+        """Stand-in for an aiohttp session's ``request`` that records through ``session`` or replays"""
+        return _CassetteSession(self, session)
+
+    def __repr__(self):
+        return f"Cassette({str(self.path)!r}, mode={self.mode!r}, entries={len(self.entries)})"
+
+
+# Entry helpers
+
+def _response_headers(headers: Any) -> Dict[str, str]:
+    return {key: value for key, value in headers.items() if key.lower() not in _SKIPPED_HEADERS}
+
+
+def _encode_chunks(chunks: List[Tuple[float, bytes]]) -> Dict[str, Any]:
+    try:
+        return {"chunks": [[offset, data.decode("utf-8")] for offset, data in chunks]}
+    except UnicodeDecodeError:
+        return {
+            "encoding": "base64",
+            "chunks": [[offset, base64.b64encode(data).decode("ascii")] for offset, data in chunks],
+        }
+
+
+def _decode_chunks(entry: Dict[str, Any]) -> List[Tuple[float, bytes]]:
+    if entry.get("encoding") == "base64":
+        return [(offset, base64.b64decode(data)) for offset, data in entry["chunks"]]
+    return [(offset, data.encode("utf-8")) for offset, data in entry["chunks"]]
+
+
+class _ChunkRecorder:
+    """Collects body chunks with their arrival time and saves the entry once"""
+
+    def __init__(self, cassette: Cassette, entry: Dict[str, Any], started: float):
+        self.cassette = cassette
+        self.entry = entry
+        self.started = started
+        self.chunks: List[Tuple[float, bytes]] = []
+        self.saved = False
+        with cassette._lock:
+            cassette._pending.add(self)
+
+    def chunk(self, data: bytes):
+        if data:
+            self.chunks.append((round(time.perf_counter() - self.started, 6), bytes(data)))
+
+    def save(self):
+        if not self.saved:
+            self.saved = True
+            self.entry.update(_encode_chunks(self.chunks))
+            self.cassette.add(self.entry, self)
+
+
+# requests transport
+
+class _RecordingBody:
+    """Wraps a urllib3 response so every chunk read is timestamped"""
+
+    def __init__(self, raw: Any, recorder: _ChunkRecorder):
+        self._raw = raw
+        self._recorder = recorder
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def stream(self, amt: int = 2 ** 16, decode_content: Optional[bool] = None) -> Iterator[bytes]:
+        for chunk in self._raw.stream(amt, decode_content=decode_content):
+            self._recorder.chunk(chunk)
+            yield chunk
+        self._recorder.save()
+
+    def read(self, amt: Optional[int] = None, *args, **kwargs) -> bytes:
+        data = self._raw.read(amt, *args, **kwargs)
+        self._recorder.chunk(data)
+        if amt is None or not data:
+            self._recorder.save()
+        return data
+
+    def close(self):
+        self._recorder.save()
+        self._raw.close()
+
+
+class _RecordingAdapter(BaseAdapter):
+    def __init__(self, cassette: Cassette, inner: BaseAdapter):
+        super().__init__()
+        self.cassette = cassette
+        self.inner = inner
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        started = time.perf_counter()
+        entry = self.cassette.new_entry(request.method, request.url, request.body)
+        response = self.inner.send(request, **kwargs)
+        entry["status"] = response.status_code
+        entry["headers"] = _response_headers(response.headers)
+        entry["ttfb"] = round(time.perf_counter() - started, 6)
+        response.raw = _RecordingBody(response.raw, _ChunkRecorder(self.cassette, entry, started))
+        return response
+
+    def close(self):
+        self.inner.close()
+
+
+class _ReplayBody:
+    """urllib3-style body that releases recorded chunks on their original schedule"""
+
+    def __init__(self, cassette: Cassette, chunks: List[Tuple[float, bytes]], started: float):
+        self._cassette = cassette
+        self._chunks = collections.deque(chunks)
+        self._started = started
+        self.closed = False
+
+    def _next(self) -> bytes:
+        offset, data = self._chunks.popleft()
+        self._cassette.delay(offset - (time.perf_counter() - self._started) / (self._cassette.time_scale or 1))
+        return data
+
+    def stream(self, amt: int = 2 ** 16, decode_content: Optional[bool] = None) -> Iterator[bytes]:
+        while self._chunks:
+            yield self._next()
+
+    def read(self, amt: Optional[int] = None, *args, **kwargs) -> bytes:
+        if amt is None:
+            return b"".join(list(self.stream()))
+        return self._next() if self._chunks else b""
+
+    def release_conn(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class _ReplayAdapter(BaseAdapter):
+    def __init__(self, cassette: Cassette):
+        super().__init__()
+        self.cassette = cassette
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        started = time.perf_counter()
+        entry = self.cassette.find(request.method, request.url, request.body)
+        self.cassette.delay(entry["ttfb"])
+
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = _ReplayBody(self.cassette, _decode_chunks(entry), started)
+        response.reason = "Replayed"
+        response.url = request.url
+        response.request = request
+        response.elapsed = datetime.timedelta(seconds=time.perf_counter() - started)
+        return response
+
+    def close(self):
+        pass
+
+
+# aiohttp transport
+
+class _CassetteSession:
+    """Replaces ``session.request(...)`` for AsyncSVECTOR while a cassette is in use"""
+
+    def __init__(self, cassette: Cassette, session: Any):
+        self.cassette = cassette
+        self.session = session
+
+    def request(self, method: str, url: str, **kwargs) -> "_AsyncRequest":
+        return _AsyncRequest(self, method, url, kwargs)
+
+
+class _AsyncRequest:
+    """Usable with ``await`` and ``async with``, like aiohttp's request context manager"""
+
+    def __init__(self, owner: _CassetteSession, method: str, url: str, kwargs: Dict[str, Any]):
+        self.owner = owner
+        self.method = method
+        self.url = url
+        self.kwargs = kwargs
+        self.response: Any = None
+
+    def __await__(self):
+        return self._send().__await__()
+
+    async def __aenter__(self):
+        return await self._send()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.response.release()
+
+    async def _send(self):
+        cassette = self.owner.cassette
+        started = time.perf_counter()
+        body = self.kwargs.get("json")
+        if body is None:
+            body = self.kwargs.get("data")
+        if cassette.mode == "replay":
+            entry = cassette.find(self.method, self.url, body)
+            await _async_delay(cassette, entry["ttfb"])
+            self.response = _ReplayAsyncResponse(cassette, entry, started)
+            return self.response
+
+        entry = cassette.new_entry(self.method, self.url, body)
+        response = await self.owner.session.request(self.method, self.url, **self.kwargs)
+        entry["status"] = response.status
+        entry["headers"] = _response_headers(response.headers)
+        entry["ttfb"] = round(time.perf_counter() - started, 6)
+        self.response = _RecordingAsyncResponse(response, _ChunkRecorder(cassette, entry, started))
+        return self.response
+
+
+async def _async_delay(cassette: Cassette, seconds: float):
+    if cassette.time_scale > 0 and seconds > 0:
+        await asyncio.sleep(seconds * cassette.time_scale)
+
+
+class _RecordingAsyncResponse:
+    def __init__(self, response: Any, recorder: _ChunkRecorder):
+        self._response = response
+        self._recorder = recorder
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+    async def read(self) -> bytes:
+        body = await self._response.read()
+        if not self._recorder.saved:
+            self._recorder.chunk(body)
+            self._recorder.save()
+        return body
+
+    async def text(self, encoding: Optional[str] = None) -> str:
+        return (await self.read()).decode(encoding or self._response.get_encoding())
+
+    async def json(self, **kwargs) -> Any:
+        return json.loads(await self.read())
+
+    def release(self):
+        self._recorder.save()
+        return self._response.release()
+
+
+class _ReplayAsyncResponse:
+    def __init__(self, cassette: Cassette, entry: Dict[str, Any], started: float):
+        self._cassette = cassette
+        self._chunks = _decode_chunks(entry)
+        self._started = started
+        self.status = entry["status"]
+        self.headers = CaseInsensitiveDict(entry["headers"])
+        self._body: Optional[bytes] = None
+
+    async def read(self) -> bytes:
+        if self._body is None:
+            if self._chunks:
+                elapsed = (time.perf_counter() - self._started) / (self._cassette.time_scale or 1)
+                await _async_delay(self._cassette, self._chunks[-1][0] - elapsed)
+            self._body = b"".join(data for _, data in self._chunks)
+        return self._body
+
+    async def text(self, encoding: Optional[str] = None) -> str:
+        return (await self.read()).decode(encoding or "utf-8")
+
+    async def json(self, **kwargs) -> Any:
+        return json.loads(await self.read())
+
+    def release(self):
+        pass
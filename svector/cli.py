@@ -10,7 +10,12 @@ import os
 import sys
 from pathlib import Path
 
+import requests
+
 from svector import SVECTOR
+from svector.emulator import Emulator, Faults
+from svector.jobs import BatchJob, QueueWorker, WorkQueue
+from svector.loadtest import LoadTest
 
 CONFIG_DIR = Path.home() / '.svector'
 CONFIG_FILE = CONFIG_DIR / 'config.json'
@@ -38,7 +43,7 @@ def save_config(config):
     except Exception as e:
         print(f"Error saving config: {e}")
 
-def get_client():
+def get_client(**kwargs):
     """Get SVECTOR client with API key"""
     config = load_config()
     api_key = os.getenv('SVECTOR_API_KEY') or config.get('api_key')
@@ -49,7 +54,7 @@ def get_client():
         print("Or set SVECTOR_API_KEY environment variable")
         sys.exit(1)
         
-    return SVECTOR(api_key=api_key)
+    return SVECTOR(api_key=api_key, **kwargs)
 
 def cmd_chat(args):
     """Handle chat command"""
@@ -175,6 +180,180 @@ def cmd_ask(args):
         print(f"Error: {e}")
         sys.exit(1)
 
+def cmd_batch(args):
+    """Handle batch command"""
+    if args.batch_action in ("enqueue", "work", "status", "export"):
+        return cmd_batch_queue(args)
+    if args.batch_action != "run":
+        print("Usage: svector batch {run,enqueue,work,status,export} ...")
+        sys.exit(1)
+        
+    if not os.path.exists(args.input):
+        print(f"File not found: {args.input}")
+        sys.exit(1)
+        
+    client = get_client()
+    job = BatchJob(
+        client,
+        args.input,
+        args.output,
+        dead_letter_path=args.dead_letter,
+        checkpoint_path=args.checkpoint,
+        concurrency=args.concurrency,
+        resume=not args.restart
+    )
+    
+    try:
+        stats = job.run()
+    except KeyboardInterrupt:
+        print("\nInterrupted - progress saved, re-run the same command to resume")
+        sys.exit(130)
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+        
+    print(f"Batch complete: {stats.succeeded} succeeded, {stats.failed} failed, "
+          f"{job.skipped} already done")
+    print(f"Throughput: {stats.throughput:.2f} req/s, p50 latency {stats.latency_percentile(50):.2f}s")
+    print(f"Results: {job.output_path}")
+    if stats.failed:
+        print(f"Failures: {job.dead_letter_path}")
+
+def cmd_batch_queue(args):
+    """Handle shared work queue batch commands"""
+    if args.batch_action == "enqueue" and not os.path.exists(args.input):
+        print(f"File not found: {args.input}")
+        sys.exit(1)
+        
+    try:
+        queue = WorkQueue(args.queue, max_attempts=args.max_attempts, wal=not args.no_wal)
+        if args.batch_action == "enqueue":
+            added = queue.enqueue(args.input)
+            print(f"Enqueued {added} requests into {args.queue}")
+        elif args.batch_action == "work":
+            worker = QueueWorker(
+                get_client(),
+                queue,
+                concurrency=args.concurrency,
+                lease_seconds=args.lease_seconds,
+                wait=not args.no_wait
+            )
+            print(f"Worker {worker.worker_id} started")
+            try:
+                stats = worker.run()
+            except KeyboardInterrupt:
+                print("\nInterrupted - unfinished leases will be picked up by other workers")
+                sys.exit(130)
+            print(f"Worker done: {stats.succeeded} succeeded, {stats.failed} failed, "
+                  f"{stats.throughput:.2f} req/s")
+        elif args.batch_action == "export":
+            written = queue.export(args.output, args.dead_letter)
+            print(f"Exported {written['done']} results to {args.output}")
+            if written["failed"]:
+                print(f"Exported {written['failed']} failures")
+        counts = queue.counts()
+        print(f"Queue: {counts['pending']} pending, {counts['leased']} leased, "
+              f"{counts['done']} done, {counts['failed']} failed")
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+def cmd_emulate(args):
+    """Handle emulate command"""
+    faults = Faults(
+        rate_limit=args.rate_limit,
+        retry_after=args.retry_after,
+        server_error=args.server_error,
+        gateway_timeout=args.gateway_timeout,
+        gateway_delay=args.gateway_delay,
+        reset=args.reset,
+        slow_first_token=args.slow_first_token,
+        slow_first_token_delay=args.slow_first_token_delay,
+        stall=args.stall,
+        stall_delay=args.stall_delay,
+        seed=args.seed
+    )
+    if sum((args.rate_limit, args.server_error, args.gateway_timeout, args.reset)) > 1:
+        print("Error: --rate-limit, --server-error, --gateway-timeout and --reset must add up to at most 1")
+        sys.exit(1)
+        
+    emulator = Emulator(
+        latency=args.latency,
+        token_interval=args.token_interval,
+        tokens=args.tokens,
+        host=args.host,
+        port=args.port,
+        faults=faults
+    )
+    
+    def ready(base_url):
+        print(f"SVECTOR emulator listening on {base_url} (Ctrl+C to stop)")
+        print(f"Point the SDK at it with: SVECTOR(api_key=\"test\", base_url=\"{base_url}\")")
+        
+    emulator.serve_forever(ready=ready)
+    print(f"Served {emulator.stats['requests']} completions; injected faults: "
+          + (", ".join(f"{name}={emulator.stats[name]}" for name in sorted(emulator.stats)
+                       if name not in ("requests", "streams", "uploads")) or "none"))
+
+def cmd_loadtest(args):
+    """Handle loadtest command"""
+    try:
+        stages = [int(level) for level in args.concurrency.split(",") if level.strip()]
+    except ValueError:
+        print(f"Error: --concurrency must be a comma-separated list of integers, not {args.concurrency!r}")
+        sys.exit(1)
+        
+    # One pooled connection per worker
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(stages or [1]))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    client_options = {"http_client": session, "max_retries": args.max_retries, "timeout": args.timeout}
+    if args.base_url:
+        client_options["base_url"] = args.base_url
+    client = get_client(**client_options)
+    
+    try:
+        test = LoadTest(
+            client,
+            model=args.model,
+            input=args.input,
+            instructions=args.instructions,
+            stream=args.stream,
+            max_tokens=args.max_tokens,
+            stages=stages,
+            stage_duration=args.duration,
+            max_error_rate=args.max_error_rate,
+            min_gain=args.min_gain,
+            stop_at_saturation=not args.no_stop
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+        
+    print(f"Load testing {client.base_url} with {'create_stream' if args.stream else 'create'} "
+          f"on {args.model}: stages {', '.join(map(str, stages))}, {args.duration:g}s each")
+    
+    def progress(stage):
+        print(f"  concurrency {stage.concurrency}: {stage.completed} requests, "
+              f"{stage.throughput:.2f} req/s, {stage.error_rate:.1%} errors")
+        
+    try:
+        test.run(on_stage=progress)
+    except KeyboardInterrupt:
+        print("\nInterrupted - reporting completed stages")
+    finally:
+        client.close()
+        
+    print()
+    print(test.report())
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(test.to_dict(), f, indent=2)
+        print(f"Results: {args.json}")
+    if test.fatal_error is not None:
+        sys.exit(1)
+
 def main():
     """Main CLI entry point"""
     parser = argparse.ArgumentParser(
@@ -188,6 +367,11 @@ Examples:
   svector config set-key sk-your-api-key-here
   svector file upload document.pdf
   svector ask "Summarize this document" --file file-123
+  svector batch run requests.jsonl -o results.jsonl --concurrency 16
+  svector batch enqueue requests.jsonl --queue nightly.queue
+  svector batch work --queue nightly.queue --concurrency 16
+  svector emulate --port 8080 --latency 0.2 --rate-limit 0.05 --reset 0.01
+  svector loadtest --stream --concurrency 1,4,16,64 --duration 20
 
 For more info: https://www.svector.co.in
         """
@@ -239,6 +423,76 @@ For more info: https://www.svector.co.in
     ask_parser.add_argument("--file", required=True, help="File ID to query")
     ask_parser.set_defaults(func=cmd_ask)
     
+    # Batch command
+    batch_parser = subparsers.add_parser("batch", help="Batch processing of JSONL request files")
+    batch_subparsers = batch_parser.add_subparsers(dest="batch_action")
+    
+    run_parser = batch_subparsers.add_parser("run", help="Run a JSONL file of requests (resumable)")
+    run_parser.add_argument("input", help="Input JSONL file, one request per line")
+    run_parser.add_argument("-o", "--output", required=True, help="Output JSONL file for results")
+    run_parser.add_argument("--dead-letter", help="JSONL file for failed requests (default: <output>.failed.jsonl)")
+    run_parser.add_argument("--checkpoint", help="Checkpoint file (default: <output>.checkpoint)")
+    run_parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight")
+    run_parser.add_argument("--restart", action="store_true", help="Ignore previous progress and start over")
+    
+    enqueue_parser = batch_subparsers.add_parser("enqueue", help="Add a JSONL file to a shared work queue")
+    enqueue_parser.add_argument("input", help="Input JSONL file, one request per line")
+    
+    work_parser = batch_subparsers.add_parser("work", help="Process tasks from a shared work queue")
+    work_parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight")
+    work_parser.add_argument("--lease-seconds", type=float, default=300.0, help="Lease duration before tasks are retried elsewhere")
+    work_parser.add_argument("--no-wait", action="store_true", help="Exit once nothing is left to lease")
+    
+    status_parser = batch_subparsers.add_parser("status", help="Show work queue progress")
+    
+    export_parser = batch_subparsers.add_parser("export", help="Write work queue results to JSONL")
+    export_parser.add_argument("-o", "--output", required=True, help="Output JSONL file for results")
+    export_parser.add_argument("--dead-letter", help="JSONL file for failed requests (default: <output>.failed.jsonl)")
+    
+    for queue_parser in (enqueue_parser, work_parser, status_parser, export_parser):
+        queue_parser.add_argument("--queue", required=True, help="Work queue file shared by all workers")
+        queue_parser.add_argument("--max-attempts", type=int, default=3, help="Attempts per request before giving up")
+        queue_parser.add_argument("--no-wal", action="store_true", help="Disable WAL mode (needed on network filesystems)")
+    batch_parser.set_defaults(func=cmd_batch)
+    
+    # Emulate command
+    emulate_parser = subparsers.add_parser("emulate", help="Run a local SVECTOR API emulator with fault injection")
+    emulate_parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    emulate_parser.add_argument("--port", type=int, default=8080, help="Port to bind (0 picks a free one)")
+    emulate_parser.add_argument("--latency", type=float, default=0.1, help="Seconds to first token")
+    emulate_parser.add_argument("--token-interval", type=float, default=0.02, help="Seconds between tokens")
+    emulate_parser.add_argument("--tokens", type=int, default=32, help="Tokens per completion")
+    emulate_parser.add_argument("--rate-limit", type=float, default=0.0, help="Fraction of requests answered with 429")
+    emulate_parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds on 429 responses")
+    emulate_parser.add_argument("--server-error", type=float, default=0.0, help="Fraction answered with 500/502/503")
+    emulate_parser.add_argument("--gateway-timeout", type=float, default=0.0, help="Fraction answered with 504")
+    emulate_parser.add_argument("--gateway-delay", type=float, default=0.0, help="Seconds before a 504 is sent")
+    emulate_parser.add_argument("--reset", type=float, default=0.0, help="Fraction of connections dropped (streams: mid-stream)")
+    emulate_parser.add_argument("--slow-first-token", type=float, default=0.0, help="Fraction with a delayed first token")
+    emulate_parser.add_argument("--slow-first-token-delay", type=float, default=5.0, help="Extra seconds before a slow first token")
+    emulate_parser.add_argument("--stall", type=float, default=0.0, help="Fraction of streams that stall mid-stream")
+    emulate_parser.add_argument("--stall-delay", type=float, default=10.0, help="Seconds a stalled stream pauses")
+    emulate_parser.add_argument("--seed", type=int, help="Seed for a reproducible fault sequence")
+    emulate_parser.set_defaults(func=cmd_emulate)
+    
+    # Loadtest command
+    loadtest_parser = subparsers.add_parser("loadtest", help="Measure sustainable concurrency with a stepped ramp")
+    loadtest_parser.add_argument("--base-url", help="API base URL (default: the SVECTOR API)")
+    loadtest_parser.add_argument("--model", default="spec-3-turbo", help="Model to use")
+    loadtest_parser.add_argument("--input", default="Write one sentence about load testing.", help="User input for every request")
+    loadtest_parser.add_argument("--instructions", help="System instructions for every request")
+    loadtest_parser.add_argument("--max-tokens", type=int, help="Max tokens per completion")
+    loadtest_parser.add_argument("--stream", action="store_true", help="Use create_stream and measure time to first token")
+    loadtest_parser.add_argument("--concurrency", default="1,2,4,8,16,32", help="Comma-separated concurrency per stage")
+    loadtest_parser.add_argument("--duration", type=float, default=30.0, help="Seconds per stage")
+    loadtest_parser.add_argument("--max-error-rate", type=float, default=0.05, help="Error rate that counts as saturated")
+    loadtest_parser.add_argument("--min-gain", type=float, default=0.1, help="Throughput gain a stage needs over the best earlier one")
+    loadtest_parser.add_argument("--no-stop", action="store_true", help="Run every stage even after saturation")
+    loadtest_parser.add_argument("--max-retries", type=int, default=0, help="SDK retries per request (0 shows raw errors)")
+    loadtest_parser.add_argument("--timeout", type=int, default=60, help="Request timeout in seconds")
+    loadtest_parser.add_argument("--json", help="Write the results to this JSON file")
+    loadtest_parser.set_defaults(func=cmd_loadtest)
+    
     args = parser.parse_args()
     
     if not args.command:
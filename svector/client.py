@@ -6,22 +6,49 @@ that offers a simplified interface with instructions and input parameters.
 """
 
 import asyncio
+import concurrent.futures
+import contextlib
+import contextvars
+import functools
 import json
+import logging
 import os
 import time
 from pathlib import Path
-from typing import (Any, AsyncIterator, BinaryIO, Dict, Iterator, List,
-                    Optional, Union)
+from typing import (Any, AsyncIterator, Awaitable, BinaryIO, Callable, Dict,
+                    Iterable, Iterator, List, Optional, Tuple, Type, Union)
 
 import aiohttp
 import requests
 
+from .batch import (FATAL_ERRORS, AsyncBatchRun, BatchItemResult,
+                    BatchResults, BatchStats, bind_requests, run_many)
+from .cache import ImageCache, resolve_image_cache
+from .cassette import Cassette
+from .compression import (RequestCompression, accept_encoding,
+                          resolve_compression)
 from .conversations import AsyncConversationsAPI, ConversationsAPI
-from .errors import (APIError, AuthenticationError, InternalServerError,
-                     NotFoundError, PermissionDeniedError, RateLimitError,
-                     SVECTORError, UnprocessableEntityError)
+from .engine import BackgroundEngine, get_default_engine
+from .errors import (APIConnectionError, APIConnectionTimeoutError, APIError,
+                     AuthenticationError, InternalServerError, NotFoundError,
+                     PermissionDeniedError, RateLimitError, SVECTORError,
+                     UnprocessableEntityError)
+from .hooks import RequestHooks, timing_trace_config
+from .images import ImagePreprocessor, resolve_preprocessor
+from .limits import (AdaptiveConcurrencyLimiter, RequestScheduler,
+                     SharedRateLimiter, current_priority, estimate_tokens,
+                     request_priority, resolve_priority, set_current_priority,
+                     settle_tokens)
+from .log import log_fields, new_request_id
+from .metrics import MetricsRegistry
+from .profiling import OverheadProfiler, profile_phase
+from .timeline import TimelineRecorder
+from .tracing import OpenTelemetryTracing
+from .uploads import UploadIndex, resolve_upload_index
 from .vision import ResponsesAPI, VisionAPI
 
+logger = logging.getLogger(__name__)
+
 
 class SVECTOR:
     """
@@ -67,7 +94,18 @@ class SVECTOR:
         timeout: int = 30,
         max_retries: int = 3,
         verify_ssl: bool = True,
-        http_client: Optional[requests.Session] = None
+        http_client: Optional[requests.Session] = None,
+        async_engine: Union[bool, BackgroundEngine] = False,
+        concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        rate_limiter: Optional[SharedRateLimiter] = None,
+        hooks: Optional[Union[RequestHooks, Dict[str, Any]]] = None,
+        metrics: Union[bool, MetricsRegistry] = False,
+        tracing: Union[bool, OpenTelemetryTracing] = False,
+        compression: Union[bool, str, RequestCompression, None] = None,
+        image_preprocessing: Union[bool, ImagePreprocessor] = False,
+        image_uploads: Union[bool, str, Path, UploadIndex] = False,
+        image_cache: Union[bool, int, ImageCache] = False
     ):
         # Get API key from environment if not provided
         if not api_key:
@@ -82,6 +120,31 @@ class SVECTOR:
         self.max_retries = max_retries
         self.verify_ssl = verify_ssl
         self.http_client = http_client or requests.Session()
+        self.concurrency_limiter = concurrency_limiter
+        self.scheduler = scheduler
+        self.rate_limiter = rate_limiter
+        self.hooks = hooks if isinstance(hooks, RequestHooks) else RequestHooks(hooks)
+        self.metrics = metrics if isinstance(metrics, MetricsRegistry) else (MetricsRegistry() if metrics else None)
+        if self.metrics is not None:
+            self.metrics.attach(self.hooks)
+        
+        # Optional shared background event loop for all HTTP traffic
+        if isinstance(async_engine, BackgroundEngine):
+            self._engine: Optional[BackgroundEngine] = async_engine
+        else:
+            self._engine = get_default_engine() if async_engine else None
+        self._async_mirror: Optional['AsyncSVECTOR'] = None
+        # Set by profile(); None keeps every profiling point a no-op
+        self.profiler: Optional[OverheadProfiler] = None
+        # Set by use_cassette(); requests then bypass the background engine
+        self.cassette: Optional[Cassette] = None
+        self.compression = resolve_compression(compression)
+        # Downscaling and re-encoding of vision images (requires Pillow)
+        self.image_preprocessor = resolve_preprocessor(image_preprocessing)
+        # Content hash -> file_id index so each vision image is uploaded once
+        self.upload_index = resolve_upload_index(image_uploads)
+        # Base64 of image files memoized while they are unchanged
+        self.image_cache = resolve_image_cache(image_cache)
         
         # Configure session
         self.http_client.headers.update({
@@ -89,6 +152,8 @@ class SVECTOR:
             "User-Agent": "svector-python/1.1.0",
             "Content-Type": "application/json"
         })
+        if self.compression is not None:
+            self.http_client.headers["Accept-Encoding"] = accept_encoding()
         
         # Initialize API endpoints
         self.conversations = ConversationsAPI(self)  # API
@@ -99,6 +164,11 @@ class SVECTOR:
         self.vision = VisionAPI(self)                # Vision API
         self.responses = ResponsesAPI(self)          # Responses API (alias for vision)
         
+        # Optional OpenTelemetry spans; nothing is wrapped unless enabled
+        self.tracing = tracing if isinstance(tracing, OpenTelemetryTracing) else (OpenTelemetryTracing() if tracing else None)
+        if self.tracing is not None:
+            self.tracing.instrument(self)
+        
     def request(
         self,
         method: str,
@@ -109,6 +179,8 @@ class SVECTOR:
         timeout: Optional[int] = None,
         max_retries: Optional[int] = None,
         headers: Optional[Dict[str, str]] = None,
+        priority: Optional[Union[str, int]] = None,
+        deadline: Optional[float] = None,
         **kwargs
     ) -> Union[Dict, requests.Response]:
         """
@@ -123,6 +195,8 @@ class SVECTOR:
             timeout: Request timeout
             max_retries: Maximum retries
             headers: Additional headers
+            priority: Scheduler priority class (defaults to the enclosing ``priority()`` block)
+            deadline: Seconds from now after which a still-queued request fails
             **kwargs: Additional request parameters
             
         Returns:
@@ -131,54 +205,250 @@ class SVECTOR:
         url = f"{self.base_url}{endpoint}"
         timeout = timeout or self.timeout
         max_retries = max_retries or self.max_retries
+        schedule = resolve_priority(priority, deadline)
+        reserved_tokens = estimate_tokens(data) if self.rate_limiter and not files else 0
+        profiler = self.profiler
         
-        # Prepare headers
-        req_headers = self.http_client.headers.copy()
-        if headers:
-            req_headers.update(headers)
+        with profile_phase(profiler, "prepare"):
+            # Prepare headers
+            req_headers = self.http_client.headers.copy()
+            if headers:
+                req_headers.update(headers)
+                
+            # Remove Content-Type for file uploads (None also drops the session's default)
+            if files:
+                req_headers["Content-Type"] = None
             
-        # Remove Content-Type for file uploads
-        if files:
-            req_headers.pop("Content-Type", None)
+        # With compression on, the JSON body is serialized (and maybe compressed) here
+        body = uncompressed_size = None
+        if self.compression is not None and data is not None and not files:
+            with profile_phase(profiler, "compress"):
+                body, encoding_headers, size = self.compression.encode(data)
+                req_headers.update(encoding_headers)
+                if "Content-Encoding" in encoding_headers:
+                    uncompressed_size = size
+        json_data = data if not files and body is None else None
+        form_data = data if files else body
+            
+        # Log records are only built when the "svector" logger is enabled
+        request_id = new_request_id() if logger.isEnabledFor(logging.INFO) else None
+        log_debug = request_id is not None and logger.isEnabledFor(logging.DEBUG)
             
         for attempt in range(max_retries + 1):
+            timing = self.hooks.start(method.upper(), url, attempt, data)
+            if timing is not None:
+                timing.uncompressed_bytes = uncompressed_size
+            queued = time.perf_counter() if profiler is not None else None
             try:
-                response = self.http_client.request(
-                    method=method.upper(),
-                    url=url,
-                    json=data if not files else None,
-                    data=data if files else None,
-                    files=files,
-                    headers=req_headers,
-                    timeout=timeout,
-                    stream=stream,
-                    verify=self.verify_ssl,
-                    **kwargs
-                )
-                
-                # Handle HTTP errors
-                self._handle_response_errors(response)
-                
-                if stream:
-                    return response
-                else:
-                    return response.json()
+                with self._attempt_slot(schedule, reserved_tokens if attempt == 0 else 0):
+                    if profiler is not None:
+                        profiler.record("queued", time.perf_counter() - queued)
+                    if timing is not None:
+                        timing.mark_sent()
+                    if log_debug:
+                        sent = time.perf_counter()
+                        logger.debug(
+                            "%s %s attempt %d", method.upper(), endpoint, attempt + 1,
+                            extra=log_fields("request.start", request_id, method=method.upper(), endpoint=endpoint, attempt=attempt)
+                        )
+                    with profile_phase(profiler, "transport"):
+                        # Other requests options have no engine equivalent, so such calls use the session
+                        if self._engine is not None and self.cassette is None and kwargs.keys() <= _ENGINE_KWARGS:
+                            response = self._engine.request(
+                                method.upper(),
+                                url,
+                                headers={name: value for name, value in req_headers.items() if value is not None},
+                                json=json_data,
+                                data=form_data,
+                                files=files,
+                                timeout=timeout,
+                                stream=stream,
+                                verify=self.verify_ssl,
+                                trace=timing,
+                                **kwargs
+                            )
+                        else:
+                            response = self.http_client.request(
+                                method=method.upper(),
+                                url=url,
+                                json=json_data,
+                                data=form_data,
+                                files=files,
+                                headers=req_headers,
+                                timeout=timeout,
+                                stream=stream,
+                                verify=self.verify_ssl,
+                                **kwargs
+                            )
+                    
+                    if log_debug:
+                        duration = time.perf_counter() - sent
+                        logger.debug(
+                            "%s %s -> %d in %.3fs", method.upper(), endpoint, response.status_code, duration,
+                            extra=log_fields(
+                                "request.response", request_id, status=response.status_code, duration=duration,
+                                server_request_id=response.headers.get("x-request-id")
+                            )
+                        )
                     
-            except requests.exceptions.Timeout:
+                    # Handle HTTP errors
+                    self._handle_response_errors(response)
+                    
+                    if stream:
+                        if timing is not None:
+                            self.hooks.response(timing, response, stream=True)
+                            response._svector_timing = timing
+                        return response
+                    else:
+                        with profile_phase(profiler, "decode"):
+                            result = response.json()
+                        settle_tokens(self.rate_limiter, reserved_tokens, result)
+                        self.hooks.response(timing, response, result)
+                        return result
+                    
+            except requests.exceptions.Timeout as e:
                 if attempt == max_retries:
-                    raise SVECTORError("Request timeout")
-                time.sleep(2 ** attempt)  # Exponential backoff
-            except requests.exceptions.ConnectionError:
+                    raise self.hooks.error(timing, APIConnectionTimeoutError("Request timeout"))
+                self.hooks.retry(timing, e)
+                if request_id is not None:
+                    logger.info(
+                        "%s %s timed out, retrying in %ds", method.upper(), endpoint, 2 ** attempt,
+                        extra=log_fields("request.retry", request_id, attempt=attempt, error="timeout", delay=2 ** attempt)
+                    )
+                with profile_phase(profiler, "backoff", cpu=False):
+                    time.sleep(2 ** attempt)  # Exponential backoff
+            except requests.exceptions.ConnectionError as e:
                 if attempt == max_retries:
-                    raise SVECTORError("Connection error")
-                time.sleep(2 ** attempt)
+                    raise self.hooks.error(timing, APIConnectionError("Connection error"))
+                self.hooks.retry(timing, e)
+                if request_id is not None:
+                    logger.info(
+                        "%s %s connection failed (%s), retrying in %ds", method.upper(), endpoint, e, 2 ** attempt,
+                        extra=log_fields("request.retry", request_id, attempt=attempt, error="connection", delay=2 ** attempt)
+                    )
+                with profile_phase(profiler, "backoff", cpu=False):
+                    time.sleep(2 ** attempt)
             except (AuthenticationError, NotFoundError, PermissionDeniedError, 
                    UnprocessableEntityError, RateLimitError, APIError) as e:
                 # Don't retry these errors
-                raise e
+                raise self.hooks.error(timing, e)
+            except Exception as e:
+                raise self.hooks.error(timing, e)
                 
         raise SVECTORError("Max retries exceeded")
     
+    @contextlib.contextmanager
+    def _attempt_slot(self, schedule: Optional[tuple] = None, tokens: int = 0):
+        """Scheduler, rate and concurrency slots held for one HTTP attempt (not across backoff sleeps)"""
+        with contextlib.ExitStack() as stack:
+            if self.scheduler is not None:
+                stack.enter_context(self.scheduler.slot(*(schedule or resolve_priority())))
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(tokens)
+            if self.concurrency_limiter is not None:
+                stack.enter_context(self.concurrency_limiter.slot())
+            yield
+    
+    @contextlib.contextmanager
+    def record_timeline(self, path: Optional[Union[str, Path]] = None, recorder: Optional[TimelineRecorder] = None):
+        """
+        Record request phases made inside the block as a Chrome trace
+        
+        Args:
+            path: File to write the trace-event JSON to when the block exits
+            recorder: Existing TimelineRecorder to add to (e.g. across several blocks)
+            
+        Example:
+            with client.record_timeline("run.trace.json"):
+                client.conversations.create_many(requests, concurrency=16)
+            # Load run.trace.json in https://ui.perfetto.dev
+        """
+        recorder = recorder or TimelineRecorder()
+        recorder.attach(self.hooks)
+        try:
+            yield recorder
+        finally:
+            recorder.detach()
+            if path is not None:
+                recorder.save(path)
+    
+    @contextlib.contextmanager
+    def profile(self, path: Optional[Union[str, Path]] = None, profiler: Optional[OverheadProfiler] = None):
+        """
+        Attribute wall and CPU time of requests made inside the block to SDK phases
+        
+        Args:
+            path: File to write the JSON summary to when the block exits
+            profiler: Existing OverheadProfiler to add to
+            
+        Example:
+            with client.profile() as profiler:
+                client.conversations.create_many(requests, concurrency=8)
+            print(profiler.report())
+        """
+        profiler = profiler or OverheadProfiler()
+        previous, self.profiler = self.profiler, profiler
+        try:
+            yield profiler
+        finally:
+            self.profiler = previous
+            profiler.stop()
+            if path is not None:
+                profiler.save(path)
+    
+    @contextlib.contextmanager
+    def use_cassette(
+        self,
+        cassette: Union[str, Path, Cassette],
+        mode: str = "replay",
+        time_scale: float = 1.0,
+        match: str = "body"
+    ):
+        """
+        Record the HTTP exchanges made inside the block to a cassette, or replay them
+        
+        While the block runs, requests go through the ``requests`` session
+        (not the background engine) so the cassette sees every exchange.
+        
+        Args:
+            cassette: Cassette file, or an open Cassette (left open on exit)
+            mode: "record" or "replay"
+            time_scale: Replay delay multiplier (1.0 = recorded timing, 0 = instant)
+            match: "body" or "sequence" (see ``Cassette``)
+            
+        Example:
+            with client.use_cassette("traffic.cassette", mode="record"):
+                client.conversations.create(model="spec-3-turbo", instructions="...", input="Hi")
+        """
+        owned = not isinstance(cassette, Cassette)
+        if owned:
+            cassette = Cassette(cassette, mode=mode, time_scale=time_scale, match=match)
+        adapters = self.http_client.adapters.copy()
+        for prefix, adapter in adapters.items():
+            self.http_client.mount(prefix, cassette.requests_adapter(adapter))
+        previous, self.cassette = self.cassette, cassette
+        try:
+            yield cassette
+        finally:
+            self.cassette = previous
+            self.http_client.adapters = adapters
+            if owned:
+                cassette.close()
+    
+    def priority(self, priority: Union[str, int], deadline: Optional[float] = None):
+        """
+        Context manager assigning a scheduler priority to requests made inside it
+        
+        Args:
+            priority: "interactive", "default", "batch" or an int rank (lower runs first)
+            deadline: Seconds from now after which still-queued requests fail
+            
+        Example:
+            with client.priority("interactive", deadline=5):
+                client.conversations.create(model="spec-3-turbo", input="Hi")
+        """
+        return request_priority(priority, deadline)
+    
     def _handle_response_errors(self, response: requests.Response):
         """Handle HTTP response errors"""
         if response.status_code == 401:
@@ -190,9 +460,9 @@ class SVECTOR:
         elif response.status_code == 422:
             raise UnprocessableEntityError("Validation error", response.status_code)
         elif response.status_code == 429:
-            raise RateLimitError("Rate limit exceeded", response.status_code)
+            raise RateLimitError("Rate limit exceeded", response.status_code, headers=response.headers)
         elif response.status_code >= 500:
-            raise APIError("Internal server error", response.status_code)
+            raise APIError("Internal server error", response.status_code, headers=response.headers)
         elif response.status_code >= 400:
             error_msg = "API error"
             try:
@@ -202,6 +472,88 @@ class SVECTOR:
                 pass
             raise APIError(error_msg, response.status_code)
 
+    def submit(self, fn, *args, **kwargs) -> concurrent.futures.Future:
+        """
+        Schedule an API call on the background engine and return a future
+        
+        Non-streaming ``conversations.create``, ``chat.create``, ``models.list`` and
+        ``knowledge.add_file`` calls run natively on the engine's event loop, so
+        thousands of them can be in flight without a thread each. Other calls
+        (vision, file uploads, streams) run on the loop's bounded worker pool.
+        
+        Args:
+            fn: Bound API method of this client, e.g. ``client.conversations.create``
+            *args: Positional arguments for the call
+            **kwargs: Keyword arguments for the call
+            
+        Returns:
+            concurrent.futures.Future resolving to the call's result
+            
+        Example:
+            client = SVECTOR(async_engine=True)
+            future = client.submit(client.conversations.create, model="spec-3-turbo", input="Hi")
+            print(future.result().output)
+        """
+        if self._engine is None:
+            raise ValueError("submit() requires a client created with async_engine=True")
+        
+        api_name = self._async_api_name(fn, kwargs)
+        if api_name is not None:
+            coro = self._call_async(api_name, fn.__name__, args, kwargs, current_priority())
+        else:
+            call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+            coro = self._call_blocking(call)
+        return self._engine.submit(coro)
+    
+    def _async_api_name(self, fn, kwargs: Dict) -> Optional[str]:
+        """Return the API attribute name if ``fn`` has a native async counterpart"""
+        if kwargs.get("stream"):
+            return None
+        owner = getattr(fn, "__self__", None)
+        for api_name, method_name in _ASYNC_SUBMITTABLE:
+            if getattr(self, api_name) is owner and fn.__name__ == method_name:
+                return api_name
+        return None
+    
+    async def _call_async(
+        self,
+        api_name: str,
+        method_name: str,
+        args: tuple,
+        kwargs: Dict,
+        priority_state: Optional[tuple]
+    ) -> Any:
+        # Runs in its own task, so this does not leak into other submissions
+        set_current_priority(priority_state)
+        if self._async_mirror is None:
+            # Created on the engine loop so it can share the engine's session
+            self._async_mirror = AsyncSVECTOR(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                timeout=self.timeout,
+                max_retries=self.max_retries,
+                verify_ssl=self.verify_ssl,
+                http_client=self._engine.session,
+                concurrency_limiter=self.concurrency_limiter,
+                scheduler=self.scheduler,
+                rate_limiter=self.rate_limiter,
+                hooks=self.hooks,
+                compression=self.compression
+            )
+        self._async_mirror.profiler = self.profiler
+        self._async_mirror.cassette = self.cassette
+        api = getattr(self._async_mirror, api_name)
+        return await getattr(api, method_name)(*args, **kwargs)
+    
+    async def _call_blocking(self, call) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(None, call)
+    
+    def close(self):
+        """Close the HTTP session and any privately owned background engine"""
+        self.http_client.close()
+        if self._engine is not None and self._engine is not get_default_engine():
+            self._engine.close()
+
     # Convenience methods for different HTTP verbs
     def get(self, endpoint: str, **kwargs) -> Dict:
         """Make GET request"""
@@ -220,6 +572,18 @@ class SVECTOR:
         return self.request("DELETE", endpoint, **kwargs)
 
 
+# requests options the background engine accepts for SVECTOR.request
+_ENGINE_KWARGS = frozenset({"params", "allow_redirects"})
+
+# (API attribute, method) pairs that ``SVECTOR.submit`` runs natively on the engine loop
+_ASYNC_SUBMITTABLE = (
+    ("conversations", "create"),
+    ("chat", "create"),
+    ("models", "list"),
+    ("knowledge", "add_file"),
+)
+
+
 class AsyncSVECTOR:
     """
     Async SVECTOR API Client
@@ -242,7 +606,14 @@ class AsyncSVECTOR:
         timeout: int = 30,
         max_retries: int = 3,
         verify_ssl: bool = True,
-        http_client: Optional[aiohttp.ClientSession] = None
+        http_client: Optional[aiohttp.ClientSession] = None,
+        concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        rate_limiter: Optional[SharedRateLimiter] = None,
+        hooks: Optional[Union[RequestHooks, Dict[str, Any]]] = None,
+        metrics: Union[bool, MetricsRegistry] = False,
+        tracing: Union[bool, OpenTelemetryTracing] = False,
+        compression: Union[bool, str, RequestCompression, None] = None
     ):
         if not api_key:
             api_key = os.environ.get("SVECTOR_API_KEY")
@@ -257,6 +628,16 @@ class AsyncSVECTOR:
         self.verify_ssl = verify_ssl
         self._http_client = http_client
         self._session_owned = http_client is None
+        self.concurrency_limiter = concurrency_limiter
+        self.scheduler = scheduler
+        self.rate_limiter = rate_limiter
+        self.hooks = hooks if isinstance(hooks, RequestHooks) else RequestHooks(hooks)
+        self.metrics = metrics if isinstance(metrics, MetricsRegistry) else (MetricsRegistry() if metrics else None)
+        if self.metrics is not None:
+            self.metrics.attach(self.hooks)
+        self.profiler: Optional[OverheadProfiler] = None
+        self.cassette: Optional[Cassette] = None
+        self.compression = resolve_compression(compression)
         
         # Initialize API endpoints
         self.conversations = AsyncConversationsAPI(self)
@@ -265,6 +646,10 @@ class AsyncSVECTOR:
         self.files = AsyncFilesAPI(self)
         self.knowledge = AsyncKnowledgeAPI(self)
         
+        self.tracing = tracing if isinstance(tracing, OpenTelemetryTracing) else (OpenTelemetryTracing() if tracing else None)
+        if self.tracing is not None:
+            self.tracing.instrument(self)
+        
     async def __aenter__(self):
         return self
         
@@ -276,20 +661,27 @@ class AsyncSVECTOR:
         if self._session_owned and self._http_client:
             await self._http_client.close()
             
+    def _default_headers(self) -> Dict[str, str]:
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "User-Agent": "svector-python/1.1.0",
+            "Content-Type": "application/json"
+        }
+        if self.compression is not None:
+            headers["Accept-Encoding"] = accept_encoding()
+        return headers
+            
     @property
     def http_client(self) -> aiohttp.ClientSession:
         """Get or create HTTP client session"""
         if self._http_client is None:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "User-Agent": "svector-python/1.1.0",
-                "Content-Type": "application/json"
-            }
+            headers = self._default_headers()
             timeout = aiohttp.ClientTimeout(total=self.timeout)
             self._http_client = aiohttp.ClientSession(
                 headers=headers,
                 timeout=timeout,
-                connector=aiohttp.TCPConnector(verify_ssl=self.verify_ssl)
+                connector=aiohttp.TCPConnector(verify_ssl=self.verify_ssl),
+                trace_configs=[timing_trace_config()]
             )
         return self._http_client
         
@@ -298,30 +690,232 @@ class AsyncSVECTOR:
         method: str,
         endpoint: str,
         data: Optional[Dict] = None,
+        priority: Optional[Union[str, int]] = None,
+        deadline: Optional[float] = None,
         **kwargs
     ) -> Dict:
         """Make async HTTP request"""
         url = f"{self.base_url}{endpoint}"
+        schedule = resolve_priority(priority, deadline)
+        reserved_tokens = estimate_tokens(data) if self.rate_limiter else 0
+        profiler = self.profiler
+        
+        # A caller-provided session may be shared with other clients, so
+        # authenticate (and apply this client's timeout) per request instead of
+        # relying on session settings
+        if not self._session_owned:
+            with profile_phase(profiler, "prepare"):
+                kwargs["headers"] = {**self._default_headers(), **(kwargs.get("headers") or {})}
+                kwargs.setdefault("timeout", aiohttp.ClientTimeout(total=self.timeout))
+                if not self.verify_ssl:
+                    kwargs.setdefault("ssl", False)
+        
+        body = uncompressed_size = None
+        if self.compression is not None and data is not None:
+            with profile_phase(profiler, "compress"):
+                body, encoding_headers, size = self.compression.encode(data)
+                kwargs["headers"] = {**(kwargs.get("headers") or {}), **encoding_headers}
+                if "Content-Encoding" in encoding_headers:
+                    uncompressed_size = size
+        
+        request_id = new_request_id() if logger.isEnabledFor(logging.INFO) else None
+        log_debug = request_id is not None and logger.isEnabledFor(logging.DEBUG)
         
         for attempt in range(self.max_retries + 1):
+            timing = self.hooks.start(method.upper(), url, attempt, data)
+            if timing is not None:
+                timing.uncompressed_bytes = uncompressed_size
+                kwargs["trace_request_ctx"] = timing
+            queued = time.perf_counter() if profiler is not None else None
             try:
-                async with self.http_client.request(
-                    method=method.upper(),
-                    url=url,
-                    json=data,
-                    **kwargs
-                ) as response:
-                    await self._handle_response_errors(response)
-                    return await response.json()
+                async with self._attempt_slot(schedule, reserved_tokens if attempt == 0 else 0):
+                    if profiler is not None:
+                        profiler.record("queued", time.perf_counter() - queued)
+                    if timing is not None:
+                        timing.mark_sent()
+                    if log_debug:
+                        sent = time.perf_counter()
+                        logger.debug(
+                            "%s %s attempt %d", method.upper(), endpoint, attempt + 1,
+                            extra=log_fields("request.start", request_id, method=method.upper(), endpoint=endpoint, attempt=attempt)
+                        )
+                    connecting = time.perf_counter() if profiler is not None else None
+                    session = self.http_client if self.cassette is None else self.cassette.aiohttp_session(self.http_client)
+                    async with session.request(
+                        method=method.upper(),
+                        url=url,
+                        json=data if body is None else None,
+                        data=body,
+                        **kwargs
+                    ) as response:
+                        if profiler is not None:
+                            profiler.record("transport", time.perf_counter() - connecting)
+                        if log_debug:
+                            duration = time.perf_counter() - sent
+                            logger.debug(
+                                "%s %s -> %d in %.3fs", method.upper(), endpoint, response.status, duration,
+                                extra=log_fields(
+                                    "request.response", request_id, status=response.status, duration=duration,
+                                    server_request_id=response.headers.get("x-request-id")
+                                )
+                            )
+                        await self._handle_response_errors(response)
+                        with profile_phase(profiler, "decode", cpu=False):
+                            result = await response.json()
+                        settle_tokens(self.rate_limiter, reserved_tokens, result)
+                        if timing is not None:
+                            timing.response_bytes = len(await response.read())
+                            self.hooks.response(timing, response, result)
+                        return result
                     
-            except asyncio.TimeoutError:
+            except asyncio.TimeoutError as e:
                 if attempt == self.max_retries:
-                    raise SVECTORError("Request timeout")
-                await asyncio.sleep(2 ** attempt)
-            except aiohttp.ClientError:
+                    raise self.hooks.error(timing, APIConnectionTimeoutError("Request timeout"))
+                self.hooks.retry(timing, e)
+                if request_id is not None:
+                    logger.info(
+                        "%s %s timed out, retrying in %ds", method.upper(), endpoint, 2 ** attempt,
+                        extra=log_fields("request.retry", request_id, attempt=attempt, error="timeout", delay=2 ** attempt)
+                    )
+                with profile_phase(profiler, "backoff", cpu=False):
+                    await asyncio.sleep(2 ** attempt)
+            except aiohttp.ClientError as e:
                 if attempt == self.max_retries:
-                    raise SVECTORError("Connection error")
-                await asyncio.sleep(2 ** attempt)
+                    raise self.hooks.error(timing, APIConnectionError("Connection error"))
+                self.hooks.retry(timing, e)
+                if request_id is not None:
+                    logger.info(
+                        "%s %s connection failed (%s), retrying in %ds", method.upper(), endpoint, e, 2 ** attempt,
+                        extra=log_fields("request.retry", request_id, attempt=attempt, error="connection", delay=2 ** attempt)
+                    )
+                with profile_phase(profiler, "backoff", cpu=False):
+                    await asyncio.sleep(2 ** attempt)
+            except Exception as e:
+                raise self.hooks.error(timing, e)
+                
+    @contextlib.asynccontextmanager
+    async def _attempt_slot(self, schedule: tuple, tokens: int = 0):
+        """Scheduler, rate and concurrency slots held for one HTTP attempt (not across backoff sleeps)"""
+        async with contextlib.AsyncExitStack() as stack:
+            if self.scheduler is not None:
+                await stack.enter_async_context(self.scheduler.slot_async(*schedule))
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async(tokens)
+            if self.concurrency_limiter is not None:
+                await stack.enter_async_context(self.concurrency_limiter.slot_async())
+            yield
+            
+    @contextlib.contextmanager
+    def record_timeline(self, path: Optional[Union[str, Path]] = None, recorder: Optional[TimelineRecorder] = None):
+        """Record request phases made inside the block as a Chrome trace (see ``SVECTOR.record_timeline``)"""
+        recorder = recorder or TimelineRecorder()
+        recorder.attach(self.hooks)
+        try:
+            yield recorder
+        finally:
+            recorder.detach()
+            if path is not None:
+                recorder.save(path)
+            
+    @contextlib.contextmanager
+    def profile(self, path: Optional[Union[str, Path]] = None, profiler: Optional[OverheadProfiler] = None):
+        """Attribute wall and CPU time of requests made inside the block to SDK phases (see ``SVECTOR.profile``)"""
+        profiler = profiler or OverheadProfiler()
+        previous, self.profiler = self.profiler, profiler
+        try:
+            yield profiler
+        finally:
+            self.profiler = previous
+            profiler.stop()
+            if path is not None:
+                profiler.save(path)
+            
+    @contextlib.contextmanager
+    def use_cassette(
+        self,
+        cassette: Union[str, Path, Cassette],
+        mode: str = "replay",
+        time_scale: float = 1.0,
+        match: str = "body"
+    ):
+        """Record the HTTP exchanges made inside the block to a cassette, or replay them (see ``SVECTOR.use_cassette``)"""
+        owned = not isinstance(cassette, Cassette)
+        if owned:
+            cassette = Cassette(cassette, mode=mode, time_scale=time_scale, match=match)
+        previous, self.cassette = self.cassette, cassette
+        try:
+            yield cassette
+        finally:
+            self.cassette = previous
+            if owned:
+                cassette.close()
+            
+    def priority(self, priority: Union[str, int], deadline: Optional[float] = None):
+        """Context manager assigning a scheduler priority to requests made inside it"""
+        return request_priority(priority, deadline)
+        
+    def as_completed(
+        self,
+        calls: Iterable[Union[Awaitable, Callable[[], Awaitable]]],
+        concurrency: Union[int, AdaptiveConcurrencyLimiter] = 16,
+        timeout: Optional[float] = None,
+        fatal_errors: Tuple[Type[BaseException], ...] = FATAL_ERRORS,
+        on_progress: Optional[Callable[[BatchItemResult, BatchStats], None]] = None
+    ) -> AsyncBatchRun:
+        """
+        Run awaitables with bounded concurrency, yielding results as they finish
+        
+        Args:
+            calls: Coroutines or zero-argument callables returning awaitables.
+                A generator keeps coroutine creation lazy.
+            concurrency: Maximum number of calls in flight, or an
+                AdaptiveConcurrencyLimiter to size the window dynamically
+            timeout: Per-item timeout in seconds
+            fatal_errors: Error types that cancel all remaining work and are re-raised
+            on_progress: Callback invoked with (item, stats) after each completion
+            
+        Returns:
+            Async iterator of BatchItemResult in completion order
+            
+        Example:
+            calls = (client.conversations.create(model="spec-3-turbo", input=q) for q in questions)
+            async for item in client.as_completed(calls, concurrency=32, timeout=60):
+                print(item.index, item.result.output if item.ok else item.error)
+        """
+        return AsyncBatchRun(
+            calls,
+            concurrency=concurrency,
+            timeout=timeout,
+            fatal_errors=fatal_errors,
+            on_progress=on_progress,
+            feedback=concurrency is not self.concurrency_limiter
+        )
+        
+    async def gather(
+        self,
+        calls: Iterable[Union[Awaitable, Callable[[], Awaitable]]],
+        concurrency: Union[int, AdaptiveConcurrencyLimiter] = 16,
+        timeout: Optional[float] = None,
+        fatal_errors: Tuple[Type[BaseException], ...] = FATAL_ERRORS,
+        on_progress: Optional[Callable[[BatchItemResult, BatchStats], None]] = None
+    ) -> BatchResults:
+        """
+        Bounded-concurrency replacement for ``asyncio.gather``
+        
+        Takes the same arguments as ``as_completed`` and returns BatchResults in
+        input order. Non-fatal failures are captured per item; fatal errors
+        cancel the remaining calls and are raised.
+        """
+        run = self.as_completed(
+            calls,
+            concurrency=concurrency,
+            timeout=timeout,
+            fatal_errors=fatal_errors,
+            on_progress=on_progress
+        )
+        items = [item async for item in run]
+        items.sort(key=lambda item: item.index)
+        return BatchResults(items, run.stats)
                 
     async def _handle_response_errors(self, response: aiohttp.ClientResponse):
         """Handle async response errors"""
@@ -334,9 +928,9 @@ class AsyncSVECTOR:
         elif response.status == 422:
             raise UnprocessableEntityError("Validation error", response.status)
         elif response.status == 429:
-            raise RateLimitError("Rate limit exceeded", response.status)
+            raise RateLimitError("Rate limit exceeded", response.status, headers=response.headers)
         elif response.status >= 500:
-            raise APIError("Internal server error", response.status)
+            raise APIError("Internal server error", response.status, headers=response.headers)
         elif response.status >= 400:
             error_msg = "API error"
             try:
@@ -434,10 +1028,58 @@ class ChatAPI:
         )
         # Note: In real implementation, you'd need to modify request method to return raw response
         return response, None  # Placeholder
+    
+    def create_many(
+        self,
+        requests: Iterable[Dict[str, Any]],
+        concurrency: Union[int, AdaptiveConcurrencyLimiter] = 4,
+        as_completed: bool = False,
+        on_progress: Optional[Callable[[BatchItemResult, BatchStats], None]] = None
+    ):
+        """
+        Create many chat completions concurrently
+        
+        Each item is a dict of keyword arguments for ``create``. Failures are
+        captured per item instead of aborting the batch, and every call uses the
+        client's normal retry policy.
+        
+        Args:
+            requests: Iterable of ``create`` keyword argument dicts
+            concurrency: Maximum number of requests in flight, or an
+                AdaptiveConcurrencyLimiter to size the window dynamically
+            as_completed: Yield results as they finish instead of in input order
+            on_progress: Callback invoked with (item, stats) after each completion
+            
+        Returns:
+            BatchResults in input order (with ``.stats``), or a BatchRun iterator
+            in completion order when ``as_completed`` is True
+            
+        Example:
+            results = client.chat.create_many(
+                [{"model": "spec-3-turbo", "messages": [{"role": "user", "content": q}]}
+                 for q in questions],
+                concurrency=8
+            )
+            print(results.stats.throughput)
+        """
+        return run_many(
+            self.client, self.create, requests,
+            concurrency=concurrency, as_completed=as_completed, on_progress=on_progress
+        )
             
     def _stream_response(self, response: requests.Response) -> Iterator[Dict]:
         """Parse streaming response"""
-        for line in response.iter_lines():
+        timing = getattr(response, "_svector_timing", None)
+        if timing is not None:
+            return self.client.hooks.observe_stream(self._parse_stream(response), timing)
+        return self._parse_stream(response)
+        
+    def _parse_stream(self, response: requests.Response) -> Iterator[Dict]:
+        profiler = self.client.profiler
+        lines = response.iter_lines()
+        if profiler is not None:
+            lines = profiler.iterate("stream_read", lines)
+        for line in lines:
             if line:
                 line = line.decode('utf-8')
                 if line.startswith('data: '):
@@ -445,9 +1087,11 @@ class ChatAPI:
                     if data.strip() == '[DONE]':
                         break
                     try:
-                        yield json.loads(data)
+                        with profile_phase(profiler, "decode"):
+                            event = json.loads(data)
                     except json.JSONDecodeError:
                         continue
+                    yield event
 
 
 class AsyncChatAPI:
@@ -482,6 +1126,19 @@ class AsyncChatAPI:
             
         return await self.client.request("POST", "/api/chat/completions", data=data)
         
+    async def create_many(
+        self,
+        requests: Iterable[Dict[str, Any]],
+        concurrency: Union[int, AdaptiveConcurrencyLimiter] = 16,
+        timeout: Optional[float] = None,
+        on_progress: Optional[Callable[[BatchItemResult, BatchStats], None]] = None
+    ) -> BatchResults:
+        """Async chat completions for many requests with bounded concurrency"""
+        return await self.client.gather(
+            bind_requests(self.create, requests),
+            concurrency=concurrency, timeout=timeout, on_progress=on_progress
+        )
+        
     async def create_stream(
         self,
         model: str,
@@ -0,0 +1,147 @@
+"""
+SVECTOR Request Compression
+
+Opt-in Content-Encoding for large JSON request bodies (long context lists,
+base64 images) and the Accept-Encoding value matching the response decoders
+requests and aiohttp actually have. zstd and brotli use the same optional
+packages as urllib3 and aiohttp (``pip install svector-sdk[compression]``).
+"""
+
+import gzip
+import json
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    from compression import zstd  # Python 3.14+
+except ImportError:
+    try:
+        from backports import zstd  # optional dependency
+    except ImportError:
+        zstd = None
+
+from urllib3.util.request import ACCEPT_ENCODING as URLLIB3_ACCEPT_ENCODING
+
+try:
+    from aiohttp import compression_utils as aiohttp_compression
+except ImportError:  # aiohttp < 3.9 does not report its decoders
+    aiohttp_compression = None
+
+ALGORITHMS = ("gzip", "zstd")
+
+DEFAULT_LEVELS = {"gzip": 6, "zstd": 3}
+
+
+def accept_encoding() -> str:
+    """
+    Response encodings both transports can decode
+
+    The sync client's requests may go through urllib3 or, with the background
+    engine, aiohttp, so only encodings both have decoders for are offered
+    (urllib3 < 2 and older aiohttp cannot decode zstd, for example).
+    """
+    urllib3_encodings = {encoding.strip() for encoding in URLLIB3_ACCEPT_ENCODING.split(",")}
+    aiohttp_encodings = {
+        encoding for encoding, flag in (("br", "HAS_BROTLI"), ("zstd", "HAS_ZSTD"))
+        if getattr(aiohttp_compression, flag, False)
+    }
+    encodings = ["gzip", "deflate"]
+    encodings.extend(encoding for encoding in ("br", "zstd") if encoding in urllib3_encodings & aiohttp_encodings)
+    return ", ".join(encodings)
+
+
+class RequestCompression:
+    """
+    Compress JSON request bodies above a size threshold
+
+    Pass ``compression=True`` (gzip), ``"zstd"`` or an instance to ``SVECTOR``
+    or ``AsyncSVECTOR``. Bodies below ``threshold`` bytes, multipart uploads
+    and bodies that would not shrink are sent as before. The client also sends
+    an explicit ``Accept-Encoding`` listing zstd and brotli when both requests
+    and aiohttp can decode them. The API must accept ``Content-Encoding`` on requests.
+
+    Args:
+        algorithm: "gzip" or "zstd" (Python 3.14, or ``backports.zstd``)
+        threshold: Smallest body in bytes worth compressing
+        level: Compression level (default: 6 for gzip, 3 for zstd)
+
+    Example:
+        client = SVECTOR(compression=RequestCompression("zstd", threshold=16 * 1024))
+        ...
+        print(client.compression.stats())
+    """
+
+    def __init__(self, algorithm: str = "gzip", threshold: int = 32 * 1024, level: Optional[int] = None):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"algorithm must be one of {', '.join(ALGORITHMS)}, not {algorithm!r}")
+        if algorithm == "zstd" and zstd is None:
+            raise ImportError(
+                "zstd compression requires Python 3.14 or the backports.zstd package. "
+                "Install it with: pip install svector-sdk[compression]"
+            )
+        self.algorithm = algorithm
+        self.threshold = threshold
+        self.level = DEFAULT_LEVELS[algorithm] if level is None else level
+        self.compressed = 0
+        self.skipped = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self._lock = threading.Lock()
+
+    def encode(self, data: Any) -> Tuple[bytes, Dict[str, str], int]:
+        """
+        Serialize ``data`` as JSON, compressing it if worthwhile
+
+        Returns:
+            (body, headers to add, uncompressed size)
+        """
+        body = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        size = len(body)
+        if size >= self.threshold:
+            compressed = self._compress(body)
+            if len(compressed) < size:
+                with self._lock:
+                    self.compressed += 1
+                    self.bytes_in += size
+                    self.bytes_out += len(compressed)
+                headers["Content-Encoding"] = self.algorithm
+                return compressed, headers, size
+        with self._lock:
+            self.skipped += 1
+        return body, headers, size
+
+    def _compress(self, body: bytes) -> bytes:
+        if self.algorithm == "zstd":
+            return zstd.compress(body, self.level)
+        return gzip.compress(body, compresslevel=self.level, mtime=0)
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_in - self.bytes_out
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "algorithm": self.algorithm,
+                "compressed": self.compressed,
+                "skipped": self.skipped,
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "bytes_saved": self.bytes_in - self.bytes_out,
+                "ratio": self.bytes_out / self.bytes_in if self.bytes_in else None,
+            }
+
+    def __repr__(self):
+        return f"RequestCompression({self.algorithm!r}, threshold={self.threshold}, level={self.level})"
+
+
+def resolve_compression(compression: Any) -> Optional[RequestCompression]:
+    """Normalize a client's ``compression`` argument"""
+    if compression is None or compression is False:
+        return None
+    if isinstance(compression, RequestCompression):
+        return compression
+    if compression is True:
+        return RequestCompression()
+    return RequestCompression(compression)
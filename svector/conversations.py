@@ -6,7 +6,13 @@ Handles system role conversion internally for a clean user experience.
 """
 
 import json
-from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Union
+from typing import (Any, AsyncIterator, Callable, Dict, Iterable, Iterator,
+                    List, Optional, Union)
+
+from .batch import (BatchItemResult, BatchResults, BatchStats, bind_requests,
+                    run_many)
+from .limits import AdaptiveConcurrencyLimiter
+from .profiling import profile_call
 
 
 class ConversationRequest:
@@ -103,7 +109,7 @@ class ConversationsAPI:
             print(response.output)
         """
         # Convert interface to internal chat format
-        messages = self._build_messages(instructions, input, context)
+        messages = profile_call(self.client.profiler, "build_messages", self._build_messages, instructions, input, context)
         
         # Prepare chat request
         chat_data = {
@@ -126,7 +132,7 @@ class ConversationsAPI:
         if response.get("choices") and len(response["choices"]) > 0:
             output = response["choices"][0]["message"]["content"]
             
-        return ConversationResponse({
+        return profile_call(self.client.profiler, "wrap_response", ConversationResponse, {
             "output": output,
             "usage": response.get("usage", {}),
             "_request_id": response.get("_request_id")
@@ -172,7 +178,7 @@ class ConversationsAPI:
                     print(event.content, end="", flush=True)
         """
         # Convert to internal format
-        messages = self._build_messages(instructions, input, context)
+        messages = profile_call(self.client.profiler, "build_messages", self._build_messages, instructions, input, context)
         
         chat_data = {
             "model": model,
@@ -204,7 +210,7 @@ class ConversationsAPI:
                 if finish_reason:
                     done = True
                     
-            yield ConversationStreamEvent({
+            yield profile_call(self.client.profiler, "wrap_response", ConversationStreamEvent, {
                 "content": content,
                 "done": done
             })
@@ -222,7 +228,7 @@ class ConversationsAPI:
         Returns:
             Tuple of (ConversationResponse, raw_response)
         """
-        messages = self._build_messages(instructions, input, kwargs.get("context", []))
+        messages = profile_call(self.client.profiler, "build_messages", self._build_messages, instructions, input, kwargs.get("context", []))
         
         chat_data = {
             "model": model,
@@ -244,6 +250,42 @@ class ConversationsAPI:
         
         return conversation_response, raw
     
+    def create_many(
+        self,
+        requests: Iterable[Dict[str, Any]],
+        concurrency: Union[int, AdaptiveConcurrencyLimiter] = 4,
+        as_completed: bool = False,
+        on_progress: Optional[Callable[[BatchItemResult, BatchStats], None]] = None
+    ):
+        """
+        Create many conversations concurrently.
+        
+        Args:
+            requests: Iterable of ``create`` keyword argument dicts
+            concurrency: Maximum number of requests in flight, or an
+                AdaptiveConcurrencyLimiter to size the window dynamically
+            as_completed: Yield results as they finish instead of in input order
+            on_progress: Callback invoked with (item, stats) after each completion
+            
+        Returns:
+            BatchResults in input order (with ``.stats``), or a BatchRun iterator
+            in completion order when ``as_completed`` is True. Each item holds
+            either a ConversationResponse in ``result`` or the raised ``error``.
+            
+        Example:
+            results = client.conversations.create_many(
+                [{"model": "spec-3-turbo", "input": q} for q in questions],
+                concurrency=8,
+                on_progress=lambda item, stats: print(stats.completed)
+            )
+            for item in results:
+                print(item.result.output if item.ok else item.error)
+        """
+        return run_many(
+            self.client, self.create, requests,
+            concurrency=concurrency, as_completed=as_completed, on_progress=on_progress
+        )
+    
     def _build_messages(
         self, 
         instructions: Optional[str], 
@@ -300,7 +342,7 @@ class AsyncConversationsAPI:
         **kwargs
     ) -> ConversationResponse:
         """Async version of create"""
-        messages = self._build_messages(instructions, input, context)
+        messages = profile_call(self.client.profiler, "build_messages", self._build_messages, instructions, input, context)
         
         chat_data = {
             "model": model,
@@ -318,12 +360,25 @@ class AsyncConversationsAPI:
         if response.get("choices") and len(response["choices"]) > 0:
             output = response["choices"][0]["message"]["content"]
             
-        return ConversationResponse({
+        return profile_call(self.client.profiler, "wrap_response", ConversationResponse, {
             "output": output,
             "usage": response.get("usage", {}),
             "_request_id": response.get("_request_id")
         })
     
+    async def create_many(
+        self,
+        requests: Iterable[Dict[str, Any]],
+        concurrency: Union[int, AdaptiveConcurrencyLimiter] = 16,
+        timeout: Optional[float] = None,
+        on_progress: Optional[Callable[[BatchItemResult, BatchStats], None]] = None
+    ) -> BatchResults:
+        """Async version of create_many; see ``AsyncSVECTOR.gather``"""
+        return await self.client.gather(
+            bind_requests(self.create, requests),
+            concurrency=concurrency, timeout=timeout, on_progress=on_progress
+        )
+    
     async def create_stream(
         self,
         model: str,
@@ -336,7 +391,7 @@ class AsyncConversationsAPI:
         **kwargs
     ) -> AsyncIterator[ConversationStreamEvent]:
         """Async version of create_stream"""
-        messages = self._build_messages(instructions, input, context)
+        messages = profile_call(self.client.profiler, "build_messages", self._build_messages, instructions, input, context)
         
         chat_data = {
             "model": model,
@@ -366,7 +421,7 @@ class AsyncConversationsAPI:
                 if finish_reason:
                     done = True
                     
-            yield ConversationStreamEvent({
+            yield profile_call(self.client.profiler, "wrap_response", ConversationStreamEvent, {
                 "content": content,
                 "done": done
             })
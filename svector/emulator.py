@@ -0,0 +1,343 @@
+"""
+SVECTOR Emulator
+
+A local stand-in for the SVECTOR API (chat completions with SSE streaming,
+models and files) with configurable latency, token pacing and fault injection,
+for exercising and benchmarking the SDK without the real backend. Run it with
+``svector emulate``.
+"""
+
+import asyncio
+import itertools
+import json
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from aiohttp import web
+
+MODELS = ["spec-3-turbo", "spec-3", "theta-35", "theta-35-mini"]
+
+_WORDS = ("the", "model", "emulates", "a", "steady", "stream", "of", "tokens", "for", "testing")
+
+SERVER_ERROR_STATUSES = (500, 502, 503)
+
+
+class Faults:
+    """
+    Fault injection rates (probability per request, 0-1) and their parameters
+
+    At most one of ``rate_limit``, ``server_error``, ``gateway_timeout`` and
+    ``reset`` hits a request. ``slow_first_token`` and ``stall`` apply to
+    requests that got none of those; stalls only affect streams.
+
+    Args:
+        rate_limit: 429 responses carrying ``Retry-After: retry_after``
+        server_error: 500/502/503 responses
+        gateway_timeout: 504 responses after ``gateway_delay`` seconds
+        reset: Connections closed without a response (streams: after some tokens)
+        slow_first_token: Extra ``slow_first_token_delay`` seconds before the first token
+        stall: A ``stall_delay`` second pause at a random point of a stream
+        seed: Seed for reproducible fault sequences
+    """
+
+    def __init__(
+        self,
+        rate_limit: float = 0.0,
+        retry_after: float = 1.0,
+        server_error: float = 0.0,
+        gateway_timeout: float = 0.0,
+        gateway_delay: float = 0.0,
+        reset: float = 0.0,
+        slow_first_token: float = 0.0,
+        slow_first_token_delay: float = 5.0,
+        stall: float = 0.0,
+        stall_delay: float = 10.0,
+        seed: Optional[int] = None
+    ):
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.server_error = server_error
+        self.gateway_timeout = gateway_timeout
+        self.gateway_delay = gateway_delay
+        self.reset = reset
+        self.slow_first_token = slow_first_token
+        self.slow_first_token_delay = slow_first_token_delay
+        self.stall = stall
+        self.stall_delay = stall_delay
+        self.random = random.Random(seed)
+
+    def draw(self) -> Optional[str]:
+        """Pick the request-level fault for one request, if any"""
+        roll = self.random.random()
+        for fault in ("rate_limit", "server_error", "gateway_timeout", "reset"):
+            rate = getattr(self, fault)
+            if roll < rate:
+                return fault
+            roll -= rate
+        return None
+
+    def hit(self, rate: float) -> bool:
+        return rate > 0 and self.random.random() < rate
+
+
+class Emulator:
+    """
+    Local HTTP server speaking the SVECTOR chat, models and files protocols
+
+    Every completion generates ``tokens`` tokens (capped by the request's
+    ``max_tokens``). Streams send the first token after ``latency`` and the
+    rest every ``token_interval`` seconds; non-streaming responses arrive once
+    all tokens would have been generated.
+
+    Args:
+        latency: Seconds before the first token
+        token_interval: Seconds between tokens
+        tokens: Tokens per completion
+        host: Interface to bind
+        port: Port to bind; 0 picks a free one
+        faults: Fault injection settings applied to every endpoint
+
+    Example:
+        with Emulator(latency=0.05, token_interval=0.01) as emulator:
+            client = SVECTOR(api_key="test", base_url=emulator.base_url)
+            client.chat.create(model="spec-3-turbo", messages=[{"role": "user", "content": "Hi"}])
+
+        # 5% rate limited, 2% server errors, 1% dropped connections
+        Emulator(faults=Faults(rate_limit=0.05, server_error=0.02, reset=0.01, seed=7))
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        token_interval: float = 0.0,
+        tokens: int = 16,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        faults: Optional[Faults] = None
+    ):
+        self.latency = latency
+        self.token_interval = token_interval
+        self.tokens = tokens
+        self.host = host
+        self.port = port
+        self.faults = faults
+        self.stats: Dict[str, int] = {"requests": 0, "streams": 0, "uploads": 0}
+        self._ids = itertools.count(1)
+        self._runner: Optional[web.AppRunner] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def app(self) -> web.Application:
+        """The aiohttp application, e.g. for mounting in an existing server"""
+        middlewares = [self._inject_faults] if self.faults is not None else []
+        app = web.Application(client_max_size=1024 ** 3, middlewares=middlewares)
+        app.router.add_post("/api/chat/completions", self._chat)
+        app.router.add_get("/api/models", self._models)
+        app.router.add_post("/api/v1/files/", self._files)
+        return app
+
+    # Lifecycle
+
+    async def start_async(self) -> str:
+        """Start serving on the running event loop; returns the base URL"""
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        # Resolve the port picked by the OS
+        self.port = self._runner.addresses[0][1]
+        return self.base_url
+
+    async def stop_async(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def start(self) -> str:
+        """Serve from a background thread; returns the base URL"""
+        self._loop = asyncio.new_event_loop()
+        self._loop.run_until_complete(self.start_async())
+        self._thread = threading.Thread(target=self._loop.run_forever, name="svector-emulator", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        """Stop a server started with ``start``"""
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.stop_async(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+    def serve_forever(self, ready: Optional[Callable[[str], Any]] = None):
+        """Serve in the current thread until interrupted, calling ``ready(base_url)`` once listening"""
+
+        async def serve():
+            base_url = await self.start_async()
+            if ready is not None:
+                ready(base_url)
+            try:
+                await asyncio.Event().wait()
+            finally:
+                await self.stop_async()
+
+        try:
+            asyncio.run(serve())
+        except KeyboardInterrupt:
+            pass
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    # Faults
+
+    def _count(self, fault: str):
+        self.stats[fault] = self.stats.get(fault, 0) + 1
+
+    @web.middleware
+    async def _inject_faults(self, request: web.Request, handler) -> web.StreamResponse:
+        faults = self.faults
+        fault = faults.draw()
+        if fault is not None:
+            self._count(fault)
+        if fault == "rate_limit":
+            return _error(429, "rate_limit_exceeded", "Rate limit exceeded", {"Retry-After": f"{faults.retry_after:g}"})
+        if fault == "server_error":
+            status = faults.random.choice(SERVER_ERROR_STATUSES)
+            return _error(status, "server_error", "The server had an error processing your request")
+        if fault == "gateway_timeout":
+            await _sleep(faults.gateway_delay)
+            return _error(504, "gateway_timeout", "Gateway timeout")
+        if fault == "reset" and not request.path.endswith("/completions"):
+            return _reset(request)
+        request["svector_fault"] = fault
+        return await handler(request)
+
+    def _first_token_delay(self) -> float:
+        if self.faults is not None and self.faults.hit(self.faults.slow_first_token):
+            self._count("slow_first_token")
+            return self.latency + self.faults.slow_first_token_delay
+        return self.latency
+
+    # Handlers
+
+    async def _chat(self, request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        self.stats["requests"] += 1
+        model = body.get("model") or MODELS[0]
+        tokens = min(self.tokens, body.get("max_tokens") or self.tokens)
+        completion_id = f"chatcmpl-{next(self._ids)}"
+        words = [_WORDS[i % len(_WORDS)] + " " for i in range(tokens)]
+
+        if body.get("stream"):
+            self.stats["streams"] += 1
+            return await self._stream(request, completion_id, model, words)
+
+        if request.get("svector_fault") == "reset":
+            return _reset(request)
+        await _sleep(self._first_token_delay() + self.token_interval * max(tokens - 1, 0))
+        return web.json_response({
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "".join(words)},
+                "finish_reason": "stop",
+            }],
+            "usage": _usage(body, tokens),
+        })
+
+    async def _stream(self, request: web.Request, completion_id: str, model: str, words: List[str]):
+        faults = self.faults
+        # Token index at which the stream stalls or the connection drops
+        reset_at = stall_at = -1
+        if request.get("svector_fault") == "reset":
+            reset_at = faults.random.randrange(len(words) + 1)
+        elif faults is not None and words and faults.hit(faults.stall):
+            self._count("stall")
+            stall_at = faults.random.randrange(1, len(words)) if len(words) > 1 else 0
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+        await response.prepare(request)
+        await _sleep(self._first_token_delay())
+        for index, word in enumerate(words):
+            if index == reset_at:
+                return _reset(request, response)
+            if index == stall_at:
+                await _sleep(faults.stall_delay)
+            if index:
+                await _sleep(self.token_interval)
+            await response.write(_event(completion_id, model, {"content": word}))
+        if reset_at == len(words):
+            return _reset(request, response)
+        await response.write(_event(completion_id, model, {}, finish_reason="stop"))
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    async def _models(self, request: web.Request) -> web.Response:
+        return web.json_response({"models": MODELS})
+
+    async def _files(self, request: web.Request) -> web.Response:
+        self.stats["uploads"] += 1
+        form = await request.post()
+        upload = form.get("file")
+        size = len(upload.file.read()) if isinstance(upload, web.FileField) else 0
+        return web.json_response({
+            "file_id": f"file-{next(self._ids)}",
+            "filename": getattr(upload, "filename", None),
+            "bytes": size,
+            "purpose": form.get("purpose", "default"),
+        })
+
+
+def _error(status: int, code: str, message: str, headers: Optional[Dict[str, str]] = None) -> web.Response:
+    return web.json_response(
+        {"error": {"message": message, "type": code, "code": status}}, status=status, headers=headers
+    )
+
+
+def _reset(request: web.Request, response: Optional[web.StreamResponse] = None) -> web.StreamResponse:
+    """Drop the connection without a (complete) response"""
+    if request.transport is not None:
+        request.transport.abort()
+    return response if response is not None else web.Response()
+
+
+async def _sleep(seconds: float):
+    if seconds > 0:
+        await asyncio.sleep(seconds)
+
+
+def _event(completion_id: str, model: str, delta: Dict[str, str], finish_reason: Optional[str] = None) -> bytes:
+    chunk = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    return b"data: " + json.dumps(chunk).encode() + b"\n\n"
+
+
+def _usage(body: Dict[str, Any], completion_tokens: int) -> Dict[str, int]:
+    # Rough prompt size: four characters per token
+    prompt_tokens = len(json.dumps(body.get("messages", []))) // 4
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
@@ -0,0 +1,320 @@
+"""
+SVECTOR Background Engine
+
+Runs HTTP requests for synchronous clients on a single background asyncio event loop
+with a shared aiohttp connector, so many concurrent blocking calls do not each need
+their own socket pool.
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import json
+import os
+import threading
+from typing import Any, Awaitable, Dict, Iterator, Optional
+
+import aiohttp
+import requests
+
+from .hooks import timing_trace_config
+
+
+class EngineResponse:
+    """
+    Minimal ``requests.Response`` look-alike returned by the background engine
+
+    Exposes the attributes the SDK relies on (``status_code``, ``ok``, ``headers``,
+    ``text``, ``json()`` and ``iter_lines()``) so existing error handling and
+    stream parsing work unchanged.
+    """
+
+    def __init__(
+        self,
+        engine: "BackgroundEngine",
+        status_code: int,
+        headers: Dict[str, str],
+        body: Optional[bytes] = None,
+        raw: Optional[aiohttp.ClientResponse] = None
+    ):
+        self._engine = engine
+        self.status_code = status_code
+        self.headers = requests.structures.CaseInsensitiveDict(headers)
+        self._body = body
+        self._raw = raw
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def content(self) -> bytes:
+        if self._body is None:
+            self._body = self._engine.run(self._read_all())
+        return self._body
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def iter_lines(self) -> Iterator[bytes]:
+        """Yield response lines as they arrive, without the trailing newline"""
+        if self._raw is None:
+            yield from self.content.splitlines()
+            return
+
+        pending = b""
+        try:
+            while True:
+                chunk = self._engine.run(self._read_chunk())
+                if not chunk:
+                    break
+                pending += chunk
+                lines = pending.split(b"\n")
+                pending = lines.pop()
+                for line in lines:
+                    yield line.rstrip(b"\r")
+            if pending:
+                yield pending.rstrip(b"\r")
+        finally:
+            self.close()
+
+    def close(self):
+        """Release the underlying connection back to the shared pool"""
+        if self._raw is not None:
+            raw, self._raw = self._raw, None
+            self._engine.call_soon(raw.release)
+
+    async def _read_all(self) -> bytes:
+        try:
+            return await _translate_errors(self._raw.read())
+        finally:
+            self._raw.release()
+            self._raw = None
+
+    async def _read_chunk(self) -> bytes:
+        return await _translate_errors(self._raw.content.readany())
+
+
+async def _translate_errors(awaitable: Awaitable) -> Any:
+    """Map aiohttp failures onto the ``requests`` exceptions the retry logic expects"""
+    try:
+        return await awaitable
+    except asyncio.TimeoutError as e:
+        raise requests.exceptions.Timeout(str(e) or "Request timed out")
+    except aiohttp.ClientError as e:
+        raise requests.exceptions.ConnectionError(str(e))
+
+
+class BackgroundEngine:
+    """
+    Background asyncio event loop shared by synchronous SVECTOR clients
+
+    All requests are executed on one daemon thread using a single aiohttp
+    connection pool. Blocking callers wait on a future instead of holding a
+    socket themselves, and ``submit()`` lets callers fan out many requests
+    without creating a thread per request.
+
+    Example:
+        client = SVECTOR(api_key="your-api-key", async_engine=True)
+        futures = [
+            client.submit(client.conversations.create, model="spec-3-turbo", input=q)
+            for q in questions
+        ]
+        answers = [f.result().output for f in futures]
+    """
+
+    def __init__(self, max_connections: int = 100, max_connections_per_host: int = 0):
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The engine's event loop, started on first use"""
+        self._ensure_started()
+        return self._loop
+
+    def _check_fork(self):
+        # A forked child has no loop thread, may inherit _lock held by another
+        # thread, and must not touch the parent's session or its sockets
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._lock = threading.Lock()
+            self._thread = None
+
+    def _ensure_started(self):
+        self._check_fork()
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            if self._session is not None:
+                # Bound to the previous loop; detached so it is not closed from this one
+                self._session.detach()
+                self._session = None
+            self._loop = asyncio.new_event_loop()
+            started = threading.Event()
+            self._thread = threading.Thread(
+                target=self._run_loop, args=(started,), name="svector-engine", daemon=True
+            )
+            self._thread.start()
+            started.wait()
+
+    def _run_loop(self, started: threading.Event):
+        asyncio.set_event_loop(self._loop)
+        self._loop.call_soon(started.set)
+        self._loop.run_forever()
+
+    def in_engine_thread(self) -> bool:
+        """Whether the caller is running on the engine's own loop thread"""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Awaitable) -> concurrent.futures.Future:
+        """Schedule a coroutine on the engine loop and return a concurrent future"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Awaitable, timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the engine loop and block until it finishes"""
+        if self.in_engine_thread():
+            raise RuntimeError("Blocking engine calls cannot be made from the engine thread")
+        return self.submit(coro).result(timeout)
+
+    def call_soon(self, callback, *args):
+        """Schedule a plain callback on the engine loop"""
+        self.loop.call_soon_threadsafe(callback, *args)
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Shared aiohttp session; must only be used from the engine loop"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector, trace_configs=[timing_trace_config()]
+            )
+        return self._session
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        json: Optional[Any] = None,
+        data: Optional[Dict] = None,
+        files: Optional[Dict] = None,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+        verify: bool = True,
+        trace: Optional[Any] = None,
+        params: Optional[Dict[str, Any]] = None,
+        allow_redirects: bool = True
+    ) -> EngineResponse:
+        """
+        Perform a blocking HTTP request on the engine loop
+
+        Accepts the same arguments the SDK passes to ``requests`` and raises
+        ``requests`` exceptions on timeout or connection failure. ``trace`` is
+        passed to aiohttp as ``trace_request_ctx`` (see ``hooks.RequestTiming``).
+        """
+        return self.run(self._request(
+            method, url, headers, json, data, files, timeout, stream, verify, trace, params, allow_redirects
+        ))
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]],
+        json_data: Optional[Any],
+        data: Optional[Dict],
+        files: Optional[Dict],
+        timeout: Optional[float],
+        stream: bool,
+        verify: bool,
+        trace: Optional[Any] = None,
+        params: Optional[Dict[str, Any]] = None,
+        allow_redirects: bool = True
+    ) -> EngineResponse:
+        kwargs: Dict[str, Any] = {"allow_redirects": allow_redirects}
+        if params is not None:
+            kwargs["params"] = params
+        if files:
+            kwargs["data"] = _build_form(data, files)
+        elif json_data is not None:
+            kwargs["json"] = json_data
+        elif data is not None:
+            kwargs["data"] = data
+
+        # Mirror requests' semantics: the timeout bounds connecting and each read
+        client_timeout = aiohttp.ClientTimeout(
+            total=None, sock_connect=timeout, sock_read=timeout
+        )
+
+        response = await _translate_errors(self.session.request(
+            method,
+            url,
+            headers=headers,
+            timeout=client_timeout,
+            ssl=None if verify else False,
+            trace_request_ctx=trace,
+            **kwargs
+        ))
+
+        if stream:
+            return EngineResponse(self, response.status, dict(response.headers), raw=response)
+
+        try:
+            body = await _translate_errors(response.read())
+        finally:
+            response.release()
+        return EngineResponse(self, response.status, dict(response.headers), body=body)
+
+    def close(self):
+        """Close the shared session and stop the loop thread"""
+        self._check_fork()
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                return
+            if self._session is not None and not self.in_engine_thread():
+                asyncio.run_coroutine_threadsafe(self._session.close(), self._loop).result()
+            self._session = None
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._thread = None
+
+
+def _build_form(data: Optional[Dict], files: Dict) -> aiohttp.FormData:
+    """Convert requests-style ``data``/``files`` arguments into multipart form data"""
+    form = aiohttp.FormData()
+    for key, value in (data or {}).items():
+        form.add_field(key, str(value))
+    for field, spec in files.items():
+        filename, content, content_type = spec
+        if hasattr(content, "read"):
+            content = content.read()
+        form.add_field(field, content, filename=filename, content_type=content_type)
+    return form
+
+
+_default_engine: Optional[BackgroundEngine] = None
+_default_engine_lock = threading.Lock()
+
+
+def get_default_engine() -> BackgroundEngine:
+    """Return the process-wide engine shared by clients created with ``async_engine=True``"""
+    global _default_engine
+    with _default_engine_lock:
+        if _default_engine is None:
+            _default_engine = BackgroundEngine()
+            atexit.register(_default_engine.close)
+        return _default_engine
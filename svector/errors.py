@@ -82,3 +82,13 @@ class ConnectionError(SVECTORError):
 class TimeoutError(SVECTORError):
     """Timeout error"""
     pass
+
+
+class QueueTimeoutError(TimeoutError):
+    """A request's deadline passed while it waited in the local scheduler queue (it was never sent)"""
+    pass
+
+
+class CassetteMissError(SVECTORError):
+    """Replay found no recorded response for a request"""
+    pass
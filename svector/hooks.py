@@ -0,0 +1,313 @@
+"""
+SVECTOR Request Hooks
+
+Lifecycle callbacks for observing requests made by the SDK. Every callback
+receives a RequestTiming describing the attempt in progress.
+"""
+
+import time
+import warnings
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+import aiohttp
+
+EVENTS = (
+    "before_request",
+    "after_response",
+    "on_retry",
+    "on_stream_first_chunk",
+    "on_stream_end",
+    "on_error",
+)
+
+
+class RequestTiming:
+    """
+    Timing and size record for one HTTP attempt
+
+    Durations are in seconds, measured from ``started`` (just before the
+    attempt waits for scheduler/limiter slots). ``dns``, ``connect`` and
+    ``tls`` are only available for requests made through aiohttp (the async
+    client or ``async_engine=True``); aiohttp reports TLS as part of
+    ``connect``, so ``tls`` stays None there.
+    """
+
+    def __init__(self, method: str, url: str, attempt: int = 0, model: Optional[str] = None):
+        self.method = method
+        self.url = url
+        self.attempt = attempt
+        self.model = model
+        self.started = time.perf_counter()
+        self.timestamp = time.time()
+
+        self.queue_time: Optional[float] = None
+        self.dns: Optional[float] = None
+        self.connect: Optional[float] = None
+        self.tls: Optional[float] = None
+        self.connection_reused: Optional[bool] = None
+        self.ttfb: Optional[float] = None
+        self.ttft: Optional[float] = None
+        self.total: Optional[float] = None
+
+        self.status_code: Optional[int] = None
+        self.request_bytes: Optional[int] = None
+        # Body size before Content-Encoding, when the request was compressed
+        self.uncompressed_bytes: Optional[int] = None
+        self.response_bytes: Optional[int] = None
+        self.output_tokens: Optional[int] = None
+        self.stream_chunks = 0
+        self.error: Optional[BaseException] = None
+        # Set by tracing integrations
+        self.span: Any = None
+
+        self._sent: Optional[float] = None
+        self._dns_started: Optional[float] = None
+        self._connect_started: Optional[float] = None
+        self._request_sent: Optional[float] = None
+
+    @property
+    def retries(self) -> int:
+        """Number of earlier attempts for the same request"""
+        return self.attempt
+
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        """Output tokens per second of generation (after the first token when streaming)"""
+        if not self.output_tokens or self.total is None:
+            return None
+        start = self.ttft if self.ttft is not None else (self.queue_time or 0.0)
+        duration = self.total - start
+        return self.output_tokens / duration if duration > 0 else None
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def mark_sent(self):
+        """Called once the attempt holds its slots and is about to hit the network"""
+        self._sent = time.perf_counter()
+        self.queue_time = self._sent - self.started
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "method": self.method,
+            "url": self.url,
+            "model": self.model,
+            "attempt": self.attempt,
+            "timestamp": self.timestamp,
+            "queue_time": self.queue_time,
+            "dns": self.dns,
+            "connect": self.connect,
+            "tls": self.tls,
+            "connection_reused": self.connection_reused,
+            "ttfb": self.ttfb,
+            "ttft": self.ttft,
+            "total": self.total,
+            "status_code": self.status_code,
+            "request_bytes": self.request_bytes,
+            "uncompressed_bytes": self.uncompressed_bytes,
+            "response_bytes": self.response_bytes,
+            "output_tokens": self.output_tokens,
+            "tokens_per_second": self.tokens_per_second,
+            "error": repr(self.error) if self.error is not None else None,
+        }
+
+    def __repr__(self):
+        total = f"{self.total:.3f}s" if self.total is not None else "pending"
+        return f"RequestTiming({self.method} {self.url} attempt={self.attempt} status={self.status_code} total={total})"
+
+
+class RequestHooks:
+    """
+    Registry of request lifecycle callbacks
+
+    Events:
+        before_request: an attempt is about to start
+        after_response: a successful response arrived (headers only for streams)
+        on_retry: an attempt failed and the request will be retried
+        on_stream_first_chunk: the first streamed chunk arrived (``ttft`` is set)
+        on_stream_end: a stream finished or was closed
+        on_error: the request failed for good
+
+    With no callbacks registered the client skips all timing work.
+
+    Example:
+        client = SVECTOR(hooks={"after_response": lambda t: print(t.ttfb, t.total)})
+
+        @client.hooks.on("on_retry")
+        def log_retry(timing):
+            print("retrying", timing.url, timing.error)
+    """
+
+    def __init__(self, hooks: Optional[Dict[str, Union[Callable, List[Callable]]]] = None):
+        self._callbacks: Dict[str, List[Callable[[RequestTiming], Any]]] = {}
+        for event, callbacks in (hooks or {}).items():
+            for callback in callbacks if isinstance(callbacks, (list, tuple)) else [callbacks]:
+                self.on(event, callback)
+
+    def on(self, event: str, callback: Optional[Callable[[RequestTiming], Any]] = None):
+        """Register a callback for ``event``; usable as a decorator"""
+        if event not in EVENTS:
+            raise ValueError(f"Unknown hook event {event!r}; expected one of {', '.join(EVENTS)}")
+        if callback is None:
+            return lambda fn: self.on(event, fn)
+        self._callbacks.setdefault(event, []).append(callback)
+        return callback
+
+    def remove(self, event: str, callback: Callable[[RequestTiming], Any]):
+        """Unregister a callback"""
+        callbacks = self._callbacks.get(event, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+        if not callbacks:
+            self._callbacks.pop(event, None)
+
+    def __bool__(self) -> bool:
+        return bool(self._callbacks)
+
+    def emit(self, event: str, timing: RequestTiming):
+        """Invoke the callbacks for ``event``; a failing callback never breaks the request"""
+        for callback in self._callbacks.get(event, ()):
+            try:
+                callback(timing)
+            except Exception as e:
+                warnings.warn(f"svector {event} hook {callback!r} raised {e!r}", RuntimeWarning)
+
+    def start(self, method: str, url: str, attempt: int = 0, data: Any = None) -> Optional[RequestTiming]:
+        """Begin timing an attempt; returns None when no hooks are registered"""
+        if not self._callbacks:
+            return None
+        model = data.get("model") if isinstance(data, dict) else None
+        timing = RequestTiming(method, url, attempt, model)
+        self.emit("before_request", timing)
+        return timing
+
+    def response(self, timing: Optional[RequestTiming], response: Any, result: Any = None, stream: bool = False):
+        """Record a successful response and emit ``after_response``"""
+        if timing is None:
+            return
+        now = time.perf_counter()
+        timing.status_code = getattr(response, "status_code", None) or getattr(response, "status", None)
+        if timing.request_bytes is None:
+            body = getattr(getattr(response, "request", None), "body", None)
+            if body is not None:
+                timing.request_bytes = len(body)
+        if timing.ttfb is None:
+            elapsed = getattr(response, "elapsed", None)
+            if elapsed is not None and timing._sent is not None:
+                timing.ttfb = timing.queue_time + elapsed.total_seconds()
+            else:
+                timing.ttfb = now - timing.started
+        if stream:
+            length = (getattr(response, "headers", None) or {}).get("Content-Length")
+            timing.response_bytes = int(length) if length else None
+        else:
+            timing.total = now - timing.started
+            content = getattr(response, "content", None)
+            if isinstance(content, bytes):
+                timing.response_bytes = len(content)
+            timing.output_tokens = _output_tokens(result)
+        self.emit("after_response", timing)
+
+    def retry(self, timing: Optional[RequestTiming], error: BaseException):
+        """Record a failed attempt that will be retried and emit ``on_retry``"""
+        if timing is None:
+            return
+        timing.error = error
+        timing.total = timing.elapsed()
+        self.emit("on_retry", timing)
+
+    def error(self, timing: Optional[RequestTiming], error: BaseException) -> BaseException:
+        """Record the final failure, emit ``on_error`` and return ``error`` for raising"""
+        if timing is not None:
+            timing.error = error
+            timing.total = timing.elapsed()
+            self.emit("on_error", timing)
+        return error
+
+    def observe_stream(self, events: Iterator[Dict], timing: RequestTiming) -> Iterator[Dict]:
+        """Wrap a parsed event stream to emit first-chunk and end-of-stream events"""
+        tokens = 0
+        try:
+            for event in events:
+                if timing.ttft is None:
+                    timing.ttft = timing.elapsed()
+                    self.emit("on_stream_first_chunk", timing)
+                timing.stream_chunks += 1
+                for choice in event.get("choices") or ():
+                    if (choice.get("delta") or {}).get("content"):
+                        tokens += 1
+                yield event
+        except Exception as e:
+            timing.error = e
+            raise
+        finally:
+            timing.total = timing.elapsed()
+            timing.output_tokens = tokens
+            self.emit("on_stream_end", timing)
+
+
+def _output_tokens(result: Any) -> Optional[int]:
+    usage = result.get("usage") if isinstance(result, dict) else None
+    if not isinstance(usage, dict):
+        return None
+    return usage.get("completion_tokens", usage.get("output_tokens"))
+
+
+def timing_trace_config() -> aiohttp.TraceConfig:
+    """
+    aiohttp tracing that fills in connection-level timings
+
+    Pass the RequestTiming as ``trace_request_ctx`` on the request; requests
+    without one are ignored.
+    """
+    config = aiohttp.TraceConfig()
+
+    def timing_of(context) -> Optional[RequestTiming]:
+        timing = context.trace_request_ctx
+        return timing if isinstance(timing, RequestTiming) else None
+
+    async def on_dns_start(session, context, params):
+        timing = timing_of(context)
+        if timing is not None:
+            timing._dns_started = time.perf_counter()
+
+    async def on_dns_end(session, context, params):
+        timing = timing_of(context)
+        if timing is not None and timing._dns_started is not None:
+            timing.dns = time.perf_counter() - timing._dns_started
+
+    async def on_connect_start(session, context, params):
+        timing = timing_of(context)
+        if timing is not None:
+            timing._connect_started = time.perf_counter()
+            timing.connection_reused = False
+
+    async def on_connect_end(session, context, params):
+        timing = timing_of(context)
+        if timing is not None and timing._connect_started is not None:
+            timing.connect = time.perf_counter() - timing._connect_started
+
+    async def on_reuse(session, context, params):
+        timing = timing_of(context)
+        if timing is not None:
+            timing.connection_reused = True
+
+    async def on_chunk_sent(session, context, params):
+        timing = timing_of(context)
+        if timing is not None:
+            timing.request_bytes = (timing.request_bytes or 0) + len(params.chunk)
+            timing._request_sent = time.perf_counter()
+
+    async def on_headers(session, context, params):
+        timing = timing_of(context)
+        if timing is not None:
+            timing.ttfb = timing.elapsed()
+
+    config.on_dns_resolvehost_start.append(on_dns_start)
+    config.on_dns_resolvehost_end.append(on_dns_end)
+    config.on_connection_create_start.append(on_connect_start)
+    config.on_connection_create_end.append(on_connect_end)
+    config.on_connection_reuseconn.append(on_reuse)
+    config.on_request_chunk_sent.append(on_chunk_sent)
+    config.on_request_end.append(on_headers)
+    return config
@@ -0,0 +1,268 @@
+"""
+SVECTOR Image Preprocessing
+
+Optional client-side downscaling and re-encoding of images before vision
+requests, so uploads are no larger than the resolution the model looks at.
+Requires Pillow (``pip install svector-sdk[images]``).
+"""
+
+import io
+import os
+import threading
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Optional, Tuple, Union
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # optional dependency
+    Image = None
+
+# Resolution the model works at for each detail level
+LOW_DETAIL_SIDE = 512
+HIGH_DETAIL_MAX_SIDE = 2048
+HIGH_DETAIL_SHORT_SIDE = 768
+
+FORMATS = ("auto", "JPEG", "PNG", "WEBP")
+
+MIME_TYPES = {"JPEG": "image/jpeg", "PNG": "image/png", "WEBP": "image/webp"}
+
+LOSSLESS_FORMATS = ("PNG", "GIF", "BMP", "TIFF")
+
+ImageInput = Union[str, Path, bytes, bytearray, memoryview, BinaryIO]
+
+
+def target_size(width: int, height: int, detail: str) -> Tuple[int, int]:
+    """Largest size the model uses for an image at ``detail``; never larger than the image"""
+    if detail == "low":
+        scale = LOW_DETAIL_SIDE / max(width, height)
+    else:
+        scale = min(HIGH_DETAIL_MAX_SIDE / max(width, height), HIGH_DETAIL_SHORT_SIDE / min(width, height))
+    if scale >= 1:
+        return width, height
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+class PreparedImage:
+    """An image ready to send, with what preprocessing changed"""
+
+    def __init__(
+        self,
+        data: Union[bytes, bytearray, memoryview],
+        mime_type: str,
+        detail: str,
+        size: Tuple[int, int],
+        original_size: Tuple[int, int],
+        original_bytes: int
+    ):
+        self.data = data
+        self.mime_type = mime_type
+        self.detail = detail
+        self.size = size
+        self.original_size = original_size
+        self.original_bytes = original_bytes
+
+    @property
+    def bytes(self) -> int:
+        return memoryview(self.data).nbytes
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.original_bytes - self.bytes
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "mime_type": self.mime_type,
+            "detail": self.detail,
+            "width": self.size[0],
+            "height": self.size[1],
+            "original_width": self.original_size[0],
+            "original_height": self.original_size[1],
+            "original_bytes": self.original_bytes,
+            "bytes": self.bytes,
+            "bytes_saved": self.bytes_saved,
+        }
+
+    def __repr__(self):
+        return (
+            f"PreparedImage({self.size[0]}x{self.size[1]} {self.mime_type}, detail={self.detail!r}, "
+            f"{self.original_bytes} -> {self.bytes} bytes)"
+        )
+
+
+class ImagePreprocessor:
+    """
+    Downscale, strip and re-encode images for vision requests
+
+    Pass ``image_preprocessing=True`` (or an instance) to ``SVECTOR`` to apply
+    it to every ``vision.analyze*`` call made with ``image_file`` or
+    ``image_base64``. Images are shrunk to the resolution their ``detail``
+    level is processed at (512px for "low"; within 2048px with the short side
+    at most 768px for "high"), EXIF orientation is applied and metadata
+    dropped, and the result is re-encoded; lossless sources such as
+    screenshots stay PNG. Images are never upscaled, and an image that needs
+    no rotation or stripping keeps its original bytes unless re-encoding
+    makes it smaller.
+
+    Args:
+        format: "auto" (PNG for images with transparency and lossless sources, else JPEG), "JPEG", "PNG" or "WEBP"
+        quality: JPEG/WebP quality (1-95)
+        strip_metadata: Drop EXIF (location, camera) and other metadata, re-encoding images that have any
+        auto_detail: Turn detail="auto" into "low" for images no larger than 512px, else "high"
+
+    Example:
+        client = SVECTOR(image_preprocessing=ImagePreprocessor(quality=80))
+        response = client.vision.analyze(image_file="IMG_0412.HEIC.jpg", prompt="What is this?")
+        print(response.preprocessing["bytes_saved"])
+    """
+
+    def __init__(
+        self,
+        format: str = "auto",
+        quality: int = 85,
+        strip_metadata: bool = True,
+        auto_detail: bool = True
+    ):
+        if Image is None:
+            raise ImportError(
+                "Image preprocessing requires the Pillow package. "
+                "Install it with: pip install svector-sdk[images]"
+            )
+        format = format if format == "auto" else format.upper()
+        if format not in FORMATS:
+            raise ValueError(f"format must be one of {', '.join(FORMATS)}, not {format!r}")
+        self.format = format
+        self.quality = quality
+        self.strip_metadata = strip_metadata
+        self.auto_detail = auto_detail
+        self.images = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self._lock = threading.Lock()
+
+    def prepare(self, image: ImageInput, detail: str = "auto", record: bool = True) -> PreparedImage:
+        """
+        Preprocess one image (path, bytes-like buffer or seekable binary file)
+
+        ``record=False`` leaves it out of ``stats()``, for callers that record
+        it themselves (e.g. from a worker process's result).
+        """
+        original = _read(image)
+        with Image.open(io.BytesIO(original)) as img:
+            original_size = img.size
+            if detail == "auto" and self.auto_detail:
+                detail = "low" if max(img.size) <= LOW_DETAIL_SIDE else "high"
+            size = target_size(*img.size, detail)
+            resized = size != img.size
+            source_format = img.format
+            # The original can only stand in when nothing has to change
+            keep_allowed = source_format in MIME_TYPES and img.getexif().get(_ORIENTATION, 1) == 1 and (
+                not self.strip_metadata or not _has_metadata(img)
+            )
+            if resized:
+                # Also lets JPEG decoding skip straight to a reduced scale
+                img.thumbnail(size, _LANCZOS, reducing_gap=3.0)
+            img = ImageOps.exif_transpose(img)
+            format = self.format
+            if format == "auto":
+                # Lossless sources (screenshots, scans of text) stay lossless
+                format = "PNG" if _has_alpha(img) or source_format in LOSSLESS_FORMATS else "JPEG"
+            size = img.size
+            if not resized and keep_allowed and format == source_format and not self.strip_metadata:
+                data = original
+            else:
+                data = self._encode(img, format)
+                # The model scales the original down itself, so a larger re-encode is never worth sending
+                if keep_allowed and len(data) >= len(original):
+                    data, format, size = original, source_format, original_size
+
+        prepared = PreparedImage(data, MIME_TYPES[format], detail, size, original_size, len(original))
+        if record:
+            self.record(prepared.original_bytes, prepared.bytes)
+        return prepared
+
+    def fingerprint(self, detail: str = "auto") -> str:
+        """The settings that determine what ``prepare`` produces at ``detail`` (for cache keys)"""
+        return f"{self.format}/{self.quality}/{int(self.strip_metadata)}/{int(self.auto_detail)}/{detail}"
+
+    def record(self, bytes_in: int, bytes_out: int):
+        """Count one processed image (used for images prepared in worker processes)"""
+        with self._lock:
+            self.images += 1
+            self.bytes_in += bytes_in
+            self.bytes_out += bytes_out
+
+    def _encode(self, img: Any, format: str) -> bytes:
+        if format == "JPEG" and img.mode != "RGB":
+            img = img.convert("RGB")
+        elif format in ("PNG", "WEBP") and img.mode not in ("RGB", "RGBA", "L", "LA", "P"):
+            img = img.convert("RGBA" if _has_alpha(img) else "RGB")
+        options: Dict[str, Any] = {"optimize": True} if format in ("JPEG", "PNG") else {"method": 4}
+        if format in ("JPEG", "WEBP"):
+            options["quality"] = self.quality
+        buffer = io.BytesIO()
+        img.save(buffer, format, **options)
+        return buffer.getvalue()
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_in - self.bytes_out
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "images": self.images,
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "bytes_saved": self.bytes_in - self.bytes_out,
+            }
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Sent to worker processes without the lock
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"ImagePreprocessor(format={self.format!r}, quality={self.quality})"
+
+
+def resolve_preprocessor(preprocessing: Any) -> Optional[ImagePreprocessor]:
+    """Normalize a client's ``image_preprocessing`` argument"""
+    if not preprocessing:
+        return None
+    if isinstance(preprocessing, ImagePreprocessor):
+        return preprocessing
+    return ImagePreprocessor()
+
+
+def _read(image: ImageInput) -> bytes:
+    if isinstance(image, (str, Path)):
+        with open(image, "rb") as f:
+            return f.read()
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        return bytes(image)
+    start = image.tell()
+    data = image.read()
+    image.seek(start, os.SEEK_SET)
+    return data
+
+
+def _has_metadata(img: Any) -> bool:
+    """Whether re-encoding is needed to drop EXIF, XMP, comments or PNG text"""
+    return bool(
+        len(img.getexif()) or getattr(img, "text", None)
+        or any(key in img.info for key in ("exif", "xmp", "XML:com.adobe.xmp", "comment"))
+    )
+
+
+def _has_alpha(img: Any) -> bool:
+    return img.mode in ("RGBA", "LA", "PA") or (img.mode == "P" and "transparency" in img.info)
+
+
+_ORIENTATION = 0x0112
+
+_LANCZOS = getattr(Image, "Resampling", Image).LANCZOS if Image is not None else None
@@ -0,0 +1,690 @@
+"""
+SVECTOR Batch Jobs
+
+Runs JSONL files of requests against the API with bounded memory, incremental
+output, resumable checkpoints and a dead-letter file for failures.
+
+Input format, one JSON object per line:
+
+    {"id": "q1", "endpoint": "conversations", "params": {"model": "spec-3-turbo", "input": "Hi"}}
+    {"model": "spec-3-turbo", "input": "Hello"}
+
+``endpoint`` is one of "conversations" (default), "chat" or "vision". When there is
+no ``params`` key, the remaining fields of the object are used as parameters.
+
+BatchJob runs a file in a single process; WorkQueue and QueueWorker share one
+batch between any number of processes or hosts through a SQLite queue file.
+"""
+
+import json
+import os
+import random
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from .batch import BatchItemResult, BatchRun, BatchStats, _window
+from .conversations import ConversationResponse
+from .errors import APIConnectionError, ConnectionError, TimeoutError, ValidationError
+from .limits import is_congestion_error
+from .vision import VisionResponse
+
+ENDPOINTS = ("conversations", "chat", "vision")
+
+# Checkpoint at least this often, in completed lines and seconds
+CHECKPOINT_EVERY = 100
+CHECKPOINT_INTERVAL = 5.0
+
+# Requeued tasks wait RETRY_DELAY * 2 ** (attempt - 1) seconds (with jitter, capped) or Retry-After
+RETRY_DELAY = 1.0
+RETRY_DELAY_MAX = 60.0
+
+
+def parse_line(text: str, line: int) -> Tuple[str, str, Dict[str, Any]]:
+    """Parse one input line into (id, endpoint, params)"""
+    try:
+        record = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValidationError(f"Invalid JSON: {e}")
+    if not isinstance(record, dict):
+        raise ValidationError("Each line must be a JSON object")
+
+    record = dict(record)
+    request_id = str(record.pop("id", line))
+    endpoint = record.pop("endpoint", "conversations")
+    if endpoint not in ENDPOINTS:
+        raise ValidationError(f"Unknown endpoint {endpoint!r}; expected one of {', '.join(ENDPOINTS)}")
+    params = record.pop("params", record)
+    if not isinstance(params, dict):
+        raise ValidationError("params must be a JSON object")
+    return request_id, endpoint, params
+
+
+def serialize_result(result: Any) -> Any:
+    """Convert API return values into JSON-serializable data"""
+    if isinstance(result, ConversationResponse):
+        return {"output": result.output, "usage": result.usage, "request_id": result.request_id}
+    if isinstance(result, VisionResponse):
+        return {"analysis": result.analysis, "usage": result.usage, "request_id": result.request_id}
+    return result
+
+
+def execute_request(client, endpoint: str, params: Dict[str, Any]) -> Any:
+    """Dispatch one parsed request to the matching client API"""
+    if endpoint == "chat":
+        return client.chat.create(**{**params, "stream": False})
+    if endpoint == "vision":
+        return client.vision.analyze(**params)
+    return client.conversations.create(**params)
+
+
+def result_record(item: BatchItemResult) -> str:
+    """Output JSONL record for a successful request"""
+    request = item.request
+    record = {
+        "id": request["request_id"],
+        "line": request["line"],
+        "endpoint": request["endpoint"],
+        "latency": round(item.latency, 4),
+        "result": item.result,
+    }
+    return json.dumps(record, ensure_ascii=False)
+
+
+def failure_record(item: BatchItemResult) -> str:
+    """Dead-letter JSONL record for a failed request, including the original request"""
+    request = item.request
+    original = {"id": request["request_id"], "endpoint": request["endpoint"], "params": request["params"]}
+    return _failure_json(request["line"], request["request_id"], original, item.error)
+
+
+def _failure_json(line: int, request_id: str, request: Any, error: BaseException) -> str:
+    record = {
+        "id": request_id,
+        "line": line,
+        "request": request,
+        "error": str(error),
+        "error_type": type(error).__name__,
+    }
+    return json.dumps(record, ensure_ascii=False)
+
+
+class BatchJob:
+    """
+    Resumable JSONL batch run
+
+    Results are appended to ``output_path`` as they complete; failures go to
+    ``dead_letter_path`` together with the original request so they can be
+    re-run. A checkpoint records the highest line below which everything is
+    finished plus the output file offsets, so after a crash ``run()`` skips
+    completed lines and only re-reads output written since the last checkpoint.
+
+    Example:
+        job = BatchJob(client, "input.jsonl", "output.jsonl", concurrency=16)
+        stats = job.run()
+        print(stats.to_dict())
+    """
+
+    def __init__(
+        self,
+        client,
+        input_path: Union[str, Path],
+        output_path: Union[str, Path],
+        dead_letter_path: Optional[Union[str, Path]] = None,
+        checkpoint_path: Optional[Union[str, Path]] = None,
+        concurrency: Any = 8,
+        resume: bool = True,
+        on_progress=None
+    ):
+        self.client = client
+        self.input_path = Path(input_path)
+        self.output_path = Path(output_path)
+        self.dead_letter_path = Path(dead_letter_path or f"{output_path}.failed.jsonl")
+        self.checkpoint_path = Path(checkpoint_path or f"{output_path}.checkpoint")
+        self.concurrency = concurrency
+        self.resume = resume
+        self.on_progress = on_progress
+
+        self._watermark = 1
+        self._done: Set[int] = set()
+        self.skipped = 0
+
+    def execute(self, endpoint: str, params: Dict[str, Any]) -> Any:
+        """Perform one request; override to customise dispatch"""
+        return execute_request(self.client, endpoint, params)
+
+    def run(self) -> BatchStats:
+        """Process every unfinished input line and return aggregate stats"""
+        if self.resume:
+            self._load_checkpoint()
+        else:
+            for path in (self.output_path, self.dead_letter_path, self.checkpoint_path):
+                if path.exists():
+                    path.unlink()
+
+        with open(self.output_path, "a", encoding="utf-8") as output, \
+                open(self.dead_letter_path, "a", encoding="utf-8") as dead_letter:
+            run = BatchRun(
+                self._run_line, self._pending_lines(dead_letter),
+                concurrency=self.concurrency, on_progress=self.on_progress
+            )
+            last_checkpoint = time.monotonic()
+            since_checkpoint = 0
+            try:
+                for item in run:
+                    self._write(item, output, dead_letter)
+                    since_checkpoint += 1
+                    if (
+                        since_checkpoint >= CHECKPOINT_EVERY
+                        or time.monotonic() - last_checkpoint >= CHECKPOINT_INTERVAL
+                    ):
+                        self._checkpoint(output, dead_letter)
+                        last_checkpoint = time.monotonic()
+                        since_checkpoint = 0
+            finally:
+                self._checkpoint(output, dead_letter)
+        return run.stats
+
+    def _pending_lines(self, dead_letter) -> Iterator[Dict[str, Any]]:
+        """Lazily yield unfinished input lines as BatchRun requests"""
+        with open(self.input_path, "r", encoding="utf-8") as source:
+            for line, text in enumerate(source, 1):
+                if line < self._watermark or line in self._done:
+                    self.skipped += 1
+                    continue
+                if not text.strip():
+                    self._mark_done(line)
+                    continue
+                try:
+                    request_id, endpoint, params = parse_line(text, line)
+                except ValidationError as e:
+                    self._write_failure(dead_letter, line, str(line), text.rstrip("\n"), e)
+                    self._mark_done(line)
+                    continue
+                yield {"line": line, "request_id": request_id, "endpoint": endpoint, "params": params}
+
+    def _run_line(self, line: int, request_id: str, endpoint: str, params: Dict[str, Any]) -> Any:
+        return serialize_result(self.execute(endpoint, params))
+
+    def _write(self, item: BatchItemResult, output, dead_letter):
+        if item.ok:
+            output.write(result_record(item) + "\n")
+        else:
+            dead_letter.write(failure_record(item) + "\n")
+        self._mark_done(item.request["line"])
+
+    def _write_failure(self, dead_letter, line: int, request_id: str, request: Any, error: BaseException):
+        dead_letter.write(_failure_json(line, request_id, request, error) + "\n")
+
+    def _mark_done(self, line: int):
+        self._done.add(line)
+        while self._watermark in self._done:
+            self._done.discard(self._watermark)
+            self._watermark += 1
+
+    def _checkpoint(self, output, dead_letter):
+        output.flush()
+        dead_letter.flush()
+        os.fsync(output.fileno())
+        os.fsync(dead_letter.fileno())
+        state = {
+            "input": str(self.input_path),
+            "watermark": self._watermark,
+            "done": sorted(self._done),
+            "output_offset": output.tell(),
+            "dead_letter_offset": dead_letter.tell(),
+        }
+        tmp_path = self.checkpoint_path.with_name(self.checkpoint_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _load_checkpoint(self):
+        state: Dict[str, Any] = {}
+        if self.checkpoint_path.exists():
+            with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        self._watermark = state.get("watermark", 1)
+        self._done = set(state.get("done", []))
+
+        # Lines finished after the last checkpoint are recovered from the files themselves
+        for path, key in ((self.output_path, "output_offset"), (self.dead_letter_path, "dead_letter_offset")):
+            for line in _completed_lines(path, state.get(key, 0)):
+                self._mark_done(line)
+
+
+def _completed_lines(path: Path, offset: int) -> Iterator[int]:
+    """Line numbers recorded in a result file after ``offset``, dropping a torn last record"""
+    if not path.exists():
+        return
+    with open(path, "r+b") as f:
+        f.seek(offset)
+        position = offset
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                # Partial write from a crash: cut it off so the file stays valid JSONL
+                f.truncate(position)
+                break
+            position += len(raw)
+            try:
+                yield json.loads(raw)["line"]
+            except (ValueError, KeyError):
+                continue
+
+
+class WorkQueue:
+    """
+    Shared SQLite work queue for running one batch on several processes or hosts
+
+    Input lines are enqueued once; workers then lease small groups of tasks,
+    renew the leases while working and commit each result. A lease that is
+    not renewed (because its worker died) expires and the tasks become
+    available to other workers, so every task runs at least once. Commits are
+    idempotent: the first result for a task wins and later duplicates from a
+    worker whose lease had expired are ignored.
+
+    For workers on several hosts, put the queue on a shared filesystem with
+    working POSIX locks and pass ``wal=False`` (SQLite's WAL mode needs shared
+    memory, which network filesystems do not provide).
+
+    Example:
+        queue = WorkQueue("nightly.queue")
+        queue.enqueue("requests.jsonl")
+        # on every host:
+        QueueWorker(client, "nightly.queue", concurrency=16).run()
+        # once finished:
+        queue.export("results.jsonl")
+    """
+
+    def __init__(self, path: Union[str, Path], max_attempts: int = 3, wal: bool = True, timeout: float = 60.0):
+        self.path = Path(path)
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=timeout, isolation_level=None, check_same_thread=False
+        )
+        if wal:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS tasks (
+                line INTEGER PRIMARY KEY,
+                request TEXT NOT NULL,
+                state TEXT NOT NULL DEFAULT 'pending',
+                owner TEXT,
+                lease_expires REAL NOT NULL DEFAULT 0,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                record TEXT
+            );
+            CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state, lease_expires);
+            """
+        )
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def enqueue(self, input_path: Union[str, Path], chunk_size: int = 1000) -> int:
+        """
+        Add every line of a JSONL file to the queue
+
+        Safe to repeat: lines already in the queue are left alone, so an
+        interrupted enqueue can simply be re-run. Lines that fail to parse are
+        recorded as failed straight away.
+
+        Returns:
+            Number of lines added
+        """
+        source = str(Path(input_path).resolve())
+        with self._transaction() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'input'").fetchone()
+            if row and row[0] != source:
+                raise ValidationError(f"Queue {self.path} already holds {row[0]}")
+            conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('input', ?)", (source,))
+
+        added = 0
+        rows = []
+        with open(input_path, "r", encoding="utf-8") as f:
+            for line, text in enumerate(f, 1):
+                if not text.strip():
+                    continue
+                text = text.rstrip("\n")
+                try:
+                    parse_line(text, line)
+                    rows.append((line, text, "pending", None))
+                except ValidationError as e:
+                    rows.append((line, text, "failed", _failure_json(line, str(line), text, e)))
+                if len(rows) >= chunk_size:
+                    added += self._insert(rows)
+                    rows = []
+        if rows:
+            added += self._insert(rows)
+        return added
+
+    def _insert(self, rows) -> int:
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO tasks (line, request, state, record) VALUES (?, ?, ?, ?)", rows
+            )
+            return conn.total_changes - before
+
+    def lease(self, worker_id: str, limit: int, lease_seconds: float) -> List[Tuple[int, str, int]]:
+        """
+        Claim up to ``limit`` pending or expired tasks for ``lease_seconds``
+
+        Returns:
+            List of (line, request text, attempt number)
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            # Tasks that keep killing their workers are given up on instead of looping forever
+            abandoned = conn.execute(
+                "SELECT line, request, attempts FROM tasks "
+                "WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, self.max_attempts)
+            ).fetchall()
+            conn.executemany(
+                "UPDATE tasks SET state = 'failed', record = ?, owner = NULL WHERE line = ?",
+                [
+                    (_failure_json(line, str(line), request, TimeoutError(f"Lease expired after {attempts} attempts")), line)
+                    for line, request, attempts in abandoned
+                ]
+            )
+            # Pending tasks keep their retry delay in lease_expires
+            rows = conn.execute(
+                "SELECT line, request, attempts FROM tasks "
+                "WHERE (state = 'pending' AND lease_expires <= ?) OR (state = 'leased' AND lease_expires < ?) "
+                "ORDER BY line LIMIT ?",
+                (now, now, limit)
+            ).fetchall()
+            conn.executemany(
+                "UPDATE tasks SET state = 'leased', owner = ?, lease_expires = ?, attempts = attempts + 1 "
+                "WHERE line = ?",
+                [(worker_id, now + lease_seconds, line) for line, _, _ in rows]
+            )
+        return [(line, request, attempts + 1) for line, request, attempts in rows]
+
+    def renew(self, worker_id: str, lines: Iterable[int], lease_seconds: float):
+        """Extend this worker's leases on ``lines``"""
+        expires = time.time() + lease_seconds
+        with self._transaction() as conn:
+            conn.executemany(
+                "UPDATE tasks SET lease_expires = ? WHERE line = ? AND state = 'leased' AND owner = ?",
+                [(expires, line, worker_id) for line in lines]
+            )
+
+    def release(self, worker_id: str, lines: Iterable[int]):
+        """Hand this worker's leased tasks back to the queue for another attempt"""
+        self.requeue(worker_id, ((line, 0.0) for line in lines))
+
+    def requeue(self, worker_id: str, retries: Iterable[Tuple[int, float]]):
+        """
+        Hand this worker's leased tasks back to the queue after a delay
+
+        Args:
+            retries: (line, delay) pairs; a task is not leased again until
+                ``delay`` seconds from now
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            conn.executemany(
+                "UPDATE tasks SET state = 'pending', owner = NULL, lease_expires = ? "
+                "WHERE line = ? AND state = 'leased' AND owner = ?",
+                [(now + delay, line, worker_id) for line, delay in retries]
+            )
+
+    def ready_in(self) -> Optional[float]:
+        """Seconds until a pending task can be leased (0 if one can now), or None if none is pending"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(lease_expires) FROM tasks WHERE state = 'pending'"
+            ).fetchone()
+        if row[0] is None:
+            return None
+        return max(row[0] - time.time(), 0.0)
+
+    def commit(self, results: Iterable[Tuple[int, str, str]]) -> int:
+        """
+        Record finished tasks
+
+        Args:
+            results: (line, state, record) tuples where state is "done" or "failed"
+                and record is the JSONL output line
+
+        Returns:
+            Number of tasks updated; results for tasks that are already
+            finished are ignored
+        """
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "UPDATE tasks SET state = ?, record = ?, owner = NULL, lease_expires = 0 "
+                "WHERE line = ? AND state IN ('pending', 'leased')",
+                [(state, record, line) for line, state, record in results]
+            )
+            return conn.total_changes - before
+
+    def counts(self) -> Dict[str, int]:
+        """Number of tasks by state; expired leases count as pending"""
+        counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT CASE WHEN state = 'leased' AND lease_expires < ? THEN 'pending' ELSE state END, "
+                "COUNT(*) FROM tasks GROUP BY 1",
+                (time.time(),)
+            ).fetchall()
+        counts.update(dict(rows))
+        return counts
+
+    def export(self, output_path: Union[str, Path], dead_letter_path: Optional[Union[str, Path]] = None) -> Dict[str, int]:
+        """
+        Write finished results and failures to JSONL files in input order
+
+        Returns:
+            Number of records written per file
+        """
+        dead_letter_path = dead_letter_path or f"{output_path}.failed.jsonl"
+        written = {"done": 0, "failed": 0}
+        with open(output_path, "w", encoding="utf-8") as output, \
+                open(dead_letter_path, "w", encoding="utf-8") as dead_letter:
+            files = {"done": output, "failed": dead_letter}
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT state, record FROM tasks WHERE state IN ('done', 'failed') ORDER BY line"
+                )
+                for state, record in rows:
+                    files[state].write(record + "\n")
+                    written[state] += 1
+        return written
+
+    def close(self):
+        """Close the database connection"""
+        self._conn.close()
+
+
+def _should_requeue(error: BaseException) -> bool:
+    """Failures worth another attempt on a later lease"""
+    return is_congestion_error(error) or isinstance(error, (APIConnectionError, ConnectionError))
+
+
+def _retry_delay(error: BaseException, attempt: int, base: float) -> float:
+    """Seconds a requeued task waits: the API's Retry-After if sent, else jittered exponential backoff"""
+    headers = getattr(error, "headers", None) or {}
+    try:
+        return min(float(headers.get("Retry-After")), RETRY_DELAY_MAX)
+    except (TypeError, ValueError):
+        pass
+    delay = min(base * 2 ** (attempt - 1), RETRY_DELAY_MAX)
+    return random.uniform(delay / 2, delay)
+
+
+class QueueWorker:
+    """
+    Worker that processes tasks from a WorkQueue until it is drained
+
+    Tasks are leased ``lease_size`` at a time and run through a BatchRun, so
+    the request window stays full across lease boundaries. A heartbeat thread
+    renews the leases of tasks held by this worker, and results are committed
+    in small groups (a crash between commits only means those tasks run
+    again). Overload, timeout and connection failures are handed back to the
+    queue until ``max_attempts`` is reached, and are not leased again before
+    the response's Retry-After or an exponential backoff from ``retry_delay``
+    seconds; other errors are final.
+
+    Example:
+        worker = QueueWorker(client, "nightly.queue", concurrency=16)
+        stats = worker.run()
+    """
+
+    def __init__(
+        self,
+        client,
+        queue: Union[str, Path, WorkQueue],
+        worker_id: Optional[str] = None,
+        concurrency: Any = 8,
+        lease_size: Optional[int] = None,
+        lease_seconds: float = 300.0,
+        commit_every: int = 50,
+        poll_interval: float = 5.0,
+        wait: bool = True,
+        retry_delay: float = RETRY_DELAY,
+        on_progress=None
+    ):
+        self.client = client
+        self.queue = queue if isinstance(queue, WorkQueue) else WorkQueue(queue)
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.concurrency = concurrency
+        self.lease_size = lease_size or max(_window(concurrency), 1) * 4
+        self.lease_seconds = lease_seconds
+        self.commit_every = commit_every
+        self.poll_interval = poll_interval
+        self.wait = wait
+        self.retry_delay = retry_delay
+        self.on_progress = on_progress
+        self.stats = BatchStats()
+
+        self._held: Dict[int, int] = {}
+        self._held_lock = threading.Lock()
+        self._outbox: List[Tuple[int, str, str]] = []
+        self._retry: List[Tuple[int, float]] = []
+        self._last_flush = time.monotonic()
+        self._stopped = threading.Event()
+        self._closed = threading.Event()
+
+    def execute(self, endpoint: str, params: Dict[str, Any]) -> Any:
+        """Perform one request; override to customise dispatch"""
+        return execute_request(self.client, endpoint, params)
+
+    def run(self) -> BatchStats:
+        """Process tasks until the queue has no unfinished work left"""
+        heartbeat = threading.Thread(target=self._heartbeat, name="svector-lease-heartbeat", daemon=True)
+        heartbeat.start()
+        try:
+            while not self._stopped.is_set():
+                run = BatchRun(self._run_task, self._leased_tasks(), concurrency=self.concurrency)
+                for item in run:
+                    self._finish(item)
+                self._flush()
+
+                counts = self.queue.counts()
+                if not counts["pending"] and (not counts["leased"] or not self.wait):
+                    break
+                if not counts["pending"]:
+                    # Other workers hold the remaining leases; wait in case they die
+                    self._stopped.wait(self.poll_interval)
+                else:
+                    # Requeued tasks are waiting out their retry delay
+                    self._stopped.wait(min(self.queue.ready_in() or 0.0, self.poll_interval))
+        finally:
+            self._flush()
+            # Give back anything leased but never started
+            with self._held_lock:
+                unstarted = list(self._held)
+                self._held.clear()
+            if unstarted:
+                self.queue.release(self.worker_id, unstarted)
+            self._closed.set()
+            heartbeat.join()
+            self.stats.finish()
+        return self.stats
+
+    def stop(self):
+        """Stop leasing new tasks; in-flight tasks still finish and commit"""
+        self._stopped.set()
+
+    def _leased_tasks(self) -> Iterator[Dict[str, Any]]:
+        while not self._stopped.is_set():
+            leased = self.queue.lease(self.worker_id, self.lease_size, self.lease_seconds)
+            if not leased:
+                return
+            with self._held_lock:
+                for line, _, attempt in leased:
+                    self._held[line] = attempt
+            for line, text, _ in leased:
+                if self._stopped.is_set():
+                    return
+                request_id, endpoint, params = parse_line(text, line)
+                yield {"line": line, "request_id": request_id, "endpoint": endpoint, "params": params}
+
+    def _run_task(self, line: int, request_id: str, endpoint: str, params: Dict[str, Any]) -> Any:
+        return serialize_result(self.execute(endpoint, params))
+
+    def _finish(self, item: BatchItemResult):
+        line = item.request["line"]
+        with self._held_lock:
+            attempt = self._held.get(line, self.queue.max_attempts)
+        if item.ok:
+            self._outbox.append((line, "done", result_record(item)))
+        elif _should_requeue(item.error) and attempt < self.queue.max_attempts:
+            self._retry.append((line, _retry_delay(item.error, attempt, self.retry_delay)))
+        else:
+            self._outbox.append((line, "failed", failure_record(item)))
+
+        self.stats.record(item)
+        if self.on_progress is not None:
+            self.on_progress(item, self.stats)
+        if (
+            len(self._outbox) + len(self._retry) >= self.commit_every
+            or time.monotonic() - self._last_flush >= CHECKPOINT_INTERVAL
+        ):
+            self._flush()
+
+    def _flush(self):
+        # Leases stay renewed until the results are committed
+        if self._outbox:
+            self.queue.commit(self._outbox)
+        if self._retry:
+            self.queue.requeue(self.worker_id, self._retry)
+        with self._held_lock:
+            for line, _ in self._retry:
+                self._held.pop(line, None)
+            for line, _, _ in self._outbox:
+                self._held.pop(line, None)
+        self._outbox = []
+        self._retry = []
+        self._last_flush = time.monotonic()
+
+    def _heartbeat(self):
+        interval = self.lease_seconds / 3
+        while not self._closed.wait(interval):
+            with self._held_lock:
+                held = list(self._held)
+            if held:
+                self.queue.renew(self.worker_id, held, self.lease_seconds)
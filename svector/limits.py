@@ -0,0 +1,679 @@
+"""
+SVECTOR Request Limits
+
+Client-side controls for how much work is sent to the API at once.
+"""
+
+import asyncio
+import builtins
+import contextlib
+import contextvars
+import getpass
+import heapq
+import itertools
+import os
+import struct
+import tempfile
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
+
+import requests
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from .errors import (APIConnectionTimeoutError, QueueTimeoutError, RateLimitError,
+                     SVECTORError, TimeoutError)
+
+
+def is_congestion_error(error: Optional[BaseException]) -> bool:
+    """Whether an error signals overload: 429, 5xx or a server/transport timeout"""
+    if error is None or isinstance(error, QueueTimeoutError):
+        # Time spent in the local queue says nothing about the server
+        return False
+    if isinstance(error, (RateLimitError, APIConnectionTimeoutError, TimeoutError)):
+        return True
+    if isinstance(error, SVECTORError):
+        return error.status_code is not None and error.status_code >= 500
+    return isinstance(error, (asyncio.TimeoutError, builtins.TimeoutError, requests.exceptions.Timeout))
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD limiter for the number of in-flight requests
+
+    The limit grows additively (by ``increase`` per limit's worth of healthy
+    completions, i.e. roughly once per round trip) and is cut multiplicatively
+    by ``decrease_factor`` on rate limiting, 5xx responses, timeouts, or when
+    latency exceeds ``latency_tolerance`` times the (slowly decaying) best
+    observed latency.
+    Decreases are applied at most once per ``cooldown`` seconds so one burst of
+    failures from the same window only counts once.
+
+    Can be shared between threads and event loops. Attach it to a client with
+    ``SVECTOR(concurrency_limiter=...)`` / ``AsyncSVECTOR(concurrency_limiter=...)``
+    or pass it as ``concurrency`` to the batch APIs.
+
+    Example:
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8, max_limit=128)
+        client = SVECTOR(concurrency_limiter=limiter)
+        ...
+        print(limiter.limit, limiter.metrics())
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 256,
+        increase: float = 1.0,
+        decrease_factor: float = 0.5,
+        latency_tolerance: Optional[float] = 2.0,
+        cooldown: float = 1.0
+    ):
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Expected 1 <= min_limit <= initial_limit <= max_limit")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.cooldown = cooldown
+
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._best_latency: Optional[float] = None
+        self._last_decrease = 0.0
+        self._successes = 0
+        self._congestion_events = 0
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._async_waiters: Deque[Any] = deque()
+
+    @property
+    def limit(self) -> int:
+        """Current concurrency limit"""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot of the limiter state"""
+        return {
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "best_latency": self._best_latency,
+            "successes": self._successes,
+            "congestion_events": self._congestion_events,
+        }
+
+    def try_acquire(self) -> bool:
+        """Take a slot if one is free, without blocking"""
+        with self._lock:
+            if self._in_flight < self.limit:
+                self._in_flight += 1
+                return True
+            return False
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Block until a slot is free; returns False if ``timeout`` expires"""
+        with self._available:
+            if not self._available.wait_for(lambda: self._in_flight < self.limit, timeout):
+                return False
+            self._in_flight += 1
+            return True
+
+    async def acquire_async(self):
+        """Wait for a slot without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                if self._in_flight < self.limit:
+                    self._in_flight += 1
+                    return
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                with self._lock:
+                    if (loop, waiter) in self._async_waiters:
+                        self._async_waiters.remove((loop, waiter))
+                    else:
+                        # Already woken: pass the wake-up on to the next waiter
+                        self._wake_locked()
+                raise
+
+    def release(self, latency: Optional[float] = None, error: Optional[BaseException] = None):
+        """Free a slot and feed the outcome of the request into the limit"""
+        with self._lock:
+            self._in_flight -= 1
+            self._record_locked(latency, error)
+            self._wake_locked()
+
+    def record(self, latency: Optional[float] = None, error: Optional[BaseException] = None):
+        """Feed an outcome into the limit without touching slots"""
+        with self._lock:
+            self._record_locked(latency, error)
+            self._wake_locked()
+
+    @contextlib.contextmanager
+    def slot(self):
+        """Hold a slot for the duration of the block, recording its outcome"""
+        self.acquire()
+        started = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            self.release(time.monotonic() - started, e)
+            raise
+        self.release(time.monotonic() - started)
+
+    @contextlib.asynccontextmanager
+    async def slot_async(self):
+        """Async version of ``slot``"""
+        await self.acquire_async()
+        started = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            self.release(time.monotonic() - started, e)
+            raise
+        self.release(time.monotonic() - started)
+
+    def _record_locked(self, latency: Optional[float], error: Optional[BaseException]):
+        congested = is_congestion_error(error)
+        if not congested and error is None and latency is not None:
+            if self._best_latency is None:
+                self._best_latency = latency
+            elif (
+                self.latency_tolerance is not None
+                and latency > self._best_latency * self.latency_tolerance
+            ):
+                congested = True
+            # Baseline drifts upwards slowly so one unusually fast reply does not pin it
+            self._best_latency = min(latency, self._best_latency * 1.01)
+
+        if congested:
+            now = time.monotonic()
+            if now - self._last_decrease >= self.cooldown:
+                self._last_decrease = now
+                self._congestion_events += 1
+                self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+        elif error is None:
+            self._successes += 1
+            self._limit = min(float(self.max_limit), self._limit + self.increase / self._limit)
+
+    def _wake_locked(self):
+        self._available.notify_all()
+        free = self.limit - self._in_flight
+        while free > 0 and self._async_waiters:
+            loop, waiter = self._async_waiters.popleft()
+            loop.call_soon_threadsafe(_resolve, waiter)
+            free -= 1
+
+
+def _resolve(waiter: asyncio.Future):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+# Priority classes understood by RequestScheduler; lower runs first
+PRIORITIES: Dict[str, int] = {"interactive": 0, "default": 1, "batch": 2}
+
+_current_priority: "contextvars.ContextVar[Optional[Tuple[int, Optional[float]]]]" = (
+    contextvars.ContextVar("svector_request_priority", default=None)
+)
+
+
+def _priority_rank(priority: Union[str, int]) -> int:
+    if isinstance(priority, int):
+        return priority
+    try:
+        return PRIORITIES[priority]
+    except KeyError:
+        raise ValueError(f"Unknown priority {priority!r}; expected one of {sorted(PRIORITIES)} or an int")
+
+
+@contextlib.contextmanager
+def request_priority(priority: Union[str, int], deadline: Optional[float] = None):
+    """
+    Tag every request made inside the block with a priority and deadline
+
+    ``deadline`` is in seconds from entering the block. Applies to the current
+    thread or task, and is carried into batch workers and ``SVECTOR.submit``.
+    """
+    absolute = time.monotonic() + deadline if deadline is not None else None
+    token = _current_priority.set((_priority_rank(priority), absolute))
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> Optional[Tuple[int, Optional[float]]]:
+    """(rank, absolute monotonic deadline) set by ``request_priority``, if any"""
+    return _current_priority.get()
+
+
+def resolve_priority(
+    priority: Optional[Union[str, int]] = None,
+    deadline: Optional[float] = None
+) -> Tuple[int, Optional[float]]:
+    """
+    Work out the (rank, absolute deadline) for a request
+
+    Explicit arguments win over the enclosing ``request_priority`` block;
+    ``deadline`` is in seconds from now.
+    """
+    rank, absolute = _current_priority.get() or (PRIORITIES["default"], None)
+    if priority is not None:
+        rank = _priority_rank(priority)
+    if deadline is not None:
+        absolute = time.monotonic() + deadline
+    return rank, absolute
+
+
+def set_current_priority(state: Optional[Tuple[int, Optional[float]]]):
+    """Adopt a captured ``current_priority()`` in another task or thread"""
+    _current_priority.set(state)
+
+
+class _Waiter:
+    __slots__ = ("event", "loop", "future", "granted", "cancelled")
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.loop = loop
+        self.event = None if loop else threading.Event()
+        self.future = loop.create_future() if loop else None
+        self.granted = False
+        self.cancelled = False
+
+    def wake(self):
+        if self.loop is None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(_resolve, self.future)
+
+
+class RequestScheduler:
+    """
+    Priority scheduler sharing one client's request budget
+
+    At most ``max_concurrency`` requests run at once. When the budget is full,
+    waiting requests are admitted by priority class first and earliest deadline
+    within a class, so interactive traffic overtakes queued batch work while
+    batch work still uses any spare capacity. A request whose deadline passes
+    while queued fails with ``QueueTimeoutError`` without being sent.
+
+    ``max_concurrency`` may be an AdaptiveConcurrencyLimiter; the budget then
+    follows its limit and request outcomes are fed back into it.
+
+    Example:
+        client = SVECTOR(scheduler=RequestScheduler(max_concurrency=32))
+
+        with client.priority("interactive", deadline=5):
+            client.conversations.create(model="spec-3-turbo", input="Hi")
+
+        with client.priority("batch"):
+            client.conversations.create_many(requests, concurrency=64)
+    """
+
+    def __init__(self, max_concurrency: Union[int, AdaptiveConcurrencyLimiter] = 16):
+        if not isinstance(max_concurrency, AdaptiveConcurrencyLimiter) and max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self._in_flight = 0
+        self._queue: List[Tuple[int, float, int, _Waiter]] = []
+        self._counter = itertools.count()
+        self._queued_by_rank: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        if isinstance(self.max_concurrency, AdaptiveConcurrencyLimiter):
+            return self.max_concurrency.limit
+        return self.max_concurrency
+
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot of the scheduler state"""
+        with self._lock:
+            names = {rank: name for name, rank in PRIORITIES.items()}
+            return {
+                "capacity": self.capacity,
+                "in_flight": self._in_flight,
+                "queued": {
+                    names.get(rank, rank): count
+                    for rank, count in self._queued_by_rank.items() if count
+                },
+            }
+
+    def _enqueue_locked(self, rank: int, deadline: Optional[float], waiter: _Waiter) -> bool:
+        """Queue the waiter and admit what fits; returns True if it was granted"""
+        key = deadline if deadline is not None else float("inf")
+        heapq.heappush(self._queue, (rank, key, next(self._counter), waiter))
+        self._queued_by_rank[rank] = self._queued_by_rank.get(rank, 0) + 1
+        self._dispatch_locked()
+        return waiter.granted
+
+    def _dispatch_locked(self):
+        while self._queue and self._in_flight < self.capacity:
+            rank, _, _, waiter = heapq.heappop(self._queue)
+            if waiter.cancelled:
+                continue
+            self._queued_by_rank[rank] -= 1
+            waiter.granted = True
+            self._in_flight += 1
+            waiter.wake()
+
+    def _cancel_locked(self, rank: int, waiter: _Waiter) -> bool:
+        """Withdraw a queued waiter; returns False if it was granted meanwhile"""
+        if waiter.granted:
+            return False
+        # Left in the heap and skipped when popped
+        waiter.cancelled = True
+        self._queued_by_rank[rank] -= 1
+        return True
+
+    def acquire(self, priority: Union[str, int] = "default", deadline: Optional[float] = None):
+        """
+        Block until the request may run
+
+        Args:
+            priority: Priority class name or rank (lower runs first)
+            deadline: Absolute ``time.monotonic()`` deadline, if any
+        """
+        rank = _priority_rank(priority)
+        waiter = _Waiter()
+        with self._lock:
+            if self._enqueue_locked(rank, deadline, waiter):
+                return
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        if waiter.event.wait(timeout):
+            return
+        with self._lock:
+            if not self._cancel_locked(rank, waiter):
+                return
+        raise QueueTimeoutError("Request deadline exceeded while queued")
+
+    async def acquire_async(self, priority: Union[str, int] = "default", deadline: Optional[float] = None):
+        """Async version of ``acquire``"""
+        rank = _priority_rank(priority)
+        waiter = _Waiter(asyncio.get_running_loop())
+        with self._lock:
+            if self._enqueue_locked(rank, deadline, waiter):
+                return
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+            return
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            with self._lock:
+                if not self._cancel_locked(rank, waiter):
+                    if isinstance(e, asyncio.CancelledError):
+                        # Granted just as we were cancelled: give the slot back
+                        self._in_flight -= 1
+                        self._dispatch_locked()
+                        raise
+                    return
+            if isinstance(e, asyncio.CancelledError):
+                raise
+        raise QueueTimeoutError("Request deadline exceeded while queued")
+
+    def release(self, latency: Optional[float] = None, error: Optional[BaseException] = None):
+        """Free a slot and admit the next waiting request"""
+        if isinstance(self.max_concurrency, AdaptiveConcurrencyLimiter):
+            self.max_concurrency.record(latency, error)
+        with self._lock:
+            self._in_flight -= 1
+            self._dispatch_locked()
+
+    @contextlib.contextmanager
+    def slot(self, priority: Union[str, int] = "default", deadline: Optional[float] = None):
+        """Hold a scheduled slot for the duration of the block"""
+        self.acquire(priority, deadline)
+        started = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            self.release(time.monotonic() - started, e)
+            raise
+        self.release(time.monotonic() - started)
+
+    @contextlib.asynccontextmanager
+    async def slot_async(self, priority: Union[str, int] = "default", deadline: Optional[float] = None):
+        """Async version of ``slot``"""
+        await self.acquire_async(priority, deadline)
+        started = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            self.release(time.monotonic() - started, e)
+            raise
+        self.release(time.monotonic() - started)
+
+
+class SharedRateLimiter:
+    """
+    Requests/second and tokens/minute budget shared by every process on a host
+
+    State lives in a small file updated under an exclusive file lock, so all
+    workers (e.g. gunicorn processes) configured with the same ``name`` draw from
+    one pair of token buckets without any external service. Token usage is
+    reserved up front from an estimate (prompt size plus ``max_tokens``) and
+    corrected from the response's reported usage.
+
+    All processes sharing a ``name`` should use the same limits. The state file
+    is per user by default (in ``$XDG_RUNTIME_DIR`` or the temp directory); to
+    share a budget between users, pass them all a ``path`` they can write.
+
+    Example:
+        limiter = SharedRateLimiter(requests_per_second=20, tokens_per_minute=200_000)
+        client = SVECTOR(rate_limiter=limiter)
+    """
+
+    _STATE = struct.Struct("<dddd")
+
+    def __init__(
+        self,
+        requests_per_second: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        name: str = "default",
+        path: Optional[Union[str, os.PathLike]] = None,
+        burst: Optional[float] = None
+    ):
+        if requests_per_second is None and tokens_per_minute is None:
+            raise ValueError("Set requests_per_second, tokens_per_minute or both")
+        self.requests_per_second = requests_per_second
+        self.tokens_per_minute = tokens_per_minute
+        # A request needs one whole token, so the bucket holds at least one even below 1 request/s
+        self.request_capacity = max(1.0, burst or requests_per_second) if requests_per_second else 0.0
+        self.token_capacity = tokens_per_minute or 0.0
+        self.path = Path(path) if path else _default_state_dir() / f"svector-{name}-{_user_id()}.ratelimit"
+        self._lock = threading.Lock()
+        self._fd: Optional[int] = None
+        self._pid = os.getpid()
+
+    def _check_fork(self):
+        # A forked child shares the parent's open file description, which flock
+        # does not exclude, and may inherit _lock held by another thread
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._lock = threading.Lock()
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    def _file(self) -> int:
+        if self._fd is None:
+            try:
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            except PermissionError as e:
+                raise PermissionError(
+                    f"Cannot open rate limit state file {self.path}: {e.strerror}. "
+                    "Pass SharedRateLimiter(path=...) a file this user can read and write"
+                ) from e
+        return self._fd
+
+    @contextlib.contextmanager
+    def _locked_state(self):
+        """Yield the mutable [requests, updated, tokens, updated] state under the file lock"""
+        self._check_fork()
+        with self._lock:
+            fd = self._file()
+            _lock_file(fd)
+            try:
+                raw = _read_at(fd, self._STATE.size)
+                now = time.time()
+                if len(raw) == self._STATE.size:
+                    state = list(self._STATE.unpack(raw))
+                else:
+                    state = [self.request_capacity, now, self.token_capacity, now]
+                self._refill(state, now)
+                yield state
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.write(fd, self._STATE.pack(*state))
+            finally:
+                _unlock_file(fd)
+
+    def _refill(self, state: List[float], now: float):
+        if self.requests_per_second:
+            elapsed = max(0.0, now - state[1])
+            state[0] = min(self.request_capacity, state[0] + elapsed * self.requests_per_second)
+        state[1] = now
+        if self.tokens_per_minute:
+            elapsed = max(0.0, now - state[3])
+            state[2] = min(self.token_capacity, state[2] + elapsed * self.tokens_per_minute / 60)
+        state[3] = now
+
+    def try_acquire(self, tokens: float = 0) -> float:
+        """
+        Take one request and ``tokens`` from the shared budget if available
+
+        Returns 0 on success, otherwise the number of seconds to wait before
+        the budget can cover the request.
+        """
+        with self._locked_state() as state:
+            wait = 0.0
+            if self.requests_per_second and state[0] < 1:
+                wait = (1 - state[0]) / self.requests_per_second
+            if self.tokens_per_minute and tokens:
+                # A reservation larger than the bucket only needs a full bucket
+                needed = min(tokens, self.token_capacity)
+                if state[2] < needed:
+                    wait = max(wait, (needed - state[2]) * 60 / self.tokens_per_minute)
+            if wait > 0:
+                return wait
+            if self.requests_per_second:
+                state[0] -= 1
+            if self.tokens_per_minute:
+                state[2] -= tokens
+            return 0.0
+
+    def acquire(self, tokens: float = 0):
+        """Block until one request and ``tokens`` fit in the shared budget"""
+        while True:
+            wait = self.try_acquire(tokens)
+            if not wait:
+                return
+            time.sleep(min(wait, 1.0))
+
+    async def acquire_async(self, tokens: float = 0):
+        """Async version of ``acquire``"""
+        loop = asyncio.get_running_loop()
+        while True:
+            # The file lock blocks, so it is taken off the event loop
+            wait = await loop.run_in_executor(None, self.try_acquire, tokens)
+            if not wait:
+                return
+            await asyncio.sleep(min(wait, 1.0))
+
+    def adjust(self, tokens: float):
+        """Correct a reservation once actual usage is known (positive charges more)"""
+        if not self.tokens_per_minute or not tokens:
+            return
+        with self._locked_state() as state:
+            state[2] -= tokens
+
+    def metrics(self) -> Dict[str, Any]:
+        """Currently available budget"""
+        with self._locked_state() as state:
+            return {
+                "requests_available": state[0] if self.requests_per_second else None,
+                "tokens_available": state[2] if self.tokens_per_minute else None,
+            }
+
+    def close(self):
+        self._check_fork()
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+
+def _default_state_dir() -> Path:
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    return Path(runtime_dir) if runtime_dir else Path(tempfile.gettempdir())
+
+
+def _user_id() -> str:
+    """Current user, so users on one host do not collide on a state file"""
+    if hasattr(os, "getuid"):
+        return str(os.getuid())
+    return getpass.getuser()
+
+
+def estimate_tokens(data: Optional[Dict]) -> int:
+    """Rough token reservation for a chat request: ~4 characters per token plus max_tokens"""
+    if not data:
+        return 0
+    chars = 0
+    for message in data.get("messages") or []:
+        content = message.get("content")
+        if isinstance(content, str):
+            chars += len(content)
+        elif isinstance(content, list):
+            chars += sum(len(part.get("text", "")) for part in content if isinstance(part, dict))
+    return chars // 4 + (data.get("max_tokens") or 0)
+
+
+def settle_tokens(rate_limiter: Optional[SharedRateLimiter], reserved: int, result: Any):
+    """Correct a token reservation from the usage reported in a response body"""
+    if rate_limiter is None or not isinstance(result, dict):
+        return
+    used = (result.get("usage") or {}).get("total_tokens")
+    if used is not None:
+        rate_limiter.adjust(used - reserved)
+
+
+def _read_at(fd: int, size: int) -> bytes:
+    if hasattr(os, "pread"):
+        return os.pread(fd, size, 0)
+    os.lseek(fd, 0, os.SEEK_SET)
+    return os.read(fd, size)
+
+
+if fcntl is not None:
+    def _lock_file(fd: int):
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+    def _unlock_file(fd: int):
+        fcntl.flock(fd, fcntl.LOCK_UN)
+else:
+    def _lock_file(fd: int):
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+
+    def _unlock_file(fd: int):
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
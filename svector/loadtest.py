@@ -0,0 +1,287 @@
+"""
+SVECTOR Load Testing
+
+Closed-loop capacity measurement: a growing number of workers issue
+back-to-back ``conversations.create`` or ``create_stream`` calls, and each
+concurrency stage reports latency percentiles, time to first token,
+throughput, errors by type and whether the endpoint has saturated. Run it
+with ``svector loadtest``.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .batch import FATAL_ERRORS
+from .metrics import LatencyHistogram
+
+
+class LoadStage:
+    """Results of one concurrency stage"""
+
+    def __init__(self, concurrency: int):
+        self.concurrency = concurrency
+        self.duration = 0.0
+        self.succeeded = 0
+        self.tokens = 0
+        self.errors: Dict[str, int] = {}
+        self.latency = LatencyHistogram()
+        self.ttft = LatencyHistogram()
+        # Set by LoadTest once the stage is compared with earlier ones
+        self.saturated = False
+
+    @property
+    def completed(self) -> int:
+        return self.succeeded + sum(self.errors.values())
+
+    @property
+    def throughput(self) -> float:
+        """Successful requests per second"""
+        return self.succeeded / self.duration if self.duration > 0 else 0.0
+
+    @property
+    def tokens_per_second(self) -> float:
+        return self.tokens / self.duration if self.duration > 0 else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return 1 - self.succeeded / self.completed if self.completed else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "duration": self.duration,
+            "completed": self.completed,
+            "succeeded": self.succeeded,
+            "throughput": self.throughput,
+            "tokens_per_second": self.tokens_per_second,
+            "error_rate": self.error_rate,
+            "errors": dict(self.errors),
+            "latency_p50": self.latency.percentile(50),
+            "latency_p95": self.latency.percentile(95),
+            "latency_p99": self.latency.percentile(99),
+            "ttft_p50": self.ttft.percentile(50) if self.ttft.count else None,
+            "ttft_p95": self.ttft.percentile(95) if self.ttft.count else None,
+            "ttft_p99": self.ttft.percentile(99) if self.ttft.count else None,
+            "saturated": self.saturated,
+        }
+
+    def __repr__(self):
+        return (
+            f"LoadStage(concurrency={self.concurrency}, throughput={self.throughput:.2f}/s, "
+            f"p95={self.latency.percentile(95):.3f}s, error_rate={self.error_rate:.1%})"
+        )
+
+
+class LoadTest:
+    """
+    Ramp concurrency in stages and find where throughput stops scaling
+
+    Workers are added at the start of each stage and keep running into the
+    next one, so stages do not drain between steps. A request counts towards
+    the stage in which it completed. A stage is saturated when its error rate
+    exceeds ``max_error_rate`` or its throughput is less than ``min_gain``
+    above the best earlier stage; the saturation point is the best stage
+    before the first saturated one.
+
+    Args:
+        client: SVECTOR client (use ``max_retries=0`` to see raw errors; its
+            HTTP connection pool should hold at least the highest concurrency)
+        model: Model to call
+        input: User input sent with every request
+        instructions: System instructions sent with every request
+        stream: Use ``conversations.create_stream`` and measure time to first token
+        max_tokens: Completion limit per request
+        stages: Concurrency of each stage, in order
+        stage_duration: Seconds per stage
+        max_error_rate: Error rate that marks a stage as saturated
+        min_gain: Relative throughput gain a stage needs over the best earlier one
+        stop_at_saturation: Skip the remaining stages once one saturates
+
+    Example:
+        test = LoadTest(client, stages=[1, 4, 16, 64], stage_duration=20, stream=True)
+        test.run()
+        print(test.report())
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        model: str = "spec-3-turbo",
+        input: str = "Write one sentence about load testing.",
+        instructions: Optional[str] = None,
+        stream: bool = False,
+        max_tokens: Optional[int] = None,
+        stages: Sequence[int] = (1, 2, 4, 8, 16, 32),
+        stage_duration: float = 30.0,
+        max_error_rate: float = 0.05,
+        min_gain: float = 0.1,
+        stop_at_saturation: bool = True
+    ):
+        if not stages or any(concurrency < 1 for concurrency in stages):
+            raise ValueError("stages must be a non-empty list of concurrencies of at least 1")
+        self.client = client
+        self.model = model
+        self.input = input
+        self.instructions = instructions
+        self.stream = stream
+        self.max_tokens = max_tokens
+        self.stages = list(stages)
+        self.stage_duration = stage_duration
+        self.max_error_rate = max_error_rate
+        self.min_gain = min_gain
+        self.stop_at_saturation = stop_at_saturation
+        self.results: List[LoadStage] = []
+        self.fatal_error: Optional[BaseException] = None
+        self._current: Optional[LoadStage] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def run(self, on_stage: Optional[Callable[[LoadStage], None]] = None) -> List[LoadStage]:
+        """Run the stages; ``on_stage`` is called with each finished stage"""
+        workers: List[threading.Thread] = []
+        try:
+            for concurrency in self.stages:
+                stage = LoadStage(concurrency)
+                started = time.perf_counter()
+                with self._lock:
+                    self._current = stage
+                while len(workers) < concurrency:
+                    worker = threading.Thread(target=self._work, name=f"svector-load-{len(workers)}", daemon=True)
+                    worker.start()
+                    workers.append(worker)
+                self._stop.wait(self.stage_duration)
+                with self._lock:
+                    stage.duration = time.perf_counter() - started
+                    self._current = None
+                self._finish_stage(stage)
+                if on_stage is not None:
+                    on_stage(stage)
+                if self._stop.is_set() or (stage.saturated and self.stop_at_saturation):
+                    break
+        finally:
+            self._stop.set()
+            for worker in workers:
+                worker.join()
+        return self.results
+
+    def _work(self):
+        while not self._stop.is_set():
+            started = time.perf_counter()
+            first_token = None
+            tokens = 0
+            error = None
+            try:
+                if self.stream:
+                    for event in self.client.conversations.create_stream(
+                        model=self.model, instructions=self.instructions, input=self.input, max_tokens=self.max_tokens
+                    ):
+                        if event.content:
+                            tokens += 1
+                            if first_token is None:
+                                first_token = time.perf_counter() - started
+                else:
+                    response = self.client.conversations.create(
+                        model=self.model, instructions=self.instructions, input=self.input, max_tokens=self.max_tokens
+                    )
+                    tokens = (response.usage or {}).get("completion_tokens") or 0
+            except Exception as e:
+                error = e
+            latency = time.perf_counter() - started
+
+            with self._lock:
+                stage = self._current
+                if stage is None:
+                    continue
+                if error is None:
+                    stage.succeeded += 1
+                    stage.tokens += tokens
+                    stage.latency.record(latency)
+                    if first_token is not None:
+                        stage.ttft.record(first_token)
+                else:
+                    name = type(error).__name__
+                    stage.errors[name] = stage.errors.get(name, 0) + 1
+            if isinstance(error, FATAL_ERRORS):
+                # Every further request would fail the same way
+                self.fatal_error = error
+                self._stop.set()
+
+    def _finish_stage(self, stage: LoadStage):
+        best = max((previous.throughput for previous in self.results if not previous.saturated), default=None)
+        stage.saturated = stage.error_rate > self.max_error_rate or (
+            best is not None and stage.throughput < best * (1 + self.min_gain)
+        )
+        self.results.append(stage)
+
+    @property
+    def saturation_point(self) -> Optional[LoadStage]:
+        """Best stage before the first saturated one, or None if the first stage saturated"""
+        best = None
+        for stage in self.results:
+            if stage.saturated:
+                break
+            best = stage
+        return best
+
+    @property
+    def saturated(self) -> bool:
+        """Whether any stage saturated (if not, the endpoint may sustain more)"""
+        return any(stage.saturated for stage in self.results)
+
+    def to_dict(self) -> Dict[str, Any]:
+        point = self.saturation_point
+        return {
+            "model": self.model,
+            "stream": self.stream,
+            "stage_duration": self.stage_duration,
+            "stages": [stage.to_dict() for stage in self.results],
+            "saturated": self.saturated,
+            "saturation_concurrency": point.concurrency if point is not None else None,
+            "saturation_throughput": point.throughput if point is not None else None,
+            "fatal_error": repr(self.fatal_error) if self.fatal_error is not None else None,
+        }
+
+    def report(self) -> str:
+        """The stage table with error breakdown and the saturation verdict"""
+        lines = [
+            f"{'conc':>5}{'req/s':>9}{'tok/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}"
+            f"{'ttft p50':>10}{'ttft p95':>10}{'errors':>8}"
+        ]
+        for stage in self.results:
+            ttft = stage.ttft
+            lines.append(
+                f"{stage.concurrency:>5}{stage.throughput:>9.2f}{stage.tokens_per_second:>9.0f}"
+                f"{_seconds(stage.latency.percentile(50)):>9}{_seconds(stage.latency.percentile(95)):>9}"
+                f"{_seconds(stage.latency.percentile(99)):>9}"
+                f"{_seconds(ttft.percentile(50)) if ttft.count else '-':>10}"
+                f"{_seconds(ttft.percentile(95)) if ttft.count else '-':>10}"
+                f"{stage.error_rate:>8.1%}{'  saturated' if stage.saturated else ''}"
+            )
+            if stage.errors:
+                lines.append("      errors: " + ", ".join(
+                    f"{name}={count}" for name, count in sorted(stage.errors.items(), key=lambda item: -item[1])
+                ))
+
+        point = self.saturation_point
+        if self.fatal_error is not None:
+            lines.append(f"Stopped early: {type(self.fatal_error).__name__}: {self.fatal_error}")
+        if not self.saturated:
+            if self.results:
+                last = self.results[-1]
+                lines.append(
+                    f"No saturation up to concurrency {last.concurrency} "
+                    f"({last.throughput:.2f} req/s); add higher stages to find the limit"
+                )
+        elif point is None:
+            lines.append("Saturated at the first stage; start with lower concurrency")
+        else:
+            lines.append(
+                f"Saturation point: concurrency {point.concurrency} "
+                f"({point.throughput:.2f} req/s, p95 {_seconds(point.latency.percentile(95))})"
+            )
+        return "\n".join(lines)
+
+
+def _seconds(value: float) -> str:
+    return f"{value * 1e3:.0f}ms" if value < 1 else f"{value:.2f}s"
@@ -0,0 +1,121 @@
+"""
+SVECTOR Logging
+
+The SDK logs through the standard ``logging`` module under the "svector"
+logger, which has only a NullHandler until configured. Call
+``enable_logging()`` or set ``SVECTOR_LOG=debug`` (``info``, ``warning``) to
+see request events; ``SVECTOR_LOG_SAMPLE=0.05`` keeps 5% of requests and
+``SVECTOR_LOG_FORMAT=json`` emits one JSON object per line.
+
+Records carry structured fields as ``svector_*`` attributes, including
+``svector_event`` and ``svector_request_id``.
+"""
+
+import json
+import logging
+import os
+import random
+import zlib
+from typing import Any, Dict, Optional, Union
+
+logger = logging.getLogger("svector")
+logger.addHandler(logging.NullHandler())
+
+FIELD_PREFIX = "svector_"
+
+
+def new_request_id() -> str:
+    """Short client-side id correlating the log lines of one request"""
+    return os.urandom(6).hex()
+
+
+def log_fields(event: str, request_id: Optional[str], **fields: Any) -> Dict[str, Any]:
+    """``extra`` mapping for a structured log record"""
+    extra = {FIELD_PREFIX + key: value for key, value in fields.items()}
+    extra[FIELD_PREFIX + "event"] = event
+    extra[FIELD_PREFIX + "request_id"] = request_id
+    return extra
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of requests' log records under load
+
+    Sampling is decided per request id, so a kept request keeps all its lines.
+    Records at ``always_level`` or above always pass.
+    """
+
+    def __init__(self, rate: float, always_level: int = logging.WARNING):
+        super().__init__()
+        self.rate = rate
+        self.always_level = always_level
+        self._threshold = int(rate * 2 ** 32)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.always_level or self.rate >= 1:
+            return True
+        request_id = getattr(record, FIELD_PREFIX + "request_id", None)
+        if request_id is None:
+            return random.random() < self.rate
+        return zlib.crc32(request_id.encode()) < self._threshold
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record with the ``svector_*`` fields unprefixed"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key.startswith(FIELD_PREFIX):
+                payload[key[len(FIELD_PREFIX):]] = value
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+def enable_logging(
+    level: Union[int, str] = logging.DEBUG,
+    sample_rate: float = 1.0,
+    json_format: bool = False,
+    handler: Optional[logging.Handler] = None
+) -> logging.Handler:
+    """
+    Send SDK logs to stderr (or ``handler``)
+
+    Args:
+        level: Minimum level for the "svector" logger
+        sample_rate: Fraction of requests whose DEBUG/INFO records are kept
+        json_format: Emit JSON lines instead of plain text
+        handler: Handler to attach instead of a stderr StreamHandler
+
+    Returns:
+        The attached handler, e.g. for ``logging.getLogger("svector").removeHandler``
+    """
+    handler = handler or logging.StreamHandler()
+    if json_format:
+        handler.setFormatter(JSONFormatter())
+    elif handler.formatter is None:
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    if sample_rate < 1:
+        handler.addFilter(SamplingFilter(sample_rate))
+    logger.addHandler(handler)
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+    return handler
+
+
+def _configure_from_env():
+    level = os.environ.get("SVECTOR_LOG")
+    if level:
+        enable_logging(
+            level,
+            sample_rate=float(os.environ.get("SVECTOR_LOG_SAMPLE", "1")),
+            json_format=os.environ.get("SVECTOR_LOG_FORMAT", "").lower() == "json"
+        )
+
+
+_configure_from_env()
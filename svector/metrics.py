@@ -0,0 +1,343 @@
+"""
+SVECTOR Metrics
+
+In-process counters and log-linear latency histograms, labelled by model and
+endpoint, exportable as a dict or Prometheus text and mergeable across
+processes.
+"""
+
+import json
+import math
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from .hooks import RequestHooks, RequestTiming
+
+# Linear sub-buckets per power of two; bounds the relative error to about 1.5%
+SUB_BUCKETS = 32
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram with bounded relative error
+
+    Values are bucketed by power of two and then linearly within each octave,
+    so recording is O(1), memory grows with the dynamic range rather than the
+    number of samples, and two histograms merge by adding bucket counts.
+
+    Args:
+        resolution: Smallest distinguishable value (default 1 microsecond when
+            recording seconds); smaller values share the lowest bucket
+    """
+
+    def __init__(self, resolution: float = 1e-6):
+        self.resolution = resolution
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def _index(self, value: float) -> int:
+        scaled = value / self.resolution
+        if scaled < 1:
+            return 0
+        mantissa, exponent = math.frexp(scaled)
+        return exponent * SUB_BUCKETS + int((mantissa - 0.5) * 2 * SUB_BUCKETS)
+
+    def _value(self, index: int) -> float:
+        if index == 0:
+            return 0.0
+        exponent, sub = divmod(index, SUB_BUCKETS)
+        # Midpoint of the bucket
+        return math.ldexp(0.5 + (sub + 0.5) / (2 * SUB_BUCKETS), exponent) * self.resolution
+
+    def record(self, value: float, count: int = 1):
+        """Add ``count`` observations of ``value``"""
+        index = self._index(value)
+        self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += count
+        self.sum += value * count
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, percentile: float) -> float:
+        """Value at ``percentile`` (0-100), within the histogram's relative error"""
+        if not self.count:
+            return 0.0
+        target = max(1, math.ceil(percentile / 100 * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= target:
+                return min(max(self._value(index), self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def merge(self, other: "LatencyHistogram"):
+        """Add another histogram's observations into this one"""
+        if other.resolution != self.resolution:
+            raise ValueError("Cannot merge histograms with different resolutions")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.sum += other.sum
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "resolution": self.resolution,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "buckets": {str(index): count for index, count in self.buckets.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        histogram = cls(data.get("resolution", 1e-6))
+        histogram.buckets = {int(index): count for index, count in data.get("buckets", {}).items()}
+        histogram.count = data.get("count", 0)
+        histogram.sum = data.get("sum", 0.0)
+        histogram.min = data.get("min")
+        histogram.max = data.get("max")
+        return histogram
+
+    def __repr__(self):
+        return (
+            f"LatencyHistogram(count={self.count}, p50={self.percentile(50):.4f}, "
+            f"p99={self.percentile(99):.4f})"
+        )
+
+
+def _label_key(labels: Optional[Dict[str, Any]]) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in (labels or {}).items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class MetricsRegistry:
+    """
+    Thread-safe registry of labelled counters and latency histograms
+
+    Pass ``metrics=True`` (or a registry to share) to ``SVECTOR`` or
+    ``AsyncSVECTOR`` to record every request automatically:
+
+    Counters:
+        requests_total: attempts by model, endpoint and status ("error" when no response)
+        retries_total: attempts that were retried
+        errors_total: requests that failed for good, by error type
+        rate_limited_total: attempts answered with HTTP 429
+        request_bytes_total / response_bytes_total: payload sizes
+        request_bytes_saved_total: bytes saved by request compression
+        image_bytes_saved_total: bytes saved by vision image preprocessing
+        output_tokens_total: generated tokens reported by the API or counted in streams
+
+    Histograms (seconds):
+        request_duration_seconds, time_to_first_byte_seconds,
+        time_to_first_token_seconds, queue_seconds
+
+    Example:
+        client = SVECTOR(metrics=True)
+        ...
+        print(client.metrics.histogram("request_duration_seconds", model="spec-3-turbo").percentile(99))
+        print(client.metrics.to_prometheus())
+
+        # Combine worker processes
+        total = MetricsRegistry()
+        for snapshot in worker_snapshots:
+            total.merge(snapshot)
+    """
+
+    def __init__(self, prefix: str = "svector"):
+        self.prefix = prefix
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, LatencyHistogram]] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1, **labels):
+        """Add ``value`` to a counter"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        """Record a value into a histogram"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = LatencyHistogram()
+            histogram.record(value)
+
+    def counter(self, name: str, **labels) -> float:
+        """Counter value summed over all series matching ``labels``"""
+        wanted = set(_label_key(labels))
+        with self._lock:
+            return sum(
+                value for key, value in self._counters.get(name, {}).items()
+                if wanted.issubset(key)
+            )
+
+    def histogram(self, name: str, **labels) -> LatencyHistogram:
+        """Merged histogram over all series matching ``labels``"""
+        wanted = set(_label_key(labels))
+        merged = LatencyHistogram()
+        with self._lock:
+            for key, histogram in self._histograms.get(name, {}).items():
+                if wanted.issubset(key):
+                    merged.merge(histogram)
+        return merged
+
+    def reset(self):
+        """Drop all recorded data"""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable snapshot, suitable for ``merge`` in another process"""
+        with self._lock:
+            return {
+                "counters": {
+                    name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                    for name, series in self._counters.items()
+                },
+                "histograms": {
+                    name: [{"labels": dict(key), **histogram.to_dict()} for key, histogram in series.items()]
+                    for name, series in self._histograms.items()
+                },
+            }
+
+    def merge(self, other: Union["MetricsRegistry", Dict[str, Any], str]):
+        """
+        Add another registry's data into this one
+
+        Args:
+            other: A MetricsRegistry, a ``to_dict()`` snapshot or its JSON text
+        """
+        if isinstance(other, MetricsRegistry):
+            other = other.to_dict()
+        elif isinstance(other, str):
+            other = json.loads(other)
+
+        with self._lock:
+            for name, series in other.get("counters", {}).items():
+                target = self._counters.setdefault(name, {})
+                for entry in series:
+                    key = _label_key(entry["labels"])
+                    target[key] = target.get(key, 0) + entry["value"]
+            for name, series in other.get("histograms", {}).items():
+                target_histograms = self._histograms.setdefault(name, {})
+                for entry in series:
+                    key = _label_key(entry["labels"])
+                    incoming = LatencyHistogram.from_dict(entry)
+                    if key in target_histograms:
+                        target_histograms[key].merge(incoming)
+                    else:
+                        target_histograms[key] = incoming
+
+    def to_prometheus(self, quantiles: Iterable[float] = (0.5, 0.9, 0.95, 0.99)) -> str:
+        """Prometheus text exposition format; histograms are exported as summaries"""
+        lines = []
+        with self._lock:
+            for name in sorted(self._counters):
+                metric = f"{self.prefix}_{name}"
+                lines.append(f"# TYPE {metric} counter")
+                for key, value in sorted(self._counters[name].items()):
+                    lines.append(f"{metric}{_format_labels(key)} {value:g}")
+            for name in sorted(self._histograms):
+                metric = f"{self.prefix}_{name}"
+                lines.append(f"# TYPE {metric} summary")
+                for key, histogram in sorted(self._histograms[name].items()):
+                    for quantile in quantiles:
+                        labels = _format_labels(key, ("quantile", f"{quantile:g}"))
+                        lines.append(f"{metric}{labels} {histogram.percentile(quantile * 100):.6g}")
+                    lines.append(f"{metric}_sum{_format_labels(key)} {histogram.sum:.6g}")
+                    lines.append(f"{metric}_count{_format_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def attach(self, hooks: RequestHooks):
+        """Record every request reported through ``hooks``"""
+        hooks.on("after_response", self._on_response)
+        hooks.on("on_retry", self._on_retry)
+        hooks.on("on_error", self._on_error)
+        hooks.on("on_stream_end", self._on_stream_end)
+
+    def _on_response(self, timing: RequestTiming):
+        labels = _request_labels(timing)
+        self._record_attempt(timing, labels, str(timing.status_code))
+        if timing.ttfb is not None:
+            self.observe("time_to_first_byte_seconds", timing.ttfb, **labels)
+        if timing.total is not None:
+            # Streams are finished by _on_stream_end
+            self._record_completion(timing, labels)
+
+    def _on_stream_end(self, timing: RequestTiming):
+        labels = _request_labels(timing)
+        if timing.ttft is not None:
+            self.observe("time_to_first_token_seconds", timing.ttft, **labels)
+        self._record_completion(timing, labels)
+
+    def _on_retry(self, timing: RequestTiming):
+        labels = _request_labels(timing)
+        self._record_attempt(timing, labels, _error_status(timing))
+        self.increment("retries_total", **labels)
+
+    def _on_error(self, timing: RequestTiming):
+        labels = _request_labels(timing)
+        self._record_attempt(timing, labels, _error_status(timing))
+        self.increment("errors_total", error=type(timing.error).__name__, **labels)
+
+    def _record_attempt(self, timing: RequestTiming, labels: Dict[str, str], status: str):
+        self.increment("requests_total", status=status, **labels)
+        if status == "429":
+            self.increment("rate_limited_total", **labels)
+        if timing.queue_time is not None:
+            self.observe("queue_seconds", timing.queue_time, **labels)
+        if timing.request_bytes:
+            self.increment("request_bytes_total", timing.request_bytes, **labels)
+            if timing.uncompressed_bytes:
+                self.increment("request_bytes_saved_total", timing.uncompressed_bytes - timing.request_bytes, **labels)
+
+    def _record_completion(self, timing: RequestTiming, labels: Dict[str, str]):
+        self.observe("request_duration_seconds", timing.total, **labels)
+        if timing.response_bytes:
+            self.increment("response_bytes_total", timing.response_bytes, **labels)
+        if timing.output_tokens:
+            self.increment("output_tokens_total", timing.output_tokens, **labels)
+
+
+def _request_labels(timing: RequestTiming) -> Dict[str, str]:
+    return {"model": timing.model or "", "endpoint": urlsplit(timing.url).path}
+
+
+def _error_status(timing: RequestTiming) -> str:
+    status = timing.status_code or getattr(timing.error, "status_code", None)
+    return str(status) if status else "error"
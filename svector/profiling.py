@@ -0,0 +1,220 @@
+"""
+SVECTOR Overhead Profiling
+
+Attributes wall-clock and CPU time to the phases of a request, separating
+what the SDK costs on the client from time spent waiting on the network.
+"""
+
+import contextlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Union
+
+from .metrics import LatencyHistogram
+
+# Phases whose wall time not spent on CPU is network and server time
+NETWORK_PHASES = ("transport", "stream_read")
+
+_NO_PHASE = contextlib.nullcontext()
+
+
+class _Phase:
+    __slots__ = ("profiler", "name", "cpu", "_wall_start", "_cpu_start")
+
+    def __init__(self, profiler: "OverheadProfiler", name: str, cpu: bool):
+        self.profiler = profiler
+        self.name = name
+        self.cpu = cpu
+
+    def __enter__(self):
+        self._cpu_start = time.thread_time() if self.cpu else None
+        self._wall_start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        wall = time.perf_counter() - self._wall_start
+        cpu = time.thread_time() - self._cpu_start if self._cpu_start is not None else None
+        self.profiler.record(self.name, wall, cpu)
+        return False
+
+
+def profile_phase(profiler: Optional["OverheadProfiler"], name: str, cpu: bool = True):
+    """
+    Time a block as ``name`` when profiling is on; a shared no-op context otherwise
+
+    Pass ``cpu=False`` for blocks that await, where the thread's CPU time also
+    covers other tasks.
+    """
+    if profiler is None:
+        return _NO_PHASE
+    return _Phase(profiler, name, cpu)
+
+
+def profile_call(profiler: Optional["OverheadProfiler"], name: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """``fn(*args, **kwargs)`` timed as ``name`` when profiling is on"""
+    with profile_phase(profiler, name):
+        return fn(*args, **kwargs)
+
+
+class _PhaseStats:
+    __slots__ = ("wall", "cpu", "cpu_calls")
+
+    def __init__(self):
+        self.wall = LatencyHistogram()
+        self.cpu = 0.0
+        self.cpu_calls = 0
+
+
+class OverheadProfiler:
+    """
+    Per-phase wall and CPU time of the requests made while profiling
+
+    Phases (they never overlap, so their totals add up):
+        build_messages: ``conversations`` turning instructions/input/context into messages
+        prepare: copying and merging headers in ``request``
+        queued: waiting for scheduler, rate and concurrency slots
+        transport: the HTTP call up to the response headers (or full body
+            when not streaming); its CPU time is client-side work such as JSON
+            encoding and HTTP framing, the rest is network and server time
+        decode: parsing JSON responses and stream events
+        stream_read: waiting for streamed lines
+        wrap_response: building ConversationResponse / ConversationStreamEvent objects
+        backoff: sleeping between retries
+
+    CPU time is per thread, so it is exact for blocking calls and thread
+    pools. Awaited phases of the async client record wall time only, and with
+    ``async_engine=True`` transport CPU spent on the engine's loop thread is
+    not attributed.
+
+    Example:
+        with client.profile() as profiler:
+            client.conversations.create_many(requests, concurrency=8)
+        print(profiler.report())
+    """
+
+    def __init__(self):
+        self._phases: Dict[str, _PhaseStats] = {}
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._stopped: Optional[float] = None
+
+    def record(self, name: str, wall: float, cpu: Optional[float] = None):
+        """Add one timed occurrence of phase ``name``"""
+        with self._lock:
+            stats = self._phases.get(name)
+            if stats is None:
+                stats = self._phases[name] = _PhaseStats()
+            stats.wall.record(wall)
+            if cpu is not None:
+                stats.cpu += cpu
+                stats.cpu_calls += 1
+
+    def iterate(self, name: str, iterable: Iterable) -> Iterator:
+        """Yield from ``iterable``, timing each wait for the next item as ``name``"""
+        iterator = iter(iterable)
+        while True:
+            with _Phase(self, name, cpu=True):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def stop(self):
+        """Freeze the elapsed time reported by ``elapsed``"""
+        if self._stopped is None:
+            self._stopped = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        """Wall time the profiler has been (or was) running"""
+        return (self._stopped or time.perf_counter()) - self._started
+
+    @property
+    def requests(self) -> int:
+        """HTTP attempts made while profiling"""
+        with self._lock:
+            stats = self._phases.get("transport")
+            return stats.wall.count if stats is not None else 0
+
+    @property
+    def client_cpu(self) -> float:
+        """CPU seconds spent by the SDK in all phases"""
+        with self._lock:
+            return sum(stats.cpu for stats in self._phases.values())
+
+    @property
+    def network_time(self) -> float:
+        """Wall seconds spent waiting in transport and stream reads, minus their CPU time"""
+        with self._lock:
+            return sum(
+                stats.wall.sum - stats.cpu
+                for name, stats in self._phases.items() if name in NETWORK_PHASES
+            )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable summary, e.g. for tracking regressions between releases"""
+        requests = self.requests
+        client_cpu = self.client_cpu
+        with self._lock:
+            phases = {
+                name: {
+                    "calls": stats.wall.count,
+                    "wall": stats.wall.sum,
+                    "wall_mean": stats.wall.mean,
+                    "wall_p50": stats.wall.percentile(50),
+                    "wall_p99": stats.wall.percentile(99),
+                    "cpu": stats.cpu if stats.cpu_calls else None,
+                    "cpu_mean": stats.cpu / stats.cpu_calls if stats.cpu_calls else None,
+                }
+                for name, stats in self._phases.items()
+            }
+        return {
+            "elapsed": self.elapsed,
+            "requests": requests,
+            "client_cpu": client_cpu,
+            "client_cpu_per_request": client_cpu / requests if requests else None,
+            "network_time": self.network_time,
+            "phases": phases,
+        }
+
+    def save(self, path: Union[str, Path]):
+        """Write ``to_dict()`` as JSON"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def report(self) -> str:
+        """Human-readable table of the phases, slowest first"""
+        summary = self.to_dict()
+        lines = [
+            f"{'phase':<16}{'calls':>8}{'wall total':>13}{'wall mean':>12}{'wall p99':>12}{'cpu total':>13}{'cpu mean':>12}"
+        ]
+        for name, phase in sorted(summary["phases"].items(), key=lambda item: -item[1]["wall"]):
+            lines.append(
+                f"{name:<16}{phase['calls']:>8}{_duration(phase['wall']):>13}{_duration(phase['wall_mean']):>12}"
+                f"{_duration(phase['wall_p99']):>12}{_duration(phase['cpu']):>13}{_duration(phase['cpu_mean']):>12}"
+            )
+        lines.append("")
+        lines.append(f"requests: {summary['requests']} in {_duration(summary['elapsed'])}")
+        per_request = summary["client_cpu_per_request"]
+        lines.append(
+            f"client CPU: {_duration(summary['client_cpu'])}"
+            + (f" ({_duration(per_request)} per request)" if per_request is not None else "")
+        )
+        lines.append(f"network and server: {_duration(summary['network_time'])}")
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return f"OverheadProfiler(requests={self.requests}, client_cpu={self.client_cpu:.4f}s)"
+
+
+def _duration(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    if seconds >= 1:
+        return f"{seconds:.2f}s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds * 1e6:.1f}us"
@@ -0,0 +1,221 @@
+"""
+SVECTOR Request Timelines
+
+Records request phases as Chrome trace-event JSON, which loads directly into
+Perfetto (https://ui.perfetto.dev) or chrome://tracing.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from .hooks import RequestHooks, RequestTiming
+
+# Async tasks share a thread, so each one in flight is drawn on its own lane
+ASYNC_LANE_BASE = 1_000_000
+
+
+class TimelineRecorder:
+    """
+    Collects per-attempt request phases as trace events
+
+    Phases: ``queued`` (waiting for scheduler/limiter slots), ``dns`` and
+    ``connect`` (aiohttp only), ``sending``, ``waiting`` (until the first
+    byte), ``receiving`` or ``streaming``, and ``backoff`` between attempts.
+    Blocking calls are drawn on their thread's track, so thread pools show
+    per-worker concurrency and idle gaps; async requests get one lane per
+    in-flight task.
+
+    Example:
+        with client.record_timeline("batch.trace.json"):
+            client.conversations.create_many(requests, concurrency=16)
+        # open batch.trace.json in https://ui.perfetto.dev
+    """
+
+    def __init__(self, max_events: int = 1_000_000):
+        self.max_events = max_events
+        self.dropped = 0
+        self._events: List[Dict[str, Any]] = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._named: Dict[int, str] = {}
+        self._lanes: Dict[int, int] = {}
+        self._free_lanes: List[int] = []
+        self._next_lane = 0
+        self._backoff: Dict[int, Tuple[float, int]] = {}
+        self._hooks: Optional[RequestHooks] = None
+
+    # Registration
+
+    def attach(self, hooks: RequestHooks):
+        """Start recording requests reported through ``hooks``"""
+        self._hooks = hooks
+        for event, callback in self._callbacks():
+            hooks.on(event, callback)
+
+    def detach(self):
+        """Stop recording"""
+        if self._hooks is not None:
+            for event, callback in self._callbacks():
+                self._hooks.remove(event, callback)
+            self._hooks = None
+
+    def _callbacks(self):
+        return (
+            ("before_request", self._on_before_request),
+            ("after_response", self._on_response),
+            ("on_stream_end", self._on_stream_end),
+            ("on_retry", self._on_retry),
+            ("on_error", self._on_error),
+        )
+
+    # Output
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Chrome trace-event document"""
+        with self._lock:
+            events = list(self._events)
+            metadata = [
+                {"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid, "args": {"name": name}}
+                for tid, name in self._named.items()
+            ]
+        metadata.append({"name": "process_name", "ph": "M", "pid": self._pid, "tid": 0, "args": {"name": "svector"}})
+        return {"traceEvents": metadata + events, "displayTimeUnit": "ms"}
+
+    def save(self, path: Union[str, Path]):
+        """Write the trace as JSON"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+
+    # Tracks
+
+    def _actor(self) -> Tuple[int, bool]:
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        if task is not None:
+            return id(task), True
+        return threading.get_ident(), False
+
+    def _track(self, actor: int, is_task: bool) -> int:
+        if not is_task:
+            if actor not in self._named:
+                self._named[actor] = threading.current_thread().name
+            return actor
+        lane = self._lanes.get(actor)
+        if lane is None:
+            lane = self._free_lanes.pop() if self._free_lanes else self._new_lane()
+            self._lanes[actor] = lane
+        return lane
+
+    def _new_lane(self) -> int:
+        lane = ASYNC_LANE_BASE + self._next_lane
+        self._next_lane += 1
+        self._named[lane] = f"async request {self._next_lane}"
+        return lane
+
+    def _release(self, actor: int):
+        lane = self._lanes.pop(actor, None)
+        if lane is not None:
+            self._free_lanes.append(lane)
+
+    # Events
+
+    def _us(self, timestamp: float) -> float:
+        return round((timestamp - self._origin) * 1e6, 3)
+
+    def _slice(self, name: str, start: Optional[float], end: Optional[float], tid: int, category: str = "phase",
+               args: Optional[Dict[str, Any]] = None):
+        if start is None or end is None or end < start:
+            return
+        if len(self._events) >= self.max_events:
+            self.dropped += 1
+            return
+        event = {
+            "name": name, "cat": category, "ph": "X", "pid": self._pid, "tid": tid,
+            "ts": self._us(start), "dur": self._us(end) - self._us(start),
+        }
+        if args:
+            event["args"] = args
+        self._events.append(event)
+
+    def _on_before_request(self, timing: RequestTiming):
+        actor, is_task = self._actor()
+        with self._lock:
+            tid = self._track(actor, is_task)
+            pending = self._backoff.pop(actor, None)
+            if pending is not None and timing.attempt:
+                self._slice("backoff", pending[0], timing.started, tid)
+
+    def _on_response(self, timing: RequestTiming):
+        if timing.total is not None:
+            self._record(timing, final=True)
+
+    def _on_stream_end(self, timing: RequestTiming):
+        self._record(timing, final=True)
+
+    def _on_retry(self, timing: RequestTiming):
+        self._record(timing, final=False)
+
+    def _on_error(self, timing: RequestTiming):
+        self._record(timing, final=True)
+
+    def _record(self, timing: RequestTiming, final: bool):
+        end = time.perf_counter()
+        actor, is_task = self._actor()
+        started = timing.started
+        sent = timing._sent
+        first_byte = started + timing.ttfb if timing.ttfb is not None else None
+        stream = timing.stream_chunks > 0
+
+        args = {
+            "url": timing.url,
+            "attempt": timing.attempt,
+            "status": timing.status_code,
+            "request_bytes": timing.request_bytes,
+            "response_bytes": timing.response_bytes,
+        }
+        if timing.model:
+            args["model"] = timing.model
+        if timing.error is not None:
+            args["error"] = repr(timing.error)
+
+        with self._lock:
+            tid = self._track(actor, is_task)
+            path = urlsplit(timing.url).path
+            self._slice(f"{timing.method} {path}", started, end, tid, category="request", args=args)
+            self._slice("queued", started, sent, tid)
+
+            connected = sent
+            if timing._dns_started is not None and timing.dns is not None:
+                self._slice("dns", timing._dns_started, timing._dns_started + timing.dns, tid)
+            if timing._connect_started is not None and timing.connect is not None:
+                connected = timing._connect_started + timing.connect
+                self._slice("connect", timing._connect_started, connected, tid)
+
+            response_start = first_byte if first_byte is not None else end
+            if timing._request_sent is not None:
+                self._slice("sending", connected, timing._request_sent, tid)
+                self._slice("waiting", timing._request_sent, response_start, tid)
+            else:
+                self._slice("waiting", connected, response_start, tid)
+
+            if first_byte is not None:
+                self._slice("streaming" if stream else "receiving", first_byte, end, tid)
+            if timing.ttft is not None and len(self._events) < self.max_events:
+                self._events.append({
+                    "name": "first token", "cat": "phase", "ph": "i", "s": "t", "pid": self._pid,
+                    "tid": tid, "ts": self._us(started + timing.ttft),
+                })
+
+            if final:
+                self._release(actor)
+            else:
+                self._backoff[actor] = (end, tid)
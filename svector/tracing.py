@@ -0,0 +1,279 @@
+"""
+SVECTOR OpenTelemetry Tracing
+
+Optional spans for SDK operations and the HTTP attempts they make. Requires the
+``opentelemetry-api`` package (``pip install svector-sdk[otel]``); clients that
+do not enable tracing are not instrumented at all.
+"""
+
+import contextlib
+import contextvars
+import functools
+import inspect
+from typing import Any, Dict, Iterable, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .hooks import RequestHooks, RequestTiming
+
+try:
+    from opentelemetry import trace as otel_trace
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+except ImportError:  # optional dependency
+    otel_trace = None
+
+# (API attribute, method names); "*" instruments every public method
+OPERATIONS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("chat", ("create", "create_stream")),
+    ("conversations", ("create", "create_stream")),
+    ("vision", ("*",)),
+    ("responses", ("create",)),
+    ("files", ("create",)),
+)
+
+# Set while an operation span is current, so instrumented methods that call
+# each other (``chat.create_stream`` -> ``chat.create``) produce one span
+_in_operation: "contextvars.ContextVar[bool]" = contextvars.ContextVar(
+    "svector_in_operation", default=False
+)
+
+
+def _usage_attributes(result: Any) -> Dict[str, int]:
+    usage = result.get("usage") if isinstance(result, dict) else getattr(result, "usage", None)
+    if not isinstance(usage, dict):
+        return {}
+    attributes = {}
+    input_tokens = usage.get("prompt_tokens", usage.get("input_tokens"))
+    output_tokens = usage.get("completion_tokens", usage.get("output_tokens"))
+    if input_tokens is not None:
+        attributes["gen_ai.usage.input_tokens"] = input_tokens
+    if output_tokens is not None:
+        attributes["gen_ai.usage.output_tokens"] = output_tokens
+    return attributes
+
+
+class OpenTelemetryTracing:
+    """
+    OpenTelemetry instrumentation for a client
+
+    Each instrumented call (``chat.create``, ``conversations.create[_stream]``,
+    ``vision.*``, ``responses.create``, ``files.create``) gets an internal span
+    named after the operation. Every HTTP attempt gets a child client span.
+    Streaming calls keep their span open until the stream is consumed.
+
+    Span attributes include the model, token usage, HTTP status, retry count,
+    time to first byte and, for streams, time to first token.
+
+    Example:
+        client = SVECTOR(tracing=True)            # global tracer provider
+        client = SVECTOR(tracing=OpenTelemetryTracing(tracer_provider=provider))
+    """
+
+    def __init__(self, tracer_provider: Any = None, tracer_name: str = "svector"):
+        if otel_trace is None:
+            raise ImportError(
+                "OpenTelemetry tracing requires the opentelemetry-api package. "
+                "Install it with: pip install svector-sdk[otel]"
+            )
+        self.tracer = otel_trace.get_tracer(tracer_name, tracer_provider=tracer_provider)
+
+    def instrument(self, client: Any):
+        """Wrap the client's API methods with spans and trace its HTTP attempts"""
+        self.attach(client.hooks)
+        for api_name, methods in OPERATIONS:
+            api = getattr(client, api_name, None)
+            if api is None:
+                continue
+            if methods == ("*",):
+                methods = tuple(
+                    name for name, member in inspect.getmembers(type(api), inspect.isfunction)
+                    if not name.startswith("_")
+                )
+            for method in methods:
+                fn = getattr(api, method, None)
+                if fn is not None:
+                    # Instance attribute shadows the class method
+                    setattr(api, method, self._wrap(f"{api_name}.{method}", fn))
+
+    def attach(self, hooks: RequestHooks):
+        """Create a client span for every HTTP attempt reported through ``hooks``"""
+        hooks.on("before_request", self._on_before_request)
+        hooks.on("after_response", self._on_response)
+        hooks.on("on_stream_first_chunk", self._on_first_chunk)
+        hooks.on("on_stream_end", self._on_stream_end)
+        hooks.on("on_retry", self._on_failure)
+        hooks.on("on_error", self._on_failure)
+
+    # Operation spans
+
+    def _wrap(self, name: str, fn):
+        span_name = f"svector.{name}"
+
+        if inspect.isasyncgenfunction(fn):
+            @functools.wraps(fn)
+            async def async_stream_wrapper(*args, **kwargs):
+                if _in_operation.get():
+                    async for item in fn(*args, **kwargs):
+                        yield item
+                    return
+                span = self._start_operation(span_name, kwargs)
+                stream = fn(*args, **kwargs)
+                try:
+                    while True:
+                        with self._operation(span):
+                            try:
+                                item = await stream.__anext__()
+                            except StopAsyncIteration:
+                                break
+                        yield item
+                except BaseException as e:
+                    if not isinstance(e, GeneratorExit):
+                        self._fail(span, e)
+                    raise
+                finally:
+                    await stream.aclose()
+                    span.end()
+            return async_stream_wrapper
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                if _in_operation.get():
+                    return await fn(*args, **kwargs)
+                span = self._start_operation(span_name, kwargs)
+                try:
+                    with self._operation(span):
+                        result = await fn(*args, **kwargs)
+                except BaseException as e:
+                    self._fail(span, e)
+                    span.end()
+                    raise
+                span.set_attributes(_usage_attributes(result))
+                span.end()
+                return result
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _in_operation.get():
+                return fn(*args, **kwargs)
+            span = self._start_operation(span_name, kwargs)
+            try:
+                with self._operation(span):
+                    result = fn(*args, **kwargs)
+            except BaseException as e:
+                self._fail(span, e)
+                span.end()
+                raise
+            if inspect.isgenerator(result):
+                return self._iterate(span, result)
+            span.set_attributes(_usage_attributes(result))
+            span.end()
+            return result
+        return wrapper
+
+    def _iterate(self, span, stream: Iterable):
+        # The span is made current only while the stream produces an item, so
+        # the consumer's context is never changed across yields
+        try:
+            while True:
+                with self._operation(span):
+                    try:
+                        item = next(stream)
+                    except StopIteration:
+                        return
+                yield item
+        except BaseException as e:
+            if not isinstance(e, GeneratorExit):
+                self._fail(span, e)
+            raise
+        finally:
+            stream.close()
+            span.end()
+
+    def _start_operation(self, name: str, kwargs: Dict[str, Any]):
+        attributes = {"gen_ai.system": "svector", "svector.operation": name[len("svector."):]}
+        if isinstance(kwargs.get("model"), str):
+            attributes["gen_ai.request.model"] = kwargs["model"]
+        return self.tracer.start_span(name, kind=SpanKind.INTERNAL, attributes=attributes)
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _operation(span):
+        token = _in_operation.set(True)
+        try:
+            with otel_trace.use_span(
+                span, end_on_exit=False, record_exception=False, set_status_on_exception=False
+            ):
+                yield
+        finally:
+            _in_operation.reset(token)
+
+    @staticmethod
+    def _fail(span, error: BaseException):
+        span.record_exception(error)
+        span.set_status(Status(StatusCode.ERROR, str(error)))
+
+    # Attempt spans
+
+    def _on_before_request(self, timing: RequestTiming):
+        url = urlsplit(timing.url)
+        attributes = {
+            "http.request.method": timing.method,
+            "url.full": timing.url,
+            "server.address": url.hostname or "",
+            "svector.attempt": timing.attempt,
+        }
+        if timing.model:
+            attributes["gen_ai.request.model"] = timing.model
+        timing.span = self.tracer.start_span(
+            f"{timing.method} {url.path}", kind=SpanKind.CLIENT, attributes=attributes
+        )
+        if timing.attempt:
+            # The enclosing operation span reports how often it had to retry
+            otel_trace.get_current_span().set_attribute("svector.retry_count", timing.attempt)
+
+    def _on_response(self, timing: RequestTiming):
+        span = timing.span
+        if span is None:
+            return
+        span.set_attribute("http.response.status_code", timing.status_code or 0)
+        if timing.ttfb is not None:
+            span.set_attribute("svector.ttfb_ms", timing.ttfb * 1000)
+        if timing.request_bytes is not None:
+            span.set_attribute("http.request.body.size", timing.request_bytes)
+        if timing.total is not None:
+            self._finish(timing)
+
+    def _on_first_chunk(self, timing: RequestTiming):
+        if timing.span is None:
+            return
+        ttft = timing.ttft * 1000
+        timing.span.set_attribute("svector.ttft_ms", ttft)
+        otel_trace.get_current_span().set_attribute("svector.ttft_ms", ttft)
+
+    def _on_stream_end(self, timing: RequestTiming):
+        if timing.span is None:
+            return
+        if timing.error is not None:
+            self._fail(timing.span, timing.error)
+        self._finish(timing)
+
+    def _on_failure(self, timing: RequestTiming):
+        span = timing.span
+        if span is None:
+            return
+        status = timing.status_code or getattr(timing.error, "status_code", None)
+        if status:
+            span.set_attribute("http.response.status_code", status)
+        self._fail(span, timing.error)
+        span.end()
+        timing.span = None
+
+    def _finish(self, timing: RequestTiming):
+        span = timing.span
+        if timing.response_bytes is not None:
+            span.set_attribute("http.response.body.size", timing.response_bytes)
+        if timing.output_tokens:
+            span.set_attribute("gen_ai.usage.output_tokens", timing.output_tokens)
+        span.end()
+        timing.span = None
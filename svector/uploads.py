@@ -0,0 +1,185 @@
+"""
+SVECTOR Image Upload Reuse
+
+Content-addressed index of images uploaded for vision calls: each distinct
+image is uploaded once through the files API, and later calls with the same
+content reference it by ``file_id`` instead of re-sending it as base64.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Optional, Union
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+KEY_LOCK_STRIPES = 64
+
+
+def content_hash(image: Union[str, Path, bytes, bytearray, memoryview, BinaryIO]) -> str:
+    """SHA-256 of an image's bytes (path, bytes-like buffer or seekable binary file)"""
+    digest = hashlib.sha256()
+    if isinstance(image, (str, Path)):
+        with open(image, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    elif isinstance(image, (bytes, bytearray, memoryview)):
+        digest.update(image)
+    else:
+        start = image.tell()
+        for chunk in iter(lambda: image.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+        image.seek(start, os.SEEK_SET)
+    return digest.hexdigest()
+
+
+class UploadIndex:
+    """
+    Content hash -> file_id index for vision images
+
+    Pass ``image_uploads=True`` (in memory), a path (a SQLite file, so
+    uploads are reused across processes) or an instance to ``SVECTOR``. Every
+    ``vision.analyze*`` call made with ``image_file`` or ``image_base64`` then
+    hashes the image, uploads it with ``files.create`` the first time its
+    content is seen, and sends the ``file_id`` from then on. With
+    ``image_preprocessing`` the preprocessed image is uploaded, and the
+    preprocessing settings are part of the key. A remembered ``file_id`` the
+    API reports missing (HTTP 404/410, or a 400 naming it) is dropped and the
+    image uploaded again.
+
+    Any number of processes can share one file: each upload is a single row
+    write, and uploads older than ``max_age`` are deleted as new ones are
+    recorded.
+
+    Args:
+        path: SQLite file to keep the index in (default: in memory only)
+        purpose: Files API purpose for the uploads
+        max_age: Seconds an upload is reused for (match the API's file retention)
+        timeout: Seconds to wait for another process's write to finish
+
+    Example:
+        client = SVECTOR(image_uploads="~/.cache/svector/uploads.db")
+        for prompt in prompts:
+            client.vision.analyze(image_file="product.jpg", prompt=prompt)  # uploaded once
+        print(client.upload_index.stats())
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        purpose: str = "vision",
+        max_age: Optional[float] = None,
+        timeout: float = 30.0
+    ):
+        self.path = Path(path).expanduser() if path is not None else None
+        self.purpose = purpose
+        self.max_age = max_age
+        self.hits = 0
+        self.uploads = 0
+        self.bytes_uploaded = 0
+        self.bytes_reused = 0
+        # Striped, so memory stays fixed however many images are seen
+        self._key_locks = [threading.Lock() for _ in range(KEY_LOCK_STRIPES)]
+        self._lock = threading.Lock()
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.path) if self.path is not None else ":memory:",
+            timeout=timeout, isolation_level=None, check_same_thread=False
+        )
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS uploads (
+                key TEXT PRIMARY KEY,
+                file_id TEXT NOT NULL,
+                created REAL NOT NULL,
+                info TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS uploads_created ON uploads (created);
+            """
+        )
+        self._prune()
+
+    def lock(self, key: str) -> threading.Lock:
+        """Lock held while ``key`` is looked up and uploaded, so concurrent calls upload once"""
+        return self._key_locks[hash(key) % KEY_LOCK_STRIPES]
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """The upload recorded for ``key`` (by any process), or None if unknown or older than ``max_age``"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT file_id, created, info FROM uploads WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            entry = dict(json.loads(row[2]), file_id=row[0], created=row[1])
+            if self.max_age is not None and time.time() - entry["created"] > self.max_age:
+                self._conn.execute("DELETE FROM uploads WHERE key = ?", (key,))
+                return None
+            self.hits += 1
+            self.bytes_reused += entry.get("bytes", 0)
+            return entry
+
+    def put(self, key: str, file_id: str, **info: Any) -> Dict[str, Any]:
+        """Record an upload of ``key`` (``info`` is stored with it)"""
+        entry = dict(info, file_id=file_id, created=time.time())
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO uploads (key, file_id, created, info) VALUES (?, ?, ?, ?)",
+                (key, file_id, entry["created"], json.dumps(info))
+            )
+            self.uploads += 1
+            self.bytes_uploaded += entry.get("bytes", 0)
+        self._prune()
+        return entry
+
+    def forget(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM uploads WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM uploads")
+
+    def close(self):
+        """Close the index file"""
+        self._conn.close()
+
+    def _prune(self):
+        if self.max_age is None:
+            return
+        with self._lock:
+            self._conn.execute("DELETE FROM uploads WHERE created < ?", (time.time() - self.max_age,))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM uploads").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        entries = len(self)
+        with self._lock:
+            return {
+                "entries": entries,
+                "hits": self.hits,
+                "uploads": self.uploads,
+                "bytes_uploaded": self.bytes_uploaded,
+                "bytes_reused": self.bytes_reused,
+            }
+
+    def __repr__(self):
+        return f"UploadIndex(path={str(self.path) if self.path else None!r}, entries={len(self)})"
+
+
+def resolve_upload_index(uploads: Any) -> Optional[UploadIndex]:
+    """Normalize a client's ``image_uploads`` argument"""
+    if uploads is None or uploads is False:
+        return None
+    if isinstance(uploads, UploadIndex):
+        return uploads
+    if uploads is True:
+        return UploadIndex()
+    return UploadIndex(uploads)
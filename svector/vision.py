@@ -5,16 +5,37 @@ Provides image analysis capabilities using SVECTOR's vision models.
 Supports image URL, base64, and file ID inputs for comprehensive image understanding.
 """
 
+import asyncio
 import base64
+import concurrent.futures
 import json
+import logging
+import mimetypes
+import mmap
+import os
+import re
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import (Any, AsyncIterator, BinaryIO, Dict, Iterator, List,
+                    Optional, Tuple, Union)
 
 import requests
 
-from .errors import (APIConnectionTimeoutError, APIError, AuthenticationError,
-                     RateLimitError, SVECTORError)
+from .errors import (APIConnectionError, APIConnectionTimeoutError, APIError,
+                     AuthenticationError, NotFoundError, RateLimitError,
+                     SVECTORError)
+from .limits import estimate_tokens, settle_tokens
+from .log import log_fields, new_request_id
+from .cache import CachedImage, ImageCache
+from .profiling import profile_phase
+from .uploads import UploadIndex, content_hash
+
+logger = logging.getLogger(__name__)
+
+
+class _RetryableServerError(APIError):
+    """5xx response that ``_make_vision_request`` retries"""
+    pass
 
 
 class VisionResponse:
@@ -25,12 +46,128 @@ class VisionResponse:
         self.output_text = data.get("analysis", "")  # Alias for compatibility
         self.usage = data.get("usage", {})
         self.request_id = data.get("_request_id")
+        # What client-side image preprocessing changed, when it ran
+        self.preprocessing = data.get("preprocessing")
         self._raw_data = data
 
     def __str__(self):
         return self.analysis
 
 
+# Stand-in for the data URL inside a request body built by ImageRequestBody
+_IMAGE_PLACEHOLDER = "\x00svector-image\x00"
+
+# Raw bytes base64-encoded per body chunk; a multiple of 3 so chunks concatenate
+IMAGE_CHUNK_SIZE = 3 * 256 * 1024
+
+
+class ImageRequestBody:
+    """
+    JSON request body that base64-encodes an image while it is being sent
+
+    The image is never held as a base64 string or data URL: files are
+    memory-mapped and encoded one chunk at a time, so peak memory does not
+    grow with the image size. The body has a known length (sent as
+    Content-Length) and can be iterated again for retries. Works with
+    ``requests`` (sized iterable) and aiohttp (async iterable, encoded in the
+    event loop's executor).
+
+    Args:
+        request: Chat request whose image URL is ``_IMAGE_PLACEHOLDER``
+        image: Path, bytes-like buffer or seekable binary file
+        mime_type: Image MIME type for the data URL
+        chunk_size: Raw bytes encoded per chunk (rounded down to a multiple of 3)
+        encoded: ``image`` is a base64 string (e.g. from ``ImageCache``), sent in chunks as is
+    """
+
+    def __init__(
+        self,
+        request: Dict[str, Any],
+        image: Union[str, Path, bytes, bytearray, memoryview, BinaryIO],
+        mime_type: str = "image/jpeg",
+        chunk_size: int = IMAGE_CHUNK_SIZE,
+        encoded: bool = False
+    ):
+        prefix, suffix = json.dumps(request).split(json.dumps(_IMAGE_PLACEHOLDER))
+        self.prefix = f'{prefix}"data:{mime_type};base64,'.encode("utf-8")
+        self.suffix = f'"{suffix}'.encode("utf-8")
+        self.image = image
+        self.chunk_size = max(3, chunk_size - chunk_size % 3)
+        self.encoded = encoded
+        if encoded:
+            self.image_size = len(image)
+        elif isinstance(image, (str, Path)):
+            self.image_size = os.path.getsize(image)
+        elif isinstance(image, (bytes, bytearray, memoryview)):
+            self.image_size = memoryview(image).nbytes
+        else:
+            self._start = image.tell()
+            self.image_size = image.seek(0, os.SEEK_END) - self._start
+            image.seek(self._start)
+
+    def __len__(self) -> int:
+        encoded_size = self.image_size if self.encoded else 4 * ((self.image_size + 2) // 3)
+        return len(self.prefix) + encoded_size + len(self.suffix)
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield self.prefix
+        if self.encoded:
+            for offset in range(0, self.image_size, self.chunk_size):
+                yield self.image[offset:offset + self.chunk_size].encode("ascii")
+        else:
+            for chunk in self._image_chunks():
+                yield base64.b64encode(chunk)
+        yield self.suffix
+
+    async def _aiter(self) -> AsyncIterator[bytes]:
+        # Reads and base64 encoding run in the loop's executor, so other requests
+        # on the loop keep going while a large image is sent
+        loop = asyncio.get_running_loop()
+        chunks = iter(self)
+        try:
+            while True:
+                chunk = await loop.run_in_executor(None, next, chunks, None)
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            chunks.close()
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self._aiter()
+
+    def _image_chunks(self) -> Iterator[Union[bytes, memoryview]]:
+        image = self.image
+        if isinstance(image, (str, Path)):
+            if not self.image_size:
+                return
+            with open(image, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    for offset in range(0, len(view), self.chunk_size):
+                        with view[offset:offset + self.chunk_size] as chunk:
+                            yield chunk
+        elif isinstance(image, (bytes, bytearray, memoryview)):
+            view = memoryview(image).cast("B")
+            for offset in range(0, len(view), self.chunk_size):
+                yield view[offset:offset + self.chunk_size]
+        else:
+            image.seek(self._start)
+            remaining = self.image_size
+            while remaining > 0:
+                wanted = min(self.chunk_size, remaining)
+                chunk = image.read(wanted)
+                # Short reads would misalign the base64 groups
+                while chunk and len(chunk) < wanted:
+                    more = image.read(wanted - len(chunk))
+                    if not more:
+                        break
+                    chunk += more
+                if len(chunk) < wanted:
+                    raise ValueError("Image file ended before its reported size")
+                remaining -= wanted
+                yield chunk
+
+
 class VisionAPI:
     """
     Vision API for SVECTOR
@@ -51,10 +188,14 @@ class VisionAPI:
         self,
         chat_request: Dict[str, Any],
         timeout: Optional[int] = None,
-        max_retries: Optional[int] = None
+        max_retries: Optional[int] = None,
+        body: Optional[ImageRequestBody] = None
     ) -> Dict[str, Any]:
         """
         Make a direct API call to SVECTOR vision endpoint
+        
+        ``body`` replaces the JSON encoding of ``chat_request`` (which is then
+        only used for logging and rate-limit estimates).
         """
         endpoints = [
             f"{self.client.base_url}/api/chat/completions",
@@ -66,98 +207,191 @@ class VisionAPI:
             "Content-Type": "application/json"
         }
         
+        # Base64 images make these the largest bodies the SDK sends
+        uncompressed_size = None
+        compression = getattr(self.client, "compression", None)
+        if body is not None:
+            # Streamed bodies are sent as they are, with their length up front
+            headers["Content-Length"] = str(len(body))
+        elif compression is not None:
+            with profile_phase(self.client.profiler, "compress"):
+                body, encoding_headers, size = compression.encode(chat_request)
+                headers.update(encoding_headers)
+                if "Content-Encoding" in encoding_headers:
+                    uncompressed_size = size
+        
         timeout = timeout or 60  # Default 60 second timeout for vision
         max_retries = max_retries or 2
         
-        print(f"🔍 Vision API: Starting request with {timeout}s timeout...")
+        # Log records are only built when the "svector" logger is enabled
+        request_id = new_request_id() if logger.isEnabledFor(logging.INFO) else None
+        log_debug = request_id is not None and logger.isEnabledFor(logging.DEBUG)
+        if log_debug:
+            logger.debug(
+                "Vision request starting with %ss timeout", timeout,
+                extra=log_fields("vision.start", request_id, timeout=timeout, model=chat_request.get("model"))
+            )
         
-        for endpoint_index, endpoint in enumerate(endpoints):
-            
-            for retry in range(max_retries):
+        # Tokens are reserved against the shared rate budget on the first attempt only
+        reserved_tokens = estimate_tokens(chat_request) if self.client.rate_limiter else 0
+        first_attempt = True
+        
+        hooks = self.client.hooks
+        profiler = self.client.profiler
+        timing = None
+        attempt = 0
+        
+        try:
+            for endpoint_index, endpoint in enumerate(endpoints):
                 
-                try:
-                    request_start = time.time()
-                    
-                    response = requests.post(
-                        endpoint,
-                        headers=headers,
-                        json=chat_request,
-                        timeout=timeout,
-                        verify=self.client.verify_ssl
-                    )
+                for retry in range(max_retries):
+                    timing = hooks.start("POST", endpoint, attempt, chat_request)
+                    if timing is not None:
+                        timing.uncompressed_bytes = uncompressed_size
+                    attempt += 1
                     
-                    request_duration = time.time() - request_start
-                    print(f"⚡ Request completed in {request_duration:.2f}s")
-                    
-                    if not response.ok:
-                        error_text = response.text
-                        print(f"HTTP {response.status_code}: {error_text}")
+                    queued = time.perf_counter() if profiler is not None else None
+                    try:
+                        tokens, first_attempt = (reserved_tokens if first_attempt else 0), False
+                        with self.client._attempt_slot(tokens=tokens):
+                            if profiler is not None:
+                                profiler.record("queued", time.perf_counter() - queued)
+                            if timing is not None:
+                                timing.mark_sent()
+                            if log_debug:
+                                request_start = time.perf_counter()
                         
-                        # Handle specific HTTP status codes
-                        if response.status_code == 504:
-                            raise APIConnectionTimeoutError(
-                                "Gateway timeout: The image processing took too long. "
-                                "Try using a smaller image or 'low' detail setting."
-                            )
-                        elif response.status_code == 413:
-                            raise APIError(
-                                "Image too large: Please use a smaller image file or reduce the image resolution."
-                            )
-                        elif response.status_code == 429:
-                            raise RateLimitError("Rate limit exceeded: Please wait before making another request.")
-                        elif response.status_code >= 400 and response.status_code < 500:
-                            raise APIError(f"HTTP {response.status_code}: {error_text}")
+                            engine = getattr(self.client, "_engine", None)
+                            with profile_phase(profiler, "transport"):
+                                if engine is not None and self.client.cassette is None:
+                                    response = engine.request(
+                                        "POST",
+                                        endpoint,
+                                        headers=headers,
+                                        json=chat_request if body is None else None,
+                                        data=body,
+                                        timeout=timeout,
+                                        verify=self.client.verify_ssl,
+                                        trace=timing
+                                    )
+                                else:
+                                    # The client's session pools connections and carries any cassette
+                                    response = self.client.http_client.post(
+                                        endpoint,
+                                        headers=headers,
+                                        json=chat_request if body is None else None,
+                                        data=body,
+                                        timeout=timeout,
+                                        verify=self.client.verify_ssl
+                                    )
                         
-                        # For 5xx errors (server errors like 524 timeout), retry with next endpoint or retry
-                        if response.status_code >= 500:
-                            is_last_retry = retry == max_retries - 1
-                            is_last_endpoint = endpoint_index == len(endpoints) - 1
+                            if log_debug:
+                                request_duration = time.perf_counter() - request_start
+                                logger.debug(
+                                    "Vision request to %s completed in %.2fs with HTTP %d",
+                                    endpoint, request_duration, response.status_code,
+                                    extra=log_fields(
+                                        "vision.response", request_id, endpoint=endpoint,
+                                        status=response.status_code, duration=request_duration
+                                    )
+                                )
+                        
+                            if not response.ok:
+                                error_text = response.text
+                                if request_id is not None:
+                                    logger.info(
+                                        "Vision request to %s failed with HTTP %d: %.500s",
+                                        endpoint, response.status_code, error_text,
+                                        extra=log_fields(
+                                            "vision.http_error", request_id, endpoint=endpoint, status=response.status_code
+                                        )
+                                    )
+                            
+                                # Handle specific HTTP status codes
+                                if response.status_code == 504:
+                                    raise APIConnectionTimeoutError(
+                                        "Gateway timeout: The image processing took too long. "
+                                        "Try using a smaller image or 'low' detail setting."
+                                    )
+                                elif response.status_code == 413:
+                                    raise APIError(
+                                        "Image too large: Please use a smaller image file or reduce the image resolution."
+                                    )
+                                elif response.status_code == 429:
+                                    raise RateLimitError("Rate limit exceeded: Please wait before making another request.")
+                                elif response.status_code >= 400 and response.status_code < 500:
+                                    raise APIError(f"HTTP {response.status_code}: {error_text}")
                             
-                            if is_last_retry and is_last_endpoint:
-                                raise APIError(f"HTTP {response.status_code}: {error_text}")
+                                # For 5xx errors (server errors like 524 timeout), retry with next endpoint or retry
+                                if response.status_code >= 500:
+                                    is_last_retry = retry == max_retries - 1
+                                    is_last_endpoint = endpoint_index == len(endpoints) - 1
+                                
+                                    if is_last_retry and is_last_endpoint:
+                                        raise APIError(f"HTTP {response.status_code}: {error_text}", response.status_code)
+                                
+                                    # Raised inside the slot so the concurrency limiter records a failure
+                                    raise _RetryableServerError(error_text, response.status_code)
                             
-                            # If not last retry or not last endpoint, continue to retry
-                            continue
+                                # For other errors, treat as retry-able
+                                if retry == max_retries - 1:
+                                    raise APIError(f"HTTP {response.status_code}: {error_text}")
+                                hooks.retry(timing, APIError(error_text, response.status_code))
+                                continue
+                        
+                            with profile_phase(profiler, "decode"):
+                                result = response.json()
+                            settle_tokens(self.client.rate_limiter, reserved_tokens, result)
+                            hooks.response(timing, response, result)
+                            return result
                         
-                        # For other errors, treat as retry-able
-                        if retry == max_retries - 1:
-                            raise APIError(f"HTTP {response.status_code}: {error_text}")
+                    except _RetryableServerError as e:
+                        # If not last retry or not last endpoint, continue to retry
+                        hooks.retry(timing, e)
                         continue
+                        
+                    except requests.exceptions.Timeout as e:
+                        is_last_retry = retry == max_retries - 1
+                        is_last_endpoint = endpoint_index == len(endpoints) - 1
+                        
+                        if is_last_retry and is_last_endpoint:
+                            raise APIConnectionTimeoutError(
+                                f"Vision API request timed out after {timeout}s. "
+                                "This may be due to a large image or server overload. "
+                                "Try using a smaller image, setting detail to 'low', or increasing the timeout."
+                            )
+                        hooks.retry(timing, e)
+                        
+                    except requests.exceptions.ConnectionError as e:
+                        is_last_retry = retry == max_retries - 1
+                        is_last_endpoint = endpoint_index == len(endpoints) - 1
+                        
+                        if is_last_retry and is_last_endpoint:
+                            raise APIConnectionError("Network error: Unable to connect to vision API. Please check your internet connection.")
+                        hooks.retry(timing, e)
+                        
+                    except Exception as e:
+                        is_last_retry = retry == max_retries - 1
+                        is_last_endpoint = endpoint_index == len(endpoints) - 1
+                        
+                        if is_last_retry and is_last_endpoint:
+                            raise SVECTORError(f"Vision API request failed: {e}")
+                        hooks.retry(timing, e)
                     
-                    result = response.json()
-                    return result
-                    
-                except requests.exceptions.Timeout:
-                    is_last_retry = retry == max_retries - 1
-                    is_last_endpoint = endpoint_index == len(endpoints) - 1
-                    
-                    if is_last_retry and is_last_endpoint:
-                        raise APIConnectionTimeoutError(
-                            f"Vision API request timed out after {timeout}s. "
-                            "This may be due to a large image or server overload. "
-                            "Try using a smaller image, setting detail to 'low', or increasing the timeout."
-                        )
-                    
-                except requests.exceptions.ConnectionError as e:
-                    is_last_retry = retry == max_retries - 1
-                    is_last_endpoint = endpoint_index == len(endpoints) - 1
-                    
-                    if is_last_retry and is_last_endpoint:
-                        raise SVECTORError("Network error: Unable to connect to vision API. Please check your internet connection.")
-                    
-                except Exception as e:
-                    is_last_retry = retry == max_retries - 1
-                    is_last_endpoint = endpoint_index == len(endpoints) - 1
-                    
-                    if is_last_retry and is_last_endpoint:
-                        raise SVECTORError(f"Vision API request failed: {e}")
-                
-                # Exponential backoff for retries
-                if retry < max_retries - 1 or endpoint_index < len(endpoints) - 1:
-                    delay = min(1000 * (2 ** retry), 5000) / 1000  # Convert to seconds
-                    time.sleep(delay)
-        
-        raise SVECTORError("Vision API request failed after multiple retries on all endpoints")
+                    # Exponential backoff for retries
+                    if retry < max_retries - 1 or endpoint_index < len(endpoints) - 1:
+                        delay = min(1000 * (2 ** retry), 5000) / 1000  # Convert to seconds
+                        if request_id is not None:
+                            logger.info(
+                                "Vision request retrying in %.1fs", delay,
+                                extra=log_fields("vision.retry", request_id, endpoint=endpoint, attempt=attempt, delay=delay)
+                            )
+                        with profile_phase(profiler, "backoff", cpu=False):
+                            time.sleep(delay)
+            
+            raise SVECTORError("Vision API request failed after multiple retries on all endpoints")
+        except Exception as e:
+            raise hooks.error(timing, e)
     
     def analyze(
         self,
@@ -170,7 +404,10 @@ class VisionAPI:
         temperature: float = 0.7,
         detail: str = "auto",
         timeout: Optional[int] = None,
-        max_retries: Optional[int] = None
+        max_retries: Optional[int] = None,
+        image_file: Union[str, Path, bytes, bytearray, memoryview, BinaryIO, None] = None,
+        mime_type: Optional[str] = None,
+        preprocess: bool = True
     ) -> VisionResponse:
         """
         Analyze an image using SVECTOR's vision capabilities
@@ -186,6 +423,10 @@ class VisionAPI:
             detail: Image detail level ('low', 'high', 'auto')
             timeout: Request timeout in seconds
             max_retries: Maximum retry attempts
+            image_file: Image path, bytes or binary file, base64-encoded while the
+                request is sent instead of in memory (see ``ImageRequestBody``)
+            mime_type: MIME type of ``image_file`` (default: guessed from the path, else image/jpeg)
+            preprocess: Apply the client's ``image_preprocessing`` (False sends the image as given)
             
         Returns:
             VisionResponse with analysis results
@@ -196,9 +437,41 @@ class VisionAPI:
                 prompt="What do you see in this image?"
             )
             print(response.analysis)
+            
+            # Large local image, streamed from disk
+            response = client.vision.analyze(image_file="scan.png", prompt="Transcribe this page")
         """
-        if not any([image_url, image_base64, file_id]):
-            raise ValueError("Must provide one of: image_url, image_base64, or file_id")
+        if not any([image_url, image_base64, file_id]) and image_file is None:
+            raise ValueError("Must provide one of: image_url, image_base64, file_id or image_file")
+        
+        preprocessing = None
+        preprocessor = getattr(self.client, "image_preprocessor", None) if preprocess else None
+        uploads = getattr(self.client, "upload_index", None)
+        cache = getattr(self.client, "image_cache", None)
+        upload_key = reused = cached = None
+        local = not image_url and (image_base64 or (not file_id and image_file is not None))
+        if local and uploads is None and cache is not None and not image_base64 and isinstance(image_file, (str, Path)):
+            cached = self._encode_cached(cache, image_file, detail, preprocessor, model)
+            if cached.mime_type is None and mime_type is None:
+                guessed = mimetypes.guess_type(str(image_file))[0]
+                mime_type = guessed if guessed and guessed.startswith("image/") else None
+            image_file, mime_type = None, cached.mime_type or mime_type
+            detail, preprocessing = cached.detail or detail, cached.preprocessing
+        elif local and (preprocessor is not None or uploads is not None):
+            if image_base64:
+                if mime_type is None and image_base64.startswith("data:"):
+                    mime_type = image_base64[5:].split(";", 1)[0] or None
+                image_base64, image_file = None, base64.b64decode(image_base64.split(",", 1)[-1])
+            if uploads is not None:
+                original = image_file, detail
+                upload_key, entry, reused = self._upload_once(uploads, image_file, mime_type, detail, preprocessor, model)
+                image_file, file_id, detail = None, entry["file_id"], entry["detail"]
+                preprocessing = entry.get("preprocessing")
+            else:
+                prepared = self._preprocess(preprocessor, image_file, detail, model)
+                if prepared is not None:
+                    image_file, mime_type, detail = prepared.data, prepared.mime_type, prepared.detail
+                    preprocessing = prepared.to_dict()
         
         message_content: List[Dict[str, Any]] = [
             {
@@ -232,6 +505,14 @@ class VisionAPI:
                     "detail": detail
                 }
             })
+        else:
+            message_content.append({
+                "type": "image_url",
+                "image_url": {
+                    "url": _IMAGE_PLACEHOLDER,
+                    "detail": detail
+                }
+            })
         
         chat_request = {
             "model": model,
@@ -244,7 +525,17 @@ class VisionAPI:
         }
         
         try:
-            response = self._make_vision_request(chat_request, timeout, max_retries)
+            if cached is not None:
+                body = ImageRequestBody(chat_request, cached.data, mime_type or "image/jpeg", encoded=True)
+                response = self._make_vision_request(chat_request, timeout, max_retries, body=body)
+            elif image_file is not None:
+                if mime_type is None and isinstance(image_file, (str, Path)):
+                    guessed = mimetypes.guess_type(str(image_file))[0]
+                    mime_type = guessed if guessed and guessed.startswith("image/") else None
+                body = ImageRequestBody(chat_request, image_file, mime_type or "image/jpeg")
+                response = self._make_vision_request(chat_request, timeout, max_retries, body=body)
+            else:
+                response = self._make_vision_request(chat_request, timeout, max_retries)
             
             analysis = response.get("choices", [{}])[0].get("message", {}).get("content", "")
             if not analysis:
@@ -253,6 +544,7 @@ class VisionAPI:
             return VisionResponse({
                 "analysis": analysis,
                 "usage": response.get("usage", {}),
+                "preprocessing": preprocessing,
                 "_request_id": response.get("_request_id")
             })
             
@@ -260,12 +552,22 @@ class VisionAPI:
             # Re-throw timeout errors with additional context
             raise APIConnectionTimeoutError(
                 f"{e}\n\nTroubleshooting tips:\n"
-                "• Try reducing image size or resolution\n"
+                "• Try reducing image size or resolution (SVECTOR(image_preprocessing=True) does this)\n"
                 "• Use detail: 'low' instead of 'high'\n"
                 "• Check if the image URL is accessible\n"
                 "• Consider using a different image format"
             )
+        except APIConnectionError:
+            raise
         except Exception as e:
+            # An upload the API no longer knows (expired or deleted) is forgotten and sent once more
+            if upload_key is not None and reused and _is_stale_upload(e, file_id):
+                uploads.forget(upload_key)
+                return self.analyze(
+                    prompt=prompt, model=model, max_tokens=max_tokens, temperature=temperature, detail=original[1],
+                    timeout=timeout, max_retries=max_retries, image_file=original[0], mime_type=mime_type,
+                    preprocess=preprocess
+                )
             error_message = str(e)
             
             # More specific error handling
@@ -283,6 +585,93 @@ class VisionAPI:
             
             raise SVECTORError(f"Vision analysis failed: {error_message}")
     
+    def _preprocess(self, preprocessor: Any, image: Any, detail: str, model: str) -> Any:
+        """Run the client's ImagePreprocessor; None when Pillow cannot read the image"""
+        try:
+            with profile_phase(self.client.profiler, "preprocess"):
+                prepared = preprocessor.prepare(image, detail)
+        except (OSError, ValueError) as e:
+            # Formats Pillow cannot read are sent as they are
+            logger.info("Image preprocessing skipped: %s", e, extra=log_fields("vision.preprocess_skipped", None, error=str(e)))
+            return None
+        if self.client.metrics is not None:
+            self.client.metrics.increment("image_bytes_saved_total", prepared.bytes_saved, model=model)
+        return prepared
+    
+    def _encode_cached(
+        self,
+        cache: ImageCache,
+        path: Union[str, Path],
+        detail: str,
+        preprocessor: Any,
+        model: str
+    ) -> CachedImage:
+        """The cached base64 of the image at ``path`` (preprocessed first, if enabled)"""
+        variant = preprocessor.fingerprint(detail) if preprocessor is not None else ""
+        cached = cache.get(path, variant)
+        if cached is not None:
+            return cached
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            data = f.read()
+        prepared = self._preprocess(preprocessor, data, detail, model) if preprocessor is not None else None
+        if prepared is None:
+            return cache.put(path, base64.b64encode(data).decode("ascii"), stat, variant)
+        return cache.put(
+            path, base64.b64encode(prepared.data).decode("ascii"), stat, variant,
+            mime_type=prepared.mime_type, detail=prepared.detail, preprocessing=prepared.to_dict()
+        )
+    
+    def _upload_once(
+        self,
+        uploads: UploadIndex,
+        image: Any,
+        mime_type: Optional[str],
+        detail: str,
+        preprocessor: Any,
+        model: str
+    ) -> Tuple[str, Dict[str, Any], bool]:
+        """
+        Upload ``image`` (preprocessed first, if enabled) unless its content was uploaded before
+        
+        Returns:
+            (index key, index entry with file_id and detail, whether the upload was reused)
+        """
+        key = content_hash(image)
+        if preprocessor is not None:
+            key = f"{key}:{preprocessor.fingerprint(detail)}"
+        with uploads.lock(key):
+            entry = uploads.get(key)
+            if entry is not None:
+                return key, entry, True
+            
+            preprocessing = None
+            prepared = self._preprocess(preprocessor, image, detail, model) if preprocessor is not None else None
+            if prepared is not None:
+                image, mime_type, detail = prepared.data, prepared.mime_type, prepared.detail
+                preprocessing = prepared.to_dict()
+            elif mime_type is None and isinstance(image, (str, Path)):
+                guessed = mimetypes.guess_type(str(image))[0]
+                mime_type = guessed if guessed and guessed.startswith("image/") else None
+            mime_type = mime_type or "image/jpeg"
+            if isinstance(image, (str, Path)):
+                size = os.path.getsize(image)
+            elif isinstance(image, (bytes, bytearray, memoryview)):
+                image = bytes(image)
+                size = len(image)
+            else:
+                image = image.read()
+                size = len(image)
+            
+            filename = key[:16] + (mimetypes.guess_extension(mime_type) or "")
+            with profile_phase(self.client.profiler, "upload"):
+                result = self.client.files.create(image, purpose=uploads.purpose, filename=filename)
+            file_id = result.get("file_id") or result.get("id")
+            if not file_id:
+                raise SVECTORError(f"Image upload returned no file_id: {result}")
+            entry = uploads.put(key, file_id, detail=detail, mime_type=mime_type, bytes=size, preprocessing=preprocessing)
+            return key, entry, False
+    
     def analyze_from_url(
         self,
         image_url: str,
@@ -657,56 +1046,132 @@ class VisionAPI:
         temperature: float = 0.7,
         detail: str = "auto",
         delay: float = 1.0,
+        prepare_workers: Optional[int] = None,
+        prefetch: int = 4,
+        prepare_executor: Optional[concurrent.futures.Executor] = None,
         **kwargs
     ) -> List[Dict[str, Any]]:
         """
         Batch analyze multiple images
         
+        When the client has ``image_preprocessing``, images given as
+        ``image_file`` paths or bytes, or as ``image_base64``, are decoded,
+        resized and re-encoded in a process pool, up to ``prefetch`` images
+        ahead of the request being sent, so CPU-bound preparation overlaps the
+        uploads instead of running on the GIL between them. Everything else,
+        and every image when ``image_uploads`` or ``image_cache`` is enabled,
+        goes straight to ``analyze`` (streamed, uploaded or cached there), so
+        such batches start no processes. On platforms that spawn worker
+        processes (macOS, Windows) call this under ``if __name__ == "__main__":``.
+        
         Args:
-            images: List of image dicts with image data and optional prompt
+            images: List of image dicts with ``image_url``, ``image_base64``,
+                ``file_id`` or ``image_file`` and an optional ``prompt``
             model: Model to use
             max_tokens: Maximum tokens
             temperature: Sampling temperature
             detail: Image detail level
             delay: Delay between requests in seconds
+            prepare_workers: Processes preparing images (default: one per CPU)
+            prefetch: Images prepared ahead of the one being sent
+            prepare_executor: Executor to prepare images on instead of a new process pool
             **kwargs: Additional parameters
             
         Returns:
-            List of analysis results
+            List of analysis results (with ``preprocessing`` when it ran)
+            
+        Example:
+            images = [{"image_file": path} for path in sorted(Path("scans").glob("*.jpg"))]
+            results = client.vision.batch_analyze(images, delay=0, prepare_workers=4)
         """
         results = []
+        preprocessor = getattr(self.client, "image_preprocessor", None)
+        # Uploads and the cache key images by their original content, so analyze prepares those itself
+        pooled = preprocessor is not None and getattr(self.client, "upload_index", None) is None \
+            and getattr(self.client, "image_cache", None) is None
+        prepare = [
+            pooled and not image.get("image_url") and (
+                bool(image.get("image_base64"))
+                or not image.get("file_id") and isinstance(image.get("image_file"), (str, Path, bytes, bytearray))
+            )
+            for image in images
+        ]
+        executor = prepare_executor
+        if executor is None and any(prepare):
+            executor = concurrent.futures.ProcessPoolExecutor(max_workers=prepare_workers)
+        pending: Dict[int, concurrent.futures.Future] = {}
         
-        for i, image in enumerate(images):
-            try:
-                result = self.analyze(
-                    image_url=image.get("image_url"),
-                    image_base64=image.get("image_base64"),
-                    file_id=image.get("file_id"),
-                    prompt=image.get("prompt"),
-                    model=model,
-                    max_tokens=max_tokens,
-                    temperature=temperature,
-                    detail=detail,
-                    **kwargs
+        def schedule(index: int):
+            if index < len(images) and prepare[index]:
+                image = images[index]
+                pending[index] = executor.submit(
+                    _prepare_image, image.get("image_file"), image.get("image_base64"), detail, preprocessor
                 )
-                
-                results.append({
-                    "analysis": result.analysis,
-                    "output_text": result.analysis,
-                    "usage": result.usage,
-                    "request_id": result.request_id
-                })
-                
-                # Add delay between requests
-                if i < len(images) - 1:
-                    time.sleep(delay)
+        
+        try:
+            for i in range(min(prefetch, len(images))):
+                schedule(i)
+            for i, image in enumerate(images):
+                # Keep the next images preparing while this one is sent
+                schedule(i + prefetch)
+                try:
+                    preprocessing = None
+                    source = {
+                        "image_url": image.get("image_url"),
+                        "image_base64": image.get("image_base64"),
+                        "file_id": image.get("file_id"),
+                        "image_file": image.get("image_file"),
+                        "detail": detail,
+                        "preprocess": i not in pending,
+                    }
+                    if i in pending:
+                        with profile_phase(self.client.profiler, "preprocess"):
+                            prepared = pending.pop(i).result()
+                        # None: Pillow could not read the image, so it is sent as it is
+                        if prepared is not None:
+                            source.update(
+                                image_base64=None, image_file=prepared.data,
+                                mime_type=prepared.mime_type, detail=prepared.detail
+                            )
+                            preprocessing = prepared.to_dict()
+                            preprocessor.record(prepared.original_bytes, prepared.bytes)
+                            if self.client.metrics is not None:
+                                self.client.metrics.increment("image_bytes_saved_total", prepared.bytes_saved, model=model)
                     
-            except Exception as e:
-                results.append({
-                    "analysis": "",
-                    "output_text": "",
-                    "error": str(e)
-                })
+                    result = self.analyze(
+                        prompt=image.get("prompt"),
+                        model=model,
+                        max_tokens=max_tokens,
+                        temperature=temperature,
+                        **source,
+                        **kwargs
+                    )
+                    preprocessing = preprocessing or result.preprocessing
+                    
+                    results.append({
+                        "analysis": result.analysis,
+                        "output_text": result.analysis,
+                        "usage": result.usage,
+                        "request_id": result.request_id
+                    })
+                    if preprocessing is not None:
+                        results[-1]["preprocessing"] = preprocessing
+                    
+                    # Add delay between requests
+                    if i < len(images) - 1:
+                        time.sleep(delay)
+                        
+                except Exception as e:
+                    results.append({
+                        "analysis": "",
+                        "output_text": "",
+                        "error": str(e)
+                    })
+        finally:
+            for future in pending.values():
+                future.cancel()
+            if executor is not None and prepare_executor is None:
+                executor.shutdown(wait=True)
         
         return results
         
@@ -919,12 +1384,13 @@ class ResponsesAPI:
 
 
 # Utility functions
-def encode_image(image_path: Union[str, Path]) -> str:
+def encode_image(image_path: Union[str, Path], cache: Optional[ImageCache] = None) -> str:
     """
     Encode an image file to base64 string
     
     Args:
         image_path: Path to the image file
+        cache: ImageCache to reuse the encoding from while the file is unchanged
         
     Returns:
         Base64 encoded string
@@ -932,6 +1398,8 @@ def encode_image(image_path: Union[str, Path]) -> str:
     Example:
         base64_image = encode_image("path/to/image.jpg")
     """
+    if cache is not None:
+        return cache.encode(image_path)
     with open(image_path, "rb") as image_file:
         return base64.b64encode(image_file.read()).decode("utf-8")
 
@@ -951,3 +1419,29 @@ def create_data_url(base64_data: str, mime_type: str = "image/jpeg") -> str:
         data_url = create_data_url(base64_data, "image/png")
     """
     return f"data:{mime_type};base64,{base64_data}"
+
+
+
+def _is_stale_upload(error: Exception, file_id: str) -> bool:
+    """Whether a vision error says the API no longer has ``file_id`` (HTTP 404/410, or a 400 naming it)"""
+    if isinstance(error, NotFoundError):
+        return True
+    message = str(error)
+    if re.search(r"\bHTTP (404|410)\b", message):
+        return True
+    return re.search(r"\bHTTP 400\b", message) is not None and file_id in message
+
+
+def _prepare_image(
+    image_file: Optional[Union[str, Path, bytes]],
+    image_base64: Optional[str],
+    detail: str,
+    preprocessor: Any
+) -> Any:
+    """Preprocess one ``batch_analyze`` image (runs in a worker process); None when Pillow cannot read it"""
+    source = base64.b64decode(image_base64.split(",", 1)[-1]) if image_base64 else image_file
+    try:
+        return preprocessor.prepare(source, detail, record=False)
+    except (OSError, ValueError) as e:
+        logger.info("Image preprocessing skipped: %s", e)
+        return None
@@ -0,0 +1,17 @@
+import pytest
+
+from svector import SVECTOR
+from svector.emulator import Emulator
+
+
+@pytest.fixture
+def emulator():
+    with Emulator() as emulator:
+        yield emulator
+
+
+@pytest.fixture
+def client(emulator):
+    client = SVECTOR(api_key="test", base_url=emulator.base_url, max_retries=0)
+    yield client
+    client.close()
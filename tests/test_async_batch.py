@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from svector import AsyncSVECTOR, AuthenticationError, TimeoutError
+from svector.batch import AsyncBatchRun
+
+
+def test_gather_returns_results_in_order_with_bounded_concurrency():
+    in_flight = peak = 0
+
+    async def call(value):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01 * (5 - value % 5))
+        in_flight -= 1
+        return value
+
+    async def main():
+        run = AsyncBatchRun((call(i) for i in range(20)), concurrency=4)
+        return sorted([item async for item in run], key=lambda item: item.index)
+
+    items = asyncio.run(main())
+    assert [item.result for item in items] == list(range(20))
+    assert peak <= 4
+
+
+def test_per_item_timeout_and_self_cancelled_calls_are_captured():
+    async def slow():
+        await asyncio.sleep(1)
+
+    async def cancels_itself():
+        raise asyncio.CancelledError()
+
+    async def main():
+        run = AsyncBatchRun([slow, cancels_itself, lambda: asyncio.sleep(0, "ok")], timeout=0.05)
+        return sorted([item async for item in run], key=lambda item: item.index)
+
+    slow_item, cancelled_item, ok_item = asyncio.run(main())
+    assert isinstance(slow_item.error, TimeoutError)
+    assert isinstance(cancelled_item.error, asyncio.CancelledError)
+    assert ok_item.result == "ok"
+
+
+def test_fatal_error_cancels_remaining_work_and_closes_the_source():
+    started = []
+    finished = []
+
+    async def call(value):
+        started.append(value)
+        if value == 1:
+            raise AuthenticationError("Invalid API key", 401)
+        await asyncio.sleep(1)
+        finished.append(value)
+
+    def calls():
+        for value in range(1000):
+            yield call(value)
+
+    source = calls()
+
+    async def main():
+        return [item async for item in AsyncBatchRun(source, concurrency=3)]
+
+    with pytest.raises(AuthenticationError):
+        asyncio.run(main())
+    assert len(started) <= 4
+    assert not finished
+    assert source.gi_frame is None
+
+
+def test_async_client_gather_and_create_many(emulator):
+    async def main():
+        client = AsyncSVECTOR(api_key="test", base_url=emulator.base_url, max_retries=0)
+        try:
+            results = await client.conversations.create_many(
+                [{"model": "spec-3-turbo", "input": f"Question {i}"} for i in range(5)],
+                concurrency=2
+            )
+            gathered = await client.gather(
+                (client.conversations.create(model="spec-3-turbo", input="Hi") for _ in range(3)),
+                concurrency=2
+            )
+        finally:
+            await client.close()
+        return results, gathered
+
+    results, gathered = asyncio.run(main())
+    assert [item.index for item in results] == list(range(5))
+    assert all(item.ok and item.result.output for item in results)
+    assert results.stats.succeeded == 5
+    assert len(gathered) == 3 and not gathered.errors
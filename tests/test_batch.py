@@ -0,0 +1,85 @@
+import threading
+import time
+
+import pytest
+
+from svector.batch import BatchItemResult, BatchRun, BatchStats
+
+
+def test_stats_memory_does_not_grow_with_items():
+    stats = BatchStats()
+    for i in range(100000):
+        stats.record(BatchItemResult(i, {}, latency=0.1 + (i % 100) / 1000))
+
+    assert stats.completed == stats.succeeded == 100000
+    assert len(stats._latencies.buckets) < 200
+    assert stats.latency_percentile(50) == pytest.approx(0.15, rel=0.02)
+    summary = stats.to_dict()
+    assert summary["latency_max"] == pytest.approx(0.199)
+    assert summary["latency_mean"] == pytest.approx(0.1495)
+
+
+def test_stats_count_failures():
+    stats = BatchStats(total=2)
+    stats.record(BatchItemResult(0, {}, result="ok", latency=0.5))
+    stats.record(BatchItemResult(1, {}, error=ValueError("bad"), latency=1.0))
+    stats.finish()
+
+    assert (stats.completed, stats.succeeded, stats.failed) == (2, 1, 1)
+    assert stats.latency_percentile(100) == 1.0
+    assert BatchStats().to_dict()["latency_p95"] == 0.0
+
+
+def test_create_many_returns_results_in_input_order(client):
+    questions = [f"Question {i}" for i in range(6)]
+    progress = []
+    results = client.conversations.create_many(
+        [{"model": "spec-3-turbo", "input": q} for q in questions],
+        concurrency=3,
+        on_progress=lambda item, stats: progress.append(stats.completed)
+    )
+
+    assert [item.index for item in results] == list(range(6))
+    assert all(item.ok and item.result.output for item in results)
+    assert results.stats.succeeded == 6 and not results.errors
+    assert sorted(progress) == list(range(1, 7))
+
+
+def test_chat_create_many_as_completed(client):
+    run = client.chat.create_many(
+        [{"model": "spec-3-turbo", "messages": [{"role": "user", "content": "Hi"}]} for _ in range(4)],
+        concurrency=2,
+        as_completed=True
+    )
+    assert sorted(item.index for item in run) == [0, 1, 2, 3]
+
+
+def test_batch_run_bounds_in_flight_work_and_captures_errors():
+    lock = threading.Lock()
+    in_flight = peak = 0
+
+    def call(value):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.01)
+        with lock:
+            in_flight -= 1
+        if value == 3:
+            raise ValueError("bad input")
+        return value * 2
+
+    consumed = []
+
+    def requests():
+        for value in range(10):
+            consumed.append(value)
+            yield {"value": value}
+
+    items = sorted(BatchRun(call, requests(), concurrency=3), key=lambda item: item.index)
+
+    assert peak <= 3
+    assert len(consumed) == 10
+    assert [item.result for item in items if item.ok] == [v * 2 for v in range(10) if v != 3]
+    assert isinstance(items[3].error, ValueError)
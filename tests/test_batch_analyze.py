@@ -0,0 +1,82 @@
+import base64
+import concurrent.futures
+import io
+
+import pytest
+
+from svector import SVECTOR
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def jpeg(size):
+    buffer = io.BytesIO()
+    Image.merge("RGB", [Image.effect_noise(size, 40)] * 3).save(buffer, "JPEG", quality=95)
+    return buffer.getvalue()
+
+
+class RecordingExecutor(concurrent.futures.ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.submitted = 0
+
+    def submit(self, fn, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(fn, *args, **kwargs)
+
+
+@pytest.fixture
+def preprocessing_client(emulator):
+    client = SVECTOR(api_key="test", base_url=emulator.base_url, image_preprocessing=True)
+    yield client
+    client.close()
+
+
+def test_only_local_images_are_prepared_in_the_pool(tmp_path, preprocessing_client):
+    path = tmp_path / "photo.jpg"
+    path.write_bytes(jpeg((1600, 1200)))
+    images = [
+        {"image_file": path, "prompt": "First"},
+        {"image_url": "https://example.com/cat.png"},
+        {"image_base64": base64.b64encode(jpeg((1200, 1600))).decode("ascii")},
+        {"image_file": b"not an image"},
+    ]
+    executor = RecordingExecutor()
+    with executor:
+        results = preprocessing_client.vision.batch_analyze(images, delay=0, prefetch=2, prepare_executor=executor)
+
+    assert executor.submitted == 3
+    assert all(result["analysis"] for result in results)
+    assert results[0]["preprocessing"]["width"] == 1024
+    assert results[2]["preprocessing"]["height"] == 1024
+    assert "preprocessing" not in results[1] and "preprocessing" not in results[3]
+    assert preprocessing_client.image_preprocessor.stats()["images"] == 2
+
+
+def test_process_pool(tmp_path, preprocessing_client):
+    paths = []
+    for i in range(3):
+        paths.append(tmp_path / f"photo{i}.jpg")
+        paths[-1].write_bytes(jpeg((1600, 1200)))
+
+    results = preprocessing_client.vision.batch_analyze(
+        [{"image_file": path} for path in paths], delay=0, prepare_workers=2
+    )
+
+    assert [result["preprocessing"]["width"] for result in results] == [1024] * 3
+
+
+def test_no_pool_without_preprocessing(monkeypatch, tmp_path, client):
+    def no_processes(*args, **kwargs):
+        raise AssertionError("batch_analyze started a process pool")
+
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", no_processes)
+    path = tmp_path / "photo.jpg"
+    path.write_bytes(jpeg((300, 200)))
+    results = client.vision.batch_analyze(
+        [{"image_file": path}, {"image_file": tmp_path / "missing.jpg"}], delay=0
+    )
+
+    assert results[0]["analysis"]
+    assert "preprocessing" not in results[0]
+    assert results[1]["error"]
@@ -0,0 +1,39 @@
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+BENCHMARKS = Path(__file__).resolve().parent.parent / "benchmarks"
+
+
+@pytest.fixture(scope="module")
+def hot_paths():
+    spec = importlib.util.spec_from_file_location("bench_hot_paths", BENCHMARKS / "bench_hot_paths.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize("name", [
+    "build_messages", "sse_parse_500_events", "stream_event_construction", "request_path",
+    "conversation_create", "encode_image_8mb", "create_data_url_8mb", "vision_payload_2mb",
+    "image_request_body_8mb",
+])
+def test_benchmark_runs(hot_paths, name):
+    hot_paths.BENCHMARKS[name]()()
+
+
+def test_compare_against_baseline(tmp_path, hot_paths, capsys):
+    baseline = tmp_path / "baseline.json"
+    options = ["-k", "build_messages", "--rounds", "1", "--min-time", "0", "--baseline", str(baseline)]
+
+    assert hot_paths.main(options + ["--compare"]) == 2
+    assert hot_paths.main(options + ["--save"]) == 0
+    assert set(json.loads(baseline.read_text())["benchmarks"]) == {"build_messages"}
+
+    document = json.loads(baseline.read_text())
+    document["benchmarks"]["build_messages"]["best"] /= 100
+    baseline.write_text(json.dumps(document))
+    assert hot_paths.main(options + ["--compare"]) == 1
+    assert "regressed" in capsys.readouterr().err
@@ -0,0 +1,83 @@
+import base64
+import os
+
+from svector import SVECTOR
+from svector.cache import ImageCache, resolve_image_cache
+from svector.vision import encode_image
+
+
+def write(path, data):
+    path.write_bytes(data)
+    return path
+
+
+def test_encode_once_until_the_file_changes(tmp_path):
+    image = write(tmp_path / "logo.png", b"\x89PNG first")
+    cache = ImageCache()
+
+    assert encode_image(image, cache=cache) == base64.b64encode(b"\x89PNG first").decode("ascii")
+    assert encode_image(str(image), cache=cache) == encode_image(image, cache=cache)
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    write(image, b"\x89PNG second")
+    assert base64.b64decode(cache.encode(image)) == b"\x89PNG second"
+
+    # Same size, newer modification time
+    write(image, b"\x89PNG third!")
+    stat = os.stat(image)
+    os.utime(image, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert base64.b64decode(cache.encode(image)) == b"\x89PNG third!"
+    assert cache.misses == 3
+
+
+def test_lru_bounded_by_encoded_bytes(tmp_path):
+    paths = [write(tmp_path / f"{i}.png", bytes(300)) for i in range(3)]
+    cache = ImageCache(max_bytes=900)
+    for path in paths[:2]:
+        cache.encode(path)
+    cache.encode(paths[0])  # most recently used
+    cache.encode(paths[2])
+
+    assert cache.get(paths[1]) is None
+    assert cache.get(paths[0]) is not None
+    stats = cache.stats()
+    assert (stats["entries"], stats["bytes"], stats["evictions"]) == (2, 800, 1)
+
+
+def test_oversized_files_are_encoded_but_not_cached(tmp_path):
+    cache = ImageCache(max_bytes=100)
+    image = write(tmp_path / "big.png", bytes(300))
+    assert len(cache.encode(image)) == 400
+    assert len(cache) == 0
+
+
+def test_invalidate_drops_every_variant(tmp_path):
+    image = write(tmp_path / "logo.png", b"\x89PNG")
+    other = write(tmp_path / "other.png", b"\x89PNG")
+    cache = ImageCache()
+    stat = os.stat(image)
+    cache.put(image, "low", stat, "low")
+    cache.put(image, "high", stat, "high")
+    cache.encode(other)
+
+    assert cache.get(image, "low").data == "low"
+    cache.invalidate(image)
+    assert cache.get(image, "low") is None and cache.get(image, "high") is None
+    assert len(cache) == 1
+
+
+def test_resolve_image_cache():
+    assert resolve_image_cache(None) is None
+    assert resolve_image_cache(True).max_bytes == 64 * 1024 * 1024
+    assert resolve_image_cache(1024).max_bytes == 1024
+
+
+def test_vision_reads_each_image_once(tmp_path, emulator):
+    image = write(tmp_path / "chart.png", b"\x89PNG" + bytes(range(256)) * 40)
+    client = SVECTOR(api_key="test", base_url=emulator.base_url, image_cache=True)
+    for prompt in ("Describe", "Summarize", "Explain"):
+        response = client.vision.analyze(image_file=image, prompt=prompt)
+        assert response.usage["prompt_tokens"] > len(base64.b64encode(image.read_bytes())) // 4
+    client.close()
+
+    assert client.image_cache.stats()["hits"] == 2
@@ -0,0 +1,90 @@
+import asyncio
+import gzip
+import time
+
+import pytest
+
+from svector import SVECTOR, AsyncSVECTOR, Cassette, CassetteMissError, ValidationError
+from svector.emulator import Emulator
+
+
+def ask(client, question):
+    return client.chat.create(model="spec-3-turbo", messages=[{"role": "user", "content": question}])
+
+
+def record(path, **emulator_options):
+    with Emulator(**emulator_options) as emulator:
+        client = SVECTOR(api_key="sk-secret", base_url=emulator.base_url, max_retries=0)
+        with client.use_cassette(path, mode="record"):
+            first = ask(client, "first")
+            second = ask(client, "second")
+            events = list(client.chat.create_stream(model="spec-3-turbo", messages=[{"role": "user", "content": "stream"}]))
+        client.close()
+    return emulator.base_url, (first, second, events)
+
+
+def test_replay_without_network(tmp_path):
+    path = tmp_path / "traffic.cassette"
+    base_url, (first, second, events) = record(path, token_interval=0.01)
+    assert b"sk-secret" not in gzip.decompress(path.read_bytes())
+
+    # The emulator is gone; answers come from the cassette, matched by body
+    client = SVECTOR(api_key="test", base_url=base_url, max_retries=0)
+    with client.use_cassette(path, time_scale=0):
+        assert ask(client, "second") == second
+        assert ask(client, "first") == first
+        assert list(client.chat.create_stream(model="spec-3-turbo", messages=[{"role": "user", "content": "stream"}])) == events
+        with pytest.raises(CassetteMissError):
+            ask(client, "third")
+    client.close()
+
+
+def test_replay_reproduces_stream_timing(tmp_path):
+    path = tmp_path / "traffic.cassette"
+    base_url, _ = record(path, latency=0.1)
+    client = SVECTOR(api_key="test", base_url=base_url, max_retries=0)
+
+    def replay(time_scale):
+        started = time.perf_counter()
+        with client.use_cassette(path, time_scale=time_scale):
+            ask(client, "first")
+        return time.perf_counter() - started
+
+    assert replay(1.0) >= 0.09
+    assert replay(0) < 0.05
+    client.close()
+
+
+def test_sequence_match_ignores_bodies(tmp_path):
+    path = tmp_path / "traffic.cassette"
+    base_url, (first, _, _) = record(path)
+    client = SVECTOR(api_key="test", base_url=base_url, max_retries=0)
+    with client.use_cassette(path, time_scale=0, match="sequence"):
+        assert ask(client, "something else") == first
+    client.close()
+
+
+def test_async_record_and_replay(tmp_path):
+    path = tmp_path / "traffic.cassette"
+
+    async def run(base_url, mode):
+        client = AsyncSVECTOR(api_key="test", base_url=base_url, max_retries=0)
+        try:
+            with client.use_cassette(path, mode=mode, time_scale=0):
+                return await client.chat.create(model="spec-3-turbo", messages=[{"role": "user", "content": "Hi"}])
+        finally:
+            await client.close()
+
+    with Emulator() as emulator:
+        recorded = asyncio.run(run(emulator.base_url, "record"))
+    assert asyncio.run(run(emulator.base_url, "replay")) == recorded
+
+
+def test_rejects_bad_arguments(tmp_path):
+    with pytest.raises(ValidationError):
+        Cassette(tmp_path / "traffic.cassette", mode="rewind")
+    with pytest.raises(ValidationError):
+        Cassette(tmp_path / "traffic.cassette", match="headers")
+    (tmp_path / "other.gz").write_bytes(gzip.compress(b'{"format": 1}\n'))
+    with pytest.raises(ValidationError):
+        Cassette(tmp_path / "other.gz")
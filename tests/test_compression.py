@@ -0,0 +1,85 @@
+import asyncio
+import gzip
+import json
+
+import pytest
+
+from svector import SVECTOR, AsyncSVECTOR
+from svector.compression import RequestCompression, accept_encoding, resolve_compression, zstd
+from svector.hooks import RequestHooks
+
+LONG_CONTEXT = [{"role": "user", "content": "Context line about the quarterly report. " * 2000}]
+
+
+def test_encode_compresses_only_large_bodies():
+    compression = RequestCompression(threshold=1024)
+
+    body, headers, size = compression.encode({"messages": [{"role": "user", "content": "Hi"}]})
+    assert "Content-Encoding" not in headers
+    assert len(body) == size
+
+    body, headers, size = compression.encode({"messages": LONG_CONTEXT})
+    assert headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(body)) == {"messages": LONG_CONTEXT}
+    assert len(body) < size / 10
+
+    stats = compression.stats()
+    assert (stats["compressed"], stats["skipped"]) == (1, 1)
+    assert stats["bytes_saved"] == size - len(body)
+
+
+def test_incompressible_body_is_sent_as_is():
+    compression = RequestCompression(threshold=0)
+    body, headers, _ = compression.encode("x")
+    assert body == b'"x"'
+    assert "Content-Encoding" not in headers
+
+
+def test_resolve_compression():
+    assert resolve_compression(None) is None
+    assert resolve_compression(False) is None
+    assert resolve_compression(True).algorithm == "gzip"
+    with pytest.raises(ValueError):
+        resolve_compression("lz4")
+
+
+@pytest.mark.skipif(zstd is None, reason="zstd is not available")
+def test_zstd():
+    body, headers, _ = RequestCompression("zstd", threshold=0).encode({"messages": LONG_CONTEXT})
+    assert headers["Content-Encoding"] == "zstd"
+    assert json.loads(zstd.decompress(body)) == {"messages": LONG_CONTEXT}
+
+
+def test_accept_encoding_offers_common_decoders():
+    encodings = accept_encoding().split(", ")
+    assert encodings[:2] == ["gzip", "deflate"]
+    assert set(encodings) <= {"gzip", "deflate", "br", "zstd"}
+
+
+@pytest.mark.parametrize("async_engine", [False, True])
+def test_compressed_request_round_trip(emulator, async_engine):
+    timings = []
+    client = SVECTOR(api_key="test", base_url=emulator.base_url, max_retries=0, compression=True,
+                     async_engine=async_engine, hooks=RequestHooks({"after_response": timings.append}))
+    response = client.chat.create(model="spec-3-turbo", messages=LONG_CONTEXT)
+    client.close()
+
+    # The emulator estimates prompt tokens from the decompressed body
+    assert response["usage"]["prompt_tokens"] > 10000
+    assert client.compression.compressed == 1
+    assert client.http_client.headers["Accept-Encoding"] == accept_encoding()
+    [timing] = timings
+    assert timing.request_bytes < timing.uncompressed_bytes / 10
+
+
+def test_async_compressed_request_round_trip(emulator):
+    async def main():
+        client = AsyncSVECTOR(api_key="test", base_url=emulator.base_url, max_retries=0, compression=True)
+        try:
+            return client, await client.chat.create(model="spec-3-turbo", messages=LONG_CONTEXT)
+        finally:
+            await client.close()
+
+    client, response = asyncio.run(main())
+    assert response["usage"]["prompt_tokens"] > 10000
+    assert client.compression.compressed == 1
@@ -0,0 +1,82 @@
+import asyncio
+import importlib.util
+import time
+from pathlib import Path
+
+import aiohttp
+import pytest
+
+from svector.emulator import MODELS, Emulator
+
+MESSAGES = [{"role": "user", "content": "Hello"}]
+
+
+def test_completion_honours_max_tokens(emulator, client):
+    response = client.chat.create(model="theta-35", messages=MESSAGES, max_tokens=5)
+
+    assert response["model"] == "theta-35"
+    assert len(response["choices"][0]["message"]["content"].split()) == 5
+    assert response["usage"]["completion_tokens"] == 5
+    assert response["usage"]["total_tokens"] == response["usage"]["prompt_tokens"] + 5
+    assert emulator.stats == {"requests": 1, "streams": 0, "uploads": 0}
+
+
+def test_stream_emits_one_event_per_token(emulator, client):
+    events = list(client.chat.create_stream(model="spec-3-turbo", messages=MESSAGES, max_tokens=4))
+
+    content = [event["choices"][0]["delta"].get("content") for event in events]
+    assert len([text for text in content if text]) == 4
+    assert events[-1]["choices"][0]["finish_reason"] == "stop"
+    assert emulator.stats["streams"] == 1
+
+
+def test_models_and_files(emulator, client):
+    assert client.models.list() == {"models": MODELS}
+    uploaded = client.files.create(b"0123456789", filename="notes.txt")
+    assert (uploaded["filename"], uploaded["bytes"]) == ("notes.txt", 10)
+    assert emulator.stats["uploads"] == 1
+
+
+def test_latency_and_token_interval():
+    async def post(url):
+        async with aiohttp.ClientSession() as session:
+            started = time.perf_counter()
+            async with session.post(url, json={"model": "spec-3", "messages": MESSAGES}) as response:
+                await response.json()
+            return time.perf_counter() - started
+
+    with Emulator(latency=0.1, token_interval=0.02, tokens=6) as emulator:
+        elapsed = asyncio.run(post(emulator.base_url + "/api/chat/completions"))
+    assert elapsed >= 0.1 + 5 * 0.02
+
+
+def test_start_async_on_a_running_loop():
+    async def main():
+        emulator = Emulator()
+        base_url = await emulator.start_async()
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(base_url + "/api/models") as response:
+                    return await response.json()
+        finally:
+            await emulator.stop_async()
+
+    assert asyncio.run(main()) == {"models": MODELS}
+
+
+@pytest.fixture(scope="module")
+def throughput():
+    path = Path(__file__).resolve().parent.parent / "benchmarks" / "bench_throughput.py"
+    spec = importlib.util.spec_from_file_location("bench_throughput", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize("mode", ["sync", "engine", "stream", "async"])
+def test_throughput_harness_modes(emulator, throughput, mode):
+    result = throughput.run_mode(mode, emulator.base_url, count=8, concurrency=4, max_tokens=4)
+
+    assert result["requests"] == 8
+    assert result["tokens_per_second"] > 0
+    assert emulator.stats["requests"] == 8
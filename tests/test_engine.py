@@ -0,0 +1,54 @@
+import os
+import signal
+import sys
+
+import pytest
+
+from svector import SVECTOR
+from svector.engine import BackgroundEngine
+
+
+def test_engine_client_and_submit(emulator):
+    client = SVECTOR(api_key="test", base_url=emulator.base_url, async_engine=BackgroundEngine())
+    try:
+        futures = [
+            client.submit(client.conversations.create, model="spec-3-turbo", input=f"Question {i}")
+            for i in range(5)
+        ]
+        assert all(future.result(10).output for future in futures)
+        assert client.models.list()
+    finally:
+        client._engine.close()
+        client.close()
+
+
+def test_engine_request_forwards_params(emulator):
+    engine = BackgroundEngine()
+    try:
+        response = engine.request("GET", f"{emulator.base_url}/api/models", params={"limit": 1}, timeout=10)
+        assert response.ok
+        assert response.json()
+    finally:
+        engine.close()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_engine_works_in_forked_child(emulator):
+    engine = BackgroundEngine()
+    url = f"{emulator.base_url}/api/models"
+    assert engine.request("GET", url, timeout=10).ok
+
+    pid = os.fork()
+    if pid == 0:
+        status = 1
+        try:
+            signal.alarm(10)
+            status = 0 if engine.request("GET", url, timeout=5).ok else 1
+            engine.close()
+        finally:
+            sys.stderr.flush()
+            os._exit(status)
+
+    _, status = os.waitpid(pid, 0)
+    engine.close()
+    assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
@@ -0,0 +1,105 @@
+import re
+import signal
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+import requests
+
+from svector import SVECTOR, APIConnectionError, APIError, RateLimitError
+from svector.emulator import Emulator, Faults
+
+MESSAGES = [{"role": "user", "content": "Hello"}]
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def faulty_client(emulator):
+    return SVECTOR(api_key="test", base_url=emulator.base_url, max_retries=0)
+
+
+def test_draw_is_reproducible_and_respects_rates():
+    first = Faults(rate_limit=0.2, server_error=0.1, reset=0.1, seed=3)
+    second = Faults(rate_limit=0.2, server_error=0.1, reset=0.1, seed=3)
+    draws = [first.draw() for _ in range(2000)]
+
+    assert draws == [second.draw() for _ in range(2000)]
+    assert 300 < draws.count("rate_limit") < 500
+    assert 120 < draws.count("server_error") < 280
+    assert draws.count("gateway_timeout") == 0
+
+
+def test_rate_limit_carries_retry_after():
+    with Emulator(faults=Faults(rate_limit=1, retry_after=3)) as emulator:
+        client = faulty_client(emulator)
+        with pytest.raises(RateLimitError) as info:
+            client.chat.create(model="spec-3-turbo", messages=MESSAGES)
+        client.close()
+
+    assert info.value.headers["Retry-After"] == "3"
+    assert emulator.stats["rate_limit"] == 1
+    assert emulator.stats["requests"] == 0
+
+
+def test_gateway_timeout_after_delay():
+    with Emulator(faults=Faults(gateway_timeout=1, gateway_delay=0.05)) as emulator:
+        client = faulty_client(emulator)
+        with pytest.raises(APIError) as info:
+            client.chat.create(model="spec-3-turbo", messages=MESSAGES)
+        client.close()
+
+    assert info.value.status_code == 504
+
+
+def test_reset_drops_the_connection():
+    with Emulator(faults=Faults(reset=1, seed=1)) as emulator:
+        client = faulty_client(emulator)
+        with pytest.raises(APIConnectionError):
+            client.chat.create(model="spec-3-turbo", messages=MESSAGES)
+
+        events = []
+        with pytest.raises(requests.exceptions.RequestException):
+            for event in client.chat.create_stream(model="spec-3-turbo", messages=MESSAGES):
+                events.append(event)
+        client.close()
+
+    assert len(events) < 16
+    assert emulator.stats["reset"] == 2
+
+
+def test_slow_first_token_and_stall_are_counted():
+    faults = Faults(slow_first_token=1, slow_first_token_delay=0.01, stall=1, stall_delay=0.01, seed=1)
+    with Emulator(faults=faults) as emulator:
+        client = faulty_client(emulator)
+        events = list(client.chat.create_stream(model="spec-3-turbo", messages=MESSAGES))
+        client.close()
+
+    assert events[-1]["choices"][0]["finish_reason"] == "stop"
+    assert emulator.stats["slow_first_token"] == 1
+    assert emulator.stats["stall"] == 1
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="stops the server with SIGINT")
+def test_emulate_command():
+    process = subprocess.Popen(
+        [sys.executable, "-m", "svector.cli", "emulate", "--port", "0", "--latency", "0", "--rate-limit", "1"],
+        cwd=ROOT, stdout=subprocess.PIPE, text=True
+    )
+    try:
+        base_url = re.search(r"http://\S+", process.stdout.readline()).group(0)
+        response = requests.post(base_url + "/api/chat/completions", json={"model": "spec-3-turbo", "messages": MESSAGES})
+        assert response.status_code == 429
+    finally:
+        process.send_signal(signal.SIGINT)
+        output, _ = process.communicate(timeout=10)
+
+    assert "injected faults: rate_limit=1" in output
+
+
+def test_emulate_rejects_rates_above_one():
+    result = subprocess.run(
+        [sys.executable, "-m", "svector.cli", "emulate", "--rate-limit", "0.6", "--reset", "0.6"],
+        cwd=ROOT, stdout=subprocess.PIPE, text=True, timeout=30
+    )
+    assert result.returncode == 1
+    assert "at most 1" in result.stdout
@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+from svector import SVECTOR, APIConnectionTimeoutError, AsyncSVECTOR
+from svector.emulator import Emulator
+from svector.hooks import RequestHooks
+
+
+def recording_hooks():
+    events = []
+    hooks = RequestHooks({
+        event: (lambda timing, event=event: events.append((event, timing)))
+        for event in ("before_request", "after_response", "on_retry", "on_stream_first_chunk", "on_stream_end", "on_error")
+    })
+    return hooks, events
+
+
+def test_response_timing(emulator):
+    hooks, events = recording_hooks()
+    client = SVECTOR(api_key="test", base_url=emulator.base_url, hooks=hooks)
+    client.conversations.create(model="spec-3-turbo", input="Hi")
+    client.close()
+
+    assert [event for event, _ in events] == ["before_request", "after_response"]
+    timing = events[-1][1]
+    assert timing.model == "spec-3-turbo"
+    assert timing.status_code == 200
+    assert 0 < timing.ttfb <= timing.total
+    assert timing.output_tokens and timing.response_bytes
+
+
+def test_stream_timing(emulator):
+    hooks, events = recording_hooks()
+    client = SVECTOR(api_key="test", base_url=emulator.base_url, hooks=hooks)
+    chunks = list(client.conversations.create_stream(model="spec-3-turbo", input="Hi"))
+    client.close()
+
+    assert [event for event, _ in events] == [
+        "before_request", "after_response", "on_stream_first_chunk", "on_stream_end"
+    ]
+    timing = events[-1][1]
+    assert timing.ttft is not None and timing.ttft <= timing.total
+    assert timing.stream_chunks >= len(chunks) - 1
+    assert timing.output_tokens
+
+
+def test_retry_and_error_events():
+    hooks, events = recording_hooks()
+    with Emulator(latency=1.0) as emulator:
+        client = SVECTOR(api_key="test", base_url=emulator.base_url, timeout=0.1, max_retries=1, hooks=hooks)
+        with pytest.raises(APIConnectionTimeoutError):
+            client.conversations.create(model="spec-3-turbo", input="Hi")
+        client.close()
+
+    assert [event for event, _ in events] == ["before_request", "on_retry", "before_request", "on_error"]
+    assert [timing.attempt for _, timing in events] == [0, 0, 1, 1]
+    assert isinstance(events[-1][1].error, APIConnectionTimeoutError)
+
+
+def test_failing_hook_does_not_break_the_request(client):
+    client.hooks.on("after_response", lambda timing: 1 / 0)
+    with pytest.warns(RuntimeWarning, match="after_response"):
+        assert client.conversations.create(model="spec-3-turbo", input="Hi").output
+
+
+def test_unknown_event_is_rejected():
+    with pytest.raises(ValueError):
+        RequestHooks().on("on_success", print)
+    assert not RequestHooks()
+
+
+def test_async_client_records_connection_phases(emulator):
+    hooks, events = recording_hooks()
+
+    async def main():
+        client = AsyncSVECTOR(api_key="test", base_url=emulator.base_url, hooks=hooks)
+        try:
+            await client.conversations.create(model="spec-3-turbo", input="Hi")
+        finally:
+            await client.close()
+
+    asyncio.run(main())
+    timing = events[-1][1]
+    assert events[-1][0] == "after_response"
+    assert timing.connect is not None and timing.connection_reused is False
+    assert timing.request_bytes
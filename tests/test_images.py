@@ -0,0 +1,86 @@
+import io
+
+import pytest
+
+from svector import SVECTOR
+from svector.images import ImagePreprocessor, resolve_preprocessor, target_size
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def encode(img, format, **options):
+    buffer = io.BytesIO()
+    img.save(buffer, format, **options)
+    return buffer.getvalue()
+
+
+def photo(size):
+    return Image.merge("RGB", [Image.effect_noise(size, 40)] * 3)
+
+
+def test_target_size():
+    assert target_size(3000, 2000, "high") == (1152, 768)
+    assert target_size(8000, 1000, "high") == (2048, 256)
+    assert target_size(3000, 2000, "low") == (512, 341)
+    assert target_size(400, 300, "high") == (400, 300)
+
+
+def test_large_photo_is_downscaled_to_its_detail():
+    original = encode(photo((3000, 2000)), "JPEG", quality=95)
+    preprocessor = ImagePreprocessor()
+    prepared = preprocessor.prepare(original)
+
+    assert (prepared.detail, prepared.size, prepared.original_size) == ("high", (1152, 768), (3000, 2000))
+    assert prepared.mime_type == "image/jpeg"
+    assert prepared.bytes < len(original) / 4
+    assert preprocessor.stats()["bytes_saved"] == prepared.bytes_saved
+
+
+def test_small_image_is_low_detail_and_never_upscaled():
+    prepared = ImagePreprocessor().prepare(encode(photo((300, 200)), "JPEG"))
+    assert (prepared.detail, prepared.size) == ("low", (300, 200))
+
+
+def test_screenshot_stays_lossless():
+    screenshot = Image.new("RGB", (2400, 1600), "white")
+    prepared = ImagePreprocessor().prepare(encode(screenshot, "PNG"))
+    assert prepared.mime_type == "image/png"
+    assert prepared.size == (1152, 768)
+
+
+def test_exif_orientation_is_applied_and_stripped():
+    exif = Image.Exif()
+    exif[0x0112] = 6  # rotated 90 degrees
+    exif[0x010F] = "Camera maker"
+    prepared = ImagePreprocessor().prepare(encode(photo((400, 300)), "JPEG", exif=exif))
+
+    assert prepared.size == (300, 400)
+    with Image.open(io.BytesIO(prepared.data)) as img:
+        assert not len(img.getexif())
+
+
+def test_larger_re_encode_keeps_the_original():
+    original = encode(photo((300, 200)), "JPEG", quality=30)
+    prepared = ImagePreprocessor(quality=95).prepare(original)
+    assert prepared.data == original
+    assert prepared.bytes_saved == 0
+
+
+def test_resolve_preprocessor():
+    assert resolve_preprocessor(None) is None
+    assert isinstance(resolve_preprocessor(True), ImagePreprocessor)
+    with pytest.raises(ValueError):
+        ImagePreprocessor(format="gif")
+
+
+def test_analyze_sends_preprocessed_image(emulator, tmp_path):
+    path = tmp_path / "photo.jpg"
+    path.write_bytes(encode(photo((3000, 2000)), "JPEG", quality=95))
+    client = SVECTOR(api_key="test", base_url=emulator.base_url, image_preprocessing=True)
+    response = client.vision.analyze(image_file=path, prompt="Describe this photo")
+    client.close()
+
+    assert response.preprocessing["width"] == 1152
+    assert response.preprocessing["bytes_saved"] > 0
+    # The emulator sizes the prompt from the image it received
+    assert response.usage["prompt_tokens"] < path.stat().st_size / 4
@@ -0,0 +1,90 @@
+import json
+
+from svector import SVECTOR, RateLimitError
+from svector.emulator import Emulator
+from svector.jobs import BatchJob, QueueWorker, WorkQueue, _retry_delay
+
+
+def write_requests(path, count):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            f.write(json.dumps({"id": f"q{i}", "model": "spec-3-turbo", "input": f"Question {i}"}) + "\n")
+    return path
+
+
+def test_worker_completes_queue(tmp_path, client):
+    queue = WorkQueue(tmp_path / "jobs.queue")
+    assert queue.enqueue(write_requests(tmp_path / "requests.jsonl", 5)) == 5
+
+    stats = QueueWorker(client, queue, concurrency=2).run()
+
+    assert stats.succeeded == 5
+    assert queue.counts()["done"] == 5
+    written = queue.export(tmp_path / "results.jsonl")
+    assert written == {"done": 5, "failed": 0}
+
+
+def test_worker_requeues_timed_out_task(tmp_path):
+    with Emulator(latency=1.0) as emulator:
+        client = SVECTOR(api_key="test", base_url=emulator.base_url, timeout=0.2, max_retries=0)
+        queue = WorkQueue(tmp_path / "jobs.queue", max_attempts=2)
+        queue.enqueue(write_requests(tmp_path / "requests.jsonl", 1))
+
+        QueueWorker(client, queue, concurrency=1, retry_delay=0.05).run()
+        client.close()
+
+    assert emulator.stats["requests"] == 2
+    queue.export(tmp_path / "results.jsonl", tmp_path / "failed.jsonl")
+    failure = json.loads((tmp_path / "failed.jsonl").read_text())
+    assert failure["error_type"] == "APIConnectionTimeoutError"
+
+
+def test_requeued_task_waits_for_its_delay(tmp_path):
+    queue = WorkQueue(tmp_path / "jobs.queue")
+    queue.enqueue(write_requests(tmp_path / "requests.jsonl", 1))
+    [(line, _, attempt)] = queue.lease("worker", 10, 60)
+    assert attempt == 1
+
+    queue.requeue("worker", [(line, 30.0)])
+
+    assert queue.lease("worker", 10, 60) == []
+    assert queue.counts()["pending"] == 1
+    assert 29 < queue.ready_in() <= 30
+
+
+def test_retry_delay_uses_retry_after():
+    error = RateLimitError("Rate limit exceeded", 429, headers={"Retry-After": "7"})
+    assert _retry_delay(error, 1, 1.0) == 7.0
+    assert 2.0 <= _retry_delay(RateLimitError("Rate limit exceeded", 429), 3, 1.0) <= 4.0
+
+
+class CountingJob(BatchJob):
+    calls = 0
+
+    def execute(self, endpoint, params):
+        CountingJob.calls += 1
+        return super().execute(endpoint, params)
+
+
+def test_batch_job_resumes_and_drops_torn_record(tmp_path, client):
+    requests = write_requests(tmp_path / "requests.jsonl", 3)
+    output = tmp_path / "results.jsonl"
+    CountingJob(client, requests, output, concurrency=2).run()
+
+    # More input arrives and the previous run died mid-write
+    with open(requests, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"id": "extra", "model": "spec-3-turbo", "input": "More"}) + "\n")
+        f.write("not json\n")
+    with open(output, "a", encoding="utf-8") as f:
+        f.write('{"id": "q9", "line"')
+
+    job = CountingJob(client, requests, output, concurrency=2)
+    stats = job.run()
+
+    assert CountingJob.calls == 4
+    assert job.skipped == 3
+    assert stats.succeeded == 1
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert sorted(record["id"] for record in records) == ["extra", "q0", "q1", "q2"]
+    failure = json.loads(job.dead_letter_path.read_text())
+    assert (failure["line"], failure["error_type"]) == (5, "ValidationError")
@@ -0,0 +1,96 @@
+import asyncio
+import os
+
+import pytest
+
+from svector import (APIConnectionError, APIConnectionTimeoutError, APIError,
+                     QueueTimeoutError, RateLimitError, SVECTORError)
+from svector.limits import (AdaptiveConcurrencyLimiter, SharedRateLimiter,
+                            _user_id, is_congestion_error)
+
+
+@pytest.mark.parametrize("error", [
+    RateLimitError("Rate limit exceeded", 429),
+    APIError("Internal server error", 503),
+    APIConnectionTimeoutError("Request timeout"),
+    asyncio.TimeoutError(),
+])
+def test_congestion_errors(error):
+    assert is_congestion_error(error)
+
+
+@pytest.mark.parametrize("error", [
+    None,
+    QueueTimeoutError("Request deadline exceeded while queued"),
+    APIConnectionError("Connection error"),
+    APIError("Bad request", 400),
+    SVECTORError("Upstream timed out"),
+    ValueError("timeout"),
+])
+def test_non_congestion_errors(error):
+    assert not is_congestion_error(error)
+
+
+def test_limiter_grows_on_success_and_halves_on_congestion():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=16, latency_tolerance=None, cooldown=0)
+    for _ in range(8):
+        with limiter.slot():
+            pass
+    assert limiter.limit == 5
+
+    with pytest.raises(RateLimitError):
+        with limiter.slot():
+            raise RateLimitError("Rate limit exceeded", 429)
+    assert limiter.limit == 2
+    assert limiter.metrics()["congestion_events"] == 1
+    assert limiter.in_flight == 0
+
+
+def test_limiter_blocks_at_limit():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, latency_tolerance=None)
+    assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+    assert not limiter.acquire(timeout=0.01)
+    limiter.release(0.01)
+    assert limiter.try_acquire()
+
+
+def test_shared_rate_limiter_default_path_is_per_user(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    limiter = SharedRateLimiter(requests_per_second=5, name="prod")
+    assert limiter.path.parent == tmp_path
+    assert limiter.path.name == f"svector-prod-{_user_id()}.ratelimit"
+
+
+def test_shared_rate_limiter_explains_unwritable_path(monkeypatch, tmp_path):
+    def denied(*args):
+        raise PermissionError(13, "Permission denied")
+
+    limiter = SharedRateLimiter(requests_per_second=5, path=tmp_path / "state")
+    monkeypatch.setattr(os, "open", denied)
+    with pytest.raises(PermissionError, match="path="):
+        limiter.try_acquire()
+
+
+def test_shared_rate_limiter_budget_is_shared(tmp_path):
+    first = SharedRateLimiter(requests_per_second=0.5, path=tmp_path / "state")
+    second = SharedRateLimiter(requests_per_second=0.5, path=tmp_path / "state")
+    try:
+        assert first.try_acquire() == 0
+        wait = second.try_acquire()
+        assert 1.5 < wait <= 2.0
+    finally:
+        first.close()
+        second.close()
+
+
+def test_shared_rate_limiter_tokens(tmp_path):
+    limiter = SharedRateLimiter(tokens_per_minute=600, path=tmp_path / "state")
+    try:
+        assert limiter.try_acquire(500) == 0
+        assert limiter.try_acquire(200) > 0
+        limiter.adjust(-400)
+        assert limiter.try_acquire(200) == 0
+        asyncio.run(limiter.acquire_async(10))
+    finally:
+        limiter.close()
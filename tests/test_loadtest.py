@@ -0,0 +1,105 @@
+import json
+import sys
+
+import pytest
+
+from svector import SVECTOR, AuthenticationError, cli
+from svector.emulator import Emulator, Faults
+from svector.loadtest import LoadStage, LoadTest
+
+
+def loadtest_client(emulator):
+    return SVECTOR(api_key="test", base_url=emulator.base_url, max_retries=0)
+
+
+def stage(concurrency, succeeded, errors=0, duration=1.0):
+    result = LoadStage(concurrency)
+    result.duration = duration
+    result.succeeded = succeeded
+    if errors:
+        result.errors["RateLimitError"] = errors
+    return result
+
+
+def test_saturation_when_throughput_stops_scaling():
+    test = LoadTest(client=None, min_gain=0.1, max_error_rate=0.05)
+    for result in (stage(1, 10), stage(2, 19), stage(4, 20), stage(8, 40, errors=5)):
+        test._finish_stage(result)
+
+    assert [result.saturated for result in test.results] == [False, False, True, True]
+    assert test.saturation_point.concurrency == 2
+    assert "Saturation point: concurrency 2" in test.report()
+
+
+def test_rejects_empty_or_zero_stages():
+    with pytest.raises(ValueError):
+        LoadTest(client=None, stages=[])
+    with pytest.raises(ValueError):
+        LoadTest(client=None, stages=[1, 0])
+
+
+def test_latency_bound_endpoint_scales():
+    with Emulator(latency=0.05) as emulator:
+        client = loadtest_client(emulator)
+        test = LoadTest(client, stages=[1, 4], stage_duration=0.5, stream=True)
+        stages = test.run()
+        client.close()
+
+    assert [result.concurrency for result in stages] == [1, 4]
+    assert stages[1].throughput > 2 * stages[0].throughput
+    assert not test.saturated
+    assert stages[0].ttft.count == stages[0].succeeded
+    assert stages[0].tokens_per_second > 0
+
+
+def test_errors_saturate_and_stop_the_ramp():
+    with Emulator(faults=Faults(rate_limit=0.5, seed=2)) as emulator:
+        client = loadtest_client(emulator)
+        test = LoadTest(client, stages=[1, 2], stage_duration=0.3)
+        stages = test.run()
+        client.close()
+
+    assert len(stages) == 1
+    assert stages[0].saturated
+    assert set(stages[0].errors) == {"RateLimitError"}
+    assert test.saturation_point is None
+
+
+def test_fatal_error_stops_early(emulator):
+    client = loadtest_client(emulator)
+
+    def rejected(**kwargs):
+        raise AuthenticationError("Invalid API key", 401)
+
+    client.conversations.create = rejected
+    test = LoadTest(client, stages=[1, 2], stage_duration=5)
+    stages = test.run()
+    client.close()
+
+    assert len(stages) == 1
+    assert stages[0].duration < 1
+    assert isinstance(test.fatal_error, AuthenticationError)
+    assert "Stopped early: AuthenticationError" in test.report()
+
+
+def test_loadtest_command(monkeypatch, capsys, tmp_path, emulator):
+    output = tmp_path / "loadtest.json"
+    monkeypatch.setenv("SVECTOR_API_KEY", "test")
+    monkeypatch.setattr(sys, "argv", [
+        "svector", "loadtest", "--base-url", emulator.base_url,
+        "--concurrency", "1,2", "--duration", "0.2", "--json", str(output),
+    ])
+    cli.main()
+
+    assert "Load testing " + emulator.base_url in capsys.readouterr().out
+    results = json.loads(output.read_text())
+    assert results["stages"][0]["concurrency"] == 1
+    assert results["fatal_error"] is None
+
+
+def test_loadtest_command_rejects_bad_concurrency(monkeypatch, capsys):
+    monkeypatch.setenv("SVECTOR_API_KEY", "test")
+    monkeypatch.setattr(sys, "argv", ["svector", "loadtest", "--concurrency", "1,many"])
+    with pytest.raises(SystemExit):
+        cli.main()
+    assert "comma-separated list of integers" in capsys.readouterr().out
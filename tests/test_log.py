@@ -0,0 +1,57 @@
+import json
+import logging
+
+from svector.log import FIELD_PREFIX, JSONFormatter, SamplingFilter, log_fields, logger
+
+
+def _events(caplog):
+    return [(record.svector_event, record.svector_request_id) for record in caplog.records]
+
+
+def test_no_records_by_default(caplog, client):
+    caplog.set_level(logging.WARNING, logger="svector")
+    client.chat.create(model="spec-3-turbo", messages=[{"role": "user", "content": "Hello"}])
+    assert not caplog.records
+
+
+def test_request_records_share_a_request_id(caplog, client):
+    caplog.set_level(logging.DEBUG, logger="svector")
+    client.chat.create(model="spec-3-turbo", messages=[{"role": "user", "content": "Hello"}])
+
+    (start, first_id), (response, second_id) = _events(caplog)
+    assert (start, response) == ("request.start", "request.response")
+    assert first_id == second_id
+    assert caplog.records[1].svector_status == 200
+
+
+def test_vision_logs_instead_of_printing(caplog, capsys, client):
+    caplog.set_level(logging.DEBUG, logger="svector")
+    client.vision.analyze(image_url="https://example.com/cat.png", prompt="Describe this image")
+
+    assert capsys.readouterr().out == ""
+    assert "vision.start" in [event for event, _ in _events(caplog)]
+
+
+def _record(request_id, level=logging.DEBUG):
+    return logger.makeRecord("svector", level, __file__, 1, "message %s", ("arg",), None,
+                             extra=log_fields("request.start", request_id, attempt=0))
+
+
+def test_sampling_keeps_whole_requests():
+    sampler = SamplingFilter(0.5)
+    ids = [f"{i:012x}" for i in range(200)]
+    kept = [request_id for request_id in ids if sampler.filter(_record(request_id))]
+
+    assert 50 < len(kept) < 150
+    assert all(sampler.filter(_record(request_id)) for request_id in kept)
+    assert sampler.filter(_record(ids[0], logging.WARNING))
+    assert not SamplingFilter(0).filter(_record(ids[0]))
+
+
+def test_json_formatter_unprefixes_fields():
+    payload = json.loads(JSONFormatter().format(_record("abc")))
+    assert payload["message"] == "message arg"
+    assert payload["event"] == "request.start"
+    assert payload["request_id"] == "abc"
+    assert payload["attempt"] == 0
+    assert not any(key.startswith(FIELD_PREFIX) for key in payload)
@@ -0,0 +1,79 @@
+import json
+import random
+
+import pytest
+
+from svector import SVECTOR, RateLimitError
+from svector.emulator import Emulator, Faults
+from svector.metrics import LatencyHistogram, MetricsRegistry
+
+
+def test_histogram_percentiles_are_within_relative_error():
+    rng = random.Random(3)
+    values = sorted(rng.uniform(0.001, 10) for _ in range(10000))
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+
+    for percentile in (50, 90, 99):
+        exact = values[int(percentile / 100 * len(values)) - 1]
+        assert histogram.percentile(percentile) == pytest.approx(exact, rel=0.02)
+    assert histogram.count == 10000
+    assert histogram.max == values[-1]
+
+
+def test_histograms_merge_like_one():
+    first, second, combined = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for i in range(1, 101):
+        (first if i % 2 else second).record(i / 100)
+        combined.record(i / 100)
+    first.merge(LatencyHistogram.from_dict(json.loads(json.dumps(second.to_dict()))))
+
+    assert first.buckets == combined.buckets
+    assert (first.count, first.min, first.max) == (combined.count, combined.min, combined.max)
+    assert first.sum == pytest.approx(combined.sum)
+    with pytest.raises(ValueError):
+        first.merge(LatencyHistogram(resolution=1e-3))
+
+
+def test_registry_labels_merge_and_prometheus():
+    registry = MetricsRegistry()
+    registry.increment("requests_total", model="a", status="200")
+    registry.increment("requests_total", model="b", status="200")
+    registry.observe("request_duration_seconds", 0.25, model="a")
+
+    other = MetricsRegistry()
+    other.merge(json.dumps(registry.to_dict()))
+    other.merge(registry)
+
+    assert other.counter("requests_total") == 4
+    assert other.counter("requests_total", model="a") == 2
+    assert other.histogram("request_duration_seconds").count == 2
+    text = other.to_prometheus()
+    assert '# TYPE svector_requests_total counter' in text
+    assert 'svector_requests_total{model="a",status="200"} 2' in text
+    assert 'svector_request_duration_seconds_count{model="a"} 2' in text
+
+
+def test_client_records_requests(emulator):
+    client = SVECTOR(api_key="test", base_url=emulator.base_url, metrics=True)
+    client.conversations.create(model="spec-3-turbo", input="Hi")
+    list(client.conversations.create_stream(model="spec-3-turbo", input="Hi"))
+    client.close()
+
+    metrics = client.metrics
+    assert metrics.counter("requests_total", model="spec-3-turbo", status="200") == 2
+    assert metrics.histogram("request_duration_seconds").count == 2
+    assert metrics.histogram("time_to_first_token_seconds").count == 1
+    assert metrics.counter("output_tokens_total") > 0
+
+
+def test_client_counts_rate_limits():
+    with Emulator(faults=Faults(rate_limit=1.0)) as emulator:
+        client = SVECTOR(api_key="test", base_url=emulator.base_url, metrics=True)
+        with pytest.raises(RateLimitError):
+            client.conversations.create(model="spec-3-turbo", input="Hi")
+        client.close()
+
+    assert client.metrics.counter("rate_limited_total") == 1
+    assert client.metrics.counter("errors_total", error="RateLimitError") == 1
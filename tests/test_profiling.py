@@ -0,0 +1,49 @@
+import json
+import time
+
+from svector.profiling import OverheadProfiler, profile_call, profile_phase
+
+
+def test_profile_attributes_request_phases(tmp_path, client):
+    path = tmp_path / "profile.json"
+    with client.profile(path) as profiler:
+        client.conversations.create(model="spec-3-turbo", input="Hello")
+    client.conversations.create(model="spec-3-turbo", input="Hello")
+
+    assert client.profiler is None
+    summary = json.loads(path.read_text())
+    assert summary["requests"] == 1
+    assert {"build_messages", "transport", "decode", "wrap_response"} <= set(summary["phases"])
+    assert all(phase["calls"] == 1 for phase in summary["phases"].values())
+    assert summary["client_cpu_per_request"] > 0
+    assert "transport" in profiler.report()
+
+
+def test_profile_stream_reads(client):
+    with client.profile() as profiler:
+        events = list(client.conversations.create_stream(model="spec-3-turbo", input="Hello"))
+
+    phases = profiler.to_dict()["phases"]
+    assert phases["stream_read"]["calls"] >= len(events)
+    assert phases["wrap_response"]["calls"] == len(events)
+    assert profiler.network_time > 0
+
+
+def test_disabled_profiler_is_a_passthrough():
+    with profile_phase(None, "decode"):
+        pass
+    assert profile_call(None, "decode", int, "3") == 3
+
+
+def test_phase_without_cpu_counts_only_wall():
+    profiler = OverheadProfiler()
+    with profile_phase(profiler, "backoff", cpu=False):
+        pass
+    profiler.stop()
+    elapsed = profiler.elapsed
+    time.sleep(0.01)
+
+    phase = profiler.to_dict()["phases"]["backoff"]
+    assert phase["calls"] == 1
+    assert phase["cpu"] is None
+    assert profiler.elapsed == elapsed
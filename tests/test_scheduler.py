@@ -0,0 +1,78 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from svector import SVECTOR, QueueTimeoutError
+from svector.limits import RequestScheduler
+
+
+def queue_waiters(scheduler, requests):
+    """Start a thread per (priority, deadline) and wait until each is queued"""
+    granted = []
+    threads = []
+    for number, (priority, deadline) in enumerate(requests, 1):
+        def wait(priority=priority, deadline=deadline):
+            scheduler.acquire(priority, deadline)
+            granted.append((priority, deadline))
+            scheduler.release()
+
+        thread = threading.Thread(target=wait)
+        thread.start()
+        threads.append(thread)
+        while sum(scheduler.metrics()["queued"].values()) < number:
+            time.sleep(0.001)
+    return granted, threads
+
+
+def test_queued_requests_run_by_priority_then_deadline():
+    scheduler = RequestScheduler(max_concurrency=1)
+    scheduler.acquire("batch")
+    later, sooner = time.monotonic() + 60, time.monotonic() + 30
+    granted, threads = queue_waiters(scheduler, [
+        ("batch", None), ("default", later), ("interactive", None), ("default", sooner)
+    ])
+    assert scheduler.metrics()["queued"] == {"batch": 1, "default": 2, "interactive": 1}
+
+    scheduler.release()
+    for thread in threads:
+        thread.join(5)
+
+    assert granted == [("interactive", None), ("default", sooner), ("default", later), ("batch", None)]
+    assert scheduler.metrics()["in_flight"] == 0
+
+
+def test_deadline_while_queued_raises_queue_timeout():
+    scheduler = RequestScheduler(max_concurrency=1)
+    scheduler.acquire()
+    with pytest.raises(QueueTimeoutError):
+        scheduler.acquire("interactive", time.monotonic() + 0.02)
+
+    async def main():
+        with pytest.raises(QueueTimeoutError):
+            await scheduler.acquire_async("batch", time.monotonic() + 0.02)
+
+    asyncio.run(main())
+    assert scheduler.metrics()["queued"] == {}
+    scheduler.release()
+    scheduler.acquire()
+
+
+def test_unknown_priority_is_rejected():
+    with pytest.raises(ValueError):
+        RequestScheduler().acquire("urgent")
+
+
+def test_client_requests_go_through_the_scheduler(emulator):
+    scheduler = RequestScheduler(max_concurrency=2)
+    client = SVECTOR(api_key="test", base_url=emulator.base_url, scheduler=scheduler)
+    with client.priority("interactive", deadline=5):
+        assert client.conversations.create(model="spec-3-turbo", input="Hi").output
+    results = client.conversations.create_many(
+        [{"model": "spec-3-turbo", "input": "Hi"} for _ in range(4)], concurrency=4
+    )
+    client.close()
+
+    assert results.stats.succeeded == 4
+    assert scheduler.metrics()["in_flight"] == 0
@@ -0,0 +1,78 @@
+import asyncio
+import json
+
+import pytest
+
+from svector import SVECTOR, APIConnectionTimeoutError, AsyncSVECTOR
+from svector.emulator import Emulator
+from svector.timeline import ASYNC_LANE_BASE, TimelineRecorder
+
+MESSAGES = [{"role": "user", "content": "Hello"}]
+
+
+def _slices(trace):
+    return [event for event in trace["traceEvents"] if event["ph"] == "X"]
+
+
+def test_records_request_phases_to_file(tmp_path, client):
+    path = tmp_path / "run.trace.json"
+    with client.record_timeline(path):
+        client.chat.create(model="spec-3-turbo", messages=MESSAGES)
+    client.chat.create(model="spec-3-turbo", messages=MESSAGES)
+
+    trace = json.loads(path.read_text())
+    names = [event["name"] for event in _slices(trace)]
+    assert names.count("POST /api/chat/completions") == 1
+    assert {"queued", "waiting", "receiving"} <= set(names)
+    request = _slices(trace)[0]
+    assert request["args"]["status"] == 200
+    assert any(event["name"] == "process_name" for event in trace["traceEvents"])
+
+
+def test_stream_records_first_token(client):
+    with client.record_timeline() as recorder:
+        list(client.chat.create_stream(model="spec-3-turbo", messages=MESSAGES))
+
+    events = recorder.to_dict()["traceEvents"]
+    assert "streaming" in [event["name"] for event in events]
+    assert [event["name"] for event in events if event["ph"] == "i"] == ["first token"]
+
+
+def test_timeout_retry_records_backoff():
+    with Emulator(latency=0.5) as emulator:
+        client = SVECTOR(api_key="test", base_url=emulator.base_url, timeout=0.1, max_retries=1)
+        with client.record_timeline() as recorder:
+            with pytest.raises(APIConnectionTimeoutError):
+                client.chat.create(model="spec-3-turbo", messages=MESSAGES)
+        client.close()
+
+    slices = _slices(recorder.to_dict())
+    attempts = [event["args"]["attempt"] for event in slices if event["cat"] == "request"]
+    assert attempts == [0, 1]
+    [backoff] = [event for event in slices if event["name"] == "backoff"]
+    assert backoff["dur"] >= 0.9e6
+
+
+def test_concurrent_async_requests_get_their_own_lanes(emulator):
+    async def main():
+        client = AsyncSVECTOR(api_key="test", base_url=emulator.base_url, max_retries=0)
+        try:
+            with client.record_timeline() as recorder:
+                await asyncio.gather(*(client.chat.create(model="spec-3-turbo", messages=MESSAGES) for _ in range(3)))
+        finally:
+            await client.close()
+        return recorder
+
+    emulator.latency = 0.1
+    requests = [event for event in _slices(asyncio.run(main()).to_dict()) if event["cat"] == "request"]
+    lanes = {event["tid"] for event in requests}
+    assert len(lanes) == 3
+    assert all(lane >= ASYNC_LANE_BASE for lane in lanes)
+
+
+def test_max_events_drops_overflow(client):
+    with client.record_timeline(recorder=TimelineRecorder(max_events=2)) as recorder:
+        client.chat.create(model="spec-3-turbo", messages=MESSAGES)
+
+    assert len(_slices(recorder.to_dict())) == 2
+    assert recorder.dropped > 0
@@ -0,0 +1,68 @@
+import pytest
+
+from svector import SVECTOR
+from svector.tracing import OpenTelemetryTracing, _usage_attributes, otel_trace
+
+
+def test_usage_attributes():
+    assert _usage_attributes({"usage": {"prompt_tokens": 3, "completion_tokens": 5}}) == {
+        "gen_ai.usage.input_tokens": 3,
+        "gen_ai.usage.output_tokens": 5,
+    }
+    assert _usage_attributes({"usage": {"input_tokens": 2}}) == {"gen_ai.usage.input_tokens": 2}
+    assert _usage_attributes(None) == {}
+
+
+def test_tracing_is_off_by_default(client):
+    assert client.tracing is None
+    assert "__wrapped__" not in vars(client.chat.create)
+
+
+@pytest.mark.skipif(otel_trace is not None, reason="opentelemetry-api is installed")
+def test_tracing_requires_opentelemetry(emulator):
+    with pytest.raises(ImportError, match="svector-sdk\\[otel\\]"):
+        SVECTOR(api_key="test", base_url=emulator.base_url, tracing=True)
+
+
+@pytest.fixture
+def spans():
+    sdk_trace = pytest.importorskip("opentelemetry.sdk.trace")
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    exporter = InMemorySpanExporter()
+    provider = sdk_trace.TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    return provider, exporter
+
+
+def test_operation_and_attempt_spans(emulator, spans):
+    provider, exporter = spans
+    tracing = OpenTelemetryTracing(tracer_provider=provider)
+    client = SVECTOR(api_key="test", base_url=emulator.base_url, max_retries=0, tracing=tracing)
+    client.chat.create(model="spec-3-turbo", messages=[{"role": "user", "content": "Hello"}])
+    client.close()
+
+    attempt, operation = exporter.get_finished_spans()
+    assert operation.name == "svector.chat.create"
+    assert operation.attributes["gen_ai.request.model"] == "spec-3-turbo"
+    assert "gen_ai.usage.output_tokens" in operation.attributes
+    assert attempt.name == "POST /api/chat/completions"
+    assert attempt.parent.span_id == operation.context.span_id
+    assert attempt.attributes["http.response.status_code"] == 200
+
+
+def test_stream_span_ends_when_consumed(emulator, spans):
+    provider, exporter = spans
+    tracing = OpenTelemetryTracing(tracer_provider=provider)
+    client = SVECTOR(api_key="test", base_url=emulator.base_url, max_retries=0, tracing=tracing)
+    stream = client.chat.create_stream(model="spec-3-turbo", messages=[{"role": "user", "content": "Hello"}])
+    assert not exporter.get_finished_spans()
+    list(stream)
+    client.close()
+
+    # create_stream calls the instrumented create; only one operation span
+    attempt, operation = exporter.get_finished_spans()
+    assert operation.name == "svector.chat.create_stream"
+    assert attempt.parent.span_id == operation.context.span_id
+    assert "svector.ttft_ms" in operation.attributes
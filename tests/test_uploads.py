@@ -0,0 +1,90 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from svector import SVECTOR, APIError, NotFoundError
+from svector.uploads import UploadIndex, content_hash
+from svector.vision import _is_stale_upload
+
+
+def test_content_hash_matches_for_path_and_bytes(tmp_path):
+    image = tmp_path / "image.png"
+    image.write_bytes(b"\x89PNG" + bytes(range(256)) * 100)
+    assert content_hash(image) == content_hash(image.read_bytes())
+    with open(image, "rb") as f:
+        assert content_hash(f) == content_hash(image)
+        assert f.tell() == 0
+
+
+def test_processes_sharing_a_file_keep_each_others_uploads(tmp_path):
+    path = tmp_path / "uploads.db"
+    first, second = UploadIndex(path), UploadIndex(path)
+
+    first.put("a", "file-a", bytes=10)
+    second.put("b", "file-b", bytes=20)
+
+    reopened = UploadIndex(path)
+    assert reopened.get("a")["file_id"] == "file-a"
+    assert reopened.get("b")["file_id"] == "file-b"
+    assert first.get("b")["bytes"] == 20
+    assert len(reopened) == 2
+
+
+def test_forget_and_stats():
+    index = UploadIndex()
+    index.put("a", "file-a", bytes=10)
+    assert index.get("a")["file_id"] == "file-a"
+    index.forget("a")
+    assert index.get("a") is None
+    assert index.stats() == {"entries": 0, "hits": 1, "uploads": 1, "bytes_uploaded": 10, "bytes_reused": 10}
+
+
+def test_expired_uploads_are_not_reused_and_are_pruned(tmp_path):
+    path = tmp_path / "uploads.db"
+    index = UploadIndex(path, max_age=0.05)
+    index.put("old", "file-old")
+    time.sleep(0.1)
+    assert index.get("old") is None
+
+    index.put("stale", "file-stale")
+    time.sleep(0.1)
+    index.put("new", "file-new")
+    assert len(UploadIndex(path)) == 1
+
+
+def test_vision_uploads_each_image_once(tmp_path, emulator):
+    image = tmp_path / "image.png"
+    image.write_bytes(b"\x89PNG" + bytes(range(256)) * 100)
+    client = SVECTOR(api_key="test", base_url=emulator.base_url, image_uploads=tmp_path / "uploads.db")
+
+    for prompt in ("Describe", "Summarize"):
+        assert client.vision.analyze(image_file=str(image), prompt=prompt).analysis
+    client.close()
+
+    assert emulator.stats["uploads"] == 1
+    assert client.upload_index.stats()["hits"] == 1
+
+
+def test_concurrent_requests_for_one_image_upload_it_once(tmp_path, emulator):
+    image = tmp_path / "image.png"
+    image.write_bytes(b"\x89PNG" + bytes(range(256)) * 100)
+    client = SVECTOR(api_key="test", base_url=emulator.base_url, image_uploads=True)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        responses = list(pool.map(lambda i: client.vision.analyze(image_file=image, prompt=f"Question {i}"), range(8)))
+    client.close()
+
+    assert all(response.analysis for response in responses)
+    assert emulator.stats["uploads"] == 1
+
+
+@pytest.mark.parametrize("error, stale", [
+    (NotFoundError("File not found", 404), True),
+    (APIError("HTTP 410: file-abc expired"), True),
+    (APIError("HTTP 400: unknown file file-abc"), True),
+    (APIError("HTTP 400: invalid model"), False),
+    (APIError("HTTP 500: file-abc"), False),
+])
+def test_only_missing_files_are_forgotten(error, stale):
+    assert _is_stale_upload(error, "file-abc") == stale
@@ -0,0 +1,89 @@
+import asyncio
+import base64
+import json
+import os
+
+import pytest
+
+from svector import SVECTOR
+from svector.emulator import Emulator, Faults
+from svector.limits import AdaptiveConcurrencyLimiter
+from svector.vision import _IMAGE_PLACEHOLDER, ImageRequestBody
+
+
+def test_analyze_image_url(client):
+    response = client.vision.analyze(image_url="https://example.com/cat.png", prompt="Describe this image")
+    assert response.analysis
+
+
+def test_retried_server_error_is_recorded_once():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4, latency_tolerance=None, cooldown=0)
+    # seed=4: the first request gets a 5xx, the retry succeeds
+    with Emulator(faults=Faults(server_error=0.5, seed=4)) as emulator:
+        client = SVECTOR(api_key="test", base_url=emulator.base_url, concurrency_limiter=limiter)
+        response = client.vision.analyze(image_url="https://example.com/cat.png", prompt="Describe this image")
+        client.close()
+
+    assert response.analysis
+    assert emulator.stats["server_error"] == 1
+    metrics = limiter.metrics()
+    assert metrics["congestion_events"] == 1
+    assert metrics["successes"] == 1
+    assert metrics["in_flight"] == 0
+
+
+def _image_body(tmp_path, size):
+    image = tmp_path / "image.bin"
+    image.write_bytes(os.urandom(size))
+    request = {"model": "spec-3-turbo", "messages": [{"role": "user", "content": [
+        {"type": "image_url", "image_url": {"url": _IMAGE_PLACEHOLDER}}
+    ]}]}
+    return image, request, ImageRequestBody(request, image, "image/png", chunk_size=3 * 1024)
+
+
+def test_image_request_body_matches_json_encoding(tmp_path):
+    image, request, body = _image_body(tmp_path, 10000)
+    data_url = "data:image/png;base64," + base64.b64encode(image.read_bytes()).decode("ascii")
+    expected = json.dumps(request).replace(json.dumps(_IMAGE_PLACEHOLDER), json.dumps(data_url)).encode("utf-8")
+
+    assert b"".join(body) == expected
+    assert len(body) == len(expected)
+
+    async def collect():
+        return b"".join([chunk async for chunk in body])
+
+    assert asyncio.run(collect()) == expected
+
+
+def test_image_request_body_yields_to_the_event_loop(tmp_path):
+    _, _, body = _image_body(tmp_path, 100 * 1024)
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.ensure_future(ticker())
+        async for _ in body:
+            pass
+        task.cancel()
+        return ticks
+
+    assert asyncio.run(main()) > 10
+
+
+@pytest.mark.parametrize("async_engine", [False, True])
+def test_analyze_streams_image_file(emulator, tmp_path, async_engine):
+    image = tmp_path / "scan.png"
+    image.write_bytes(os.urandom(600 * 1024))
+    client = SVECTOR(api_key="test", base_url=emulator.base_url, async_engine=async_engine)
+    response = client.vision.analyze(image_file=image, prompt="Describe this image")
+    client.close()
+
+    # The emulator sizes the prompt from the messages it decoded, data URL included
+    assert response.usage["prompt_tokens"] >= len(base64.b64encode(image.read_bytes())) // 4
+    assert emulator.stats["requests"] == 1